@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_alter_user_email_alter_user_role_alter_user_username"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["reputation_score", "id"], name="accounts_us_reputat_0cd08f_idx"
+            ),
+        ),
+    ]
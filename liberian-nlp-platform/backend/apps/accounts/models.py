@@ -54,6 +54,11 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['reputation_score', 'id']),
+        ]
+
     def __str__(self) -> str:
         return f"{self.username} ({self.role})"
 
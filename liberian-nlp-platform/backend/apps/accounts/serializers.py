@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from config.fieldsets import SparseFieldsetMixin
 from .models import User, UserProfile, ConsentRecord
 
 
@@ -113,7 +114,7 @@ class ConsentSerializer(serializers.ModelSerializer):
         return consent
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Basic user serializer for public information."""
     
     class Meta:
@@ -6,6 +6,7 @@ from django.contrib.auth import login
 from django.contrib.auth.hashers import make_password
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from config.pagination import KeysetPagination
 from .models import User, UserProfile, ConsentRecord
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer,
@@ -147,6 +148,8 @@ class UserListView(generics.ListAPIView):
     queryset = User.objects.filter(is_active=True).order_by('-reputation_score')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-reputation_score', '-id')
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -0,0 +1,195 @@
+import numpy as np
+import soundfile as sf
+from typing import Callable, Dict, List, Optional
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from .utils import AudioProcessor
+
+
+SIGNAL_TYPES = ['speech', 'noisy', 'clipped', 'silent']
+SAMPLE_RATES = [8000, 16000, 44100, 48000]
+DURATIONS = [1.0, 5.0, 30.0]
+
+
+def generate_signal(kind: str, sr: int, duration: float, seed: int = 0) -> np.ndarray:
+    """Generate a deterministic synthetic test signal.
+
+    ``speech`` is a harmonic source with a wandering pitch, syllable-rate
+    amplitude modulation and pauses; ``noisy`` adds white noise at about
+    5 dB SNR, ``clipped`` overdrives it into hard clipping and ``silent``
+    is low-level room noise only.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(sr * duration)
+    t = np.arange(n) / sr
+
+    if kind == 'silent':
+        return (rng.standard_normal(n) * 1e-4).astype(np.float32)
+
+    # Pitch contour around 120-220 Hz
+    f0 = 170 + 50 * np.sin(2 * np.pi * 0.3 * t) + 10 * rng.standard_normal(n).cumsum() / np.sqrt(n)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    harmonics = sum(np.sin(k * phase) / k for k in range(1, 8) if k * f0.max() < sr / 2)
+
+    # Syllables at ~4 Hz with a pause every couple of seconds, between
+    # lead-in and trailing room tone as in a real take; the SNR estimate
+    # takes its noise floor from the first and last tenth of the clip
+    envelope = 0.3 + 0.7 * np.abs(np.sin(2 * np.pi * 4 * t))
+    envelope *= (np.sin(2 * np.pi * 0.4 * t) > -0.8)
+    margin = 0.12 * duration
+    envelope *= (t >= margin) & (t < duration - margin)
+    speech = 0.5 * envelope * harmonics / np.max(np.abs(harmonics))
+    speech += rng.standard_normal(n) * 1e-3
+
+    if kind == 'speech':
+        return speech.astype(np.float32)
+    if kind == 'noisy':
+        noise_power = np.mean(speech ** 2) / (10 ** (5 / 10))
+        return (speech + rng.standard_normal(n) * np.sqrt(noise_power)).astype(np.float32)
+    if kind == 'clipped':
+        return np.clip(speech * 4.0, -1.0, 1.0).astype(np.float32)
+
+    raise ValueError(f"Unknown signal type: {kind}")
+
+
+def _reset_peak_rss() -> bool:
+    # Linux lets a process reset its high-water mark so peaks are per case
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def _time(func: Callable[[], object], repeats: int, min_batch_seconds: float = 0.02) -> Dict:
+    _reset_peak_rss()
+
+    # Batch very fast calls, as timeit does, so clock granularity cannot dominate
+    number = 1
+    while True:
+        cpu_start = time.process_time()
+        for _ in range(number):
+            func()
+        if time.process_time() - cpu_start >= min_batch_seconds or number >= 100000:
+            break
+        number *= 10
+
+    cpu_times = []
+    wall_times = []
+    for _ in range(repeats):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        for _ in range(number):
+            func()
+        cpu_times.append((time.process_time() - cpu_start) / number)
+        wall_times.append((time.perf_counter() - wall_start) / number)
+
+    return {
+        'cpu_seconds': min(cpu_times),
+        'wall_seconds': min(wall_times),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def benchmark_methods(work_dir: str, path: str, quality_metrics: Dict) -> Dict[str, Callable[[], object]]:
+    """Benchmarked callables keyed by name for one prepared input file."""
+    from .tasks import calculate_quality_score
+
+    converted = os.path.join(work_dir, 'converted.wav')
+    trimmed = os.path.join(work_dir, 'trimmed.wav')
+
+    return {
+        'analyze_audio_file': lambda: AudioProcessor.analyze_audio_file(path),
+        'analyze_audio_file_fast': lambda: AudioProcessor.analyze_audio_file(path, profile='fast'),
+        'analyze_audio_file_yin': lambda: AudioProcessor.analyze_audio_file(
+            path, profile=AudioProcessor.get_profile('full', pitch='yin')
+        ),
+        'convert_to_standard_format': lambda: AudioProcessor.convert_to_standard_format(path, converted),
+        'trim_silence': lambda: AudioProcessor.trim_silence(path, trimmed),
+        'calculate_quality_score': lambda: calculate_quality_score(quality_metrics),
+    }
+
+
+def run_benchmarks(signal_types: Optional[List[str]] = None,
+                   sample_rates: Optional[List[int]] = None,
+                   durations: Optional[List[float]] = None,
+                   methods: Optional[List[str]] = None,
+                   repeats: int = 3,
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, Dict]:
+    """Time every benchmarked method over the signal/sample-rate/duration grid."""
+    signal_types = signal_types or SIGNAL_TYPES
+    sample_rates = sample_rates or SAMPLE_RATES
+    durations = durations or DURATIONS
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='audio_bench_')
+    try:
+        # Warm up librosa's lazily compiled kernels outside the measurements
+        warmup = os.path.join(work_dir, 'warmup.wav')
+        sf.write(warmup, generate_signal('speech', 16000, 1.0), 16000, subtype='PCM_16')
+        AudioProcessor.analyze_audio_file(warmup)
+
+        for kind in signal_types:
+            for sr in sample_rates:
+                for duration in durations:
+                    audio = generate_signal(kind, sr, duration)
+                    path = os.path.join(work_dir, f'{kind}_{sr}.wav')
+                    sf.write(path, audio, sr, subtype='PCM_16')
+                    quality_metrics = AudioProcessor._calculate_quality_metrics(audio, sr)
+
+                    cases = benchmark_methods(work_dir, path, quality_metrics)
+                    for name, func in cases.items():
+                        if methods and name not in methods:
+                            continue
+                        key = f'{name}/{kind}/{sr}/{duration:g}s'
+                        timing = _time(func, repeats)
+                        timing['audio_seconds_per_cpu_second'] = (
+                            duration / timing['cpu_seconds'] if timing['cpu_seconds'] > 0 else None
+                        )
+                        results[key] = {
+                            metric: float(f'{value:.6g}') if isinstance(value, float) else value
+                            for metric, value in timing.items()
+                        }
+                        if progress:
+                            progress(key)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict],
+                        tolerance: float = 1.25) -> List[Dict]:
+    """Return cases whose CPU time grew by more than ``tolerance`` times the baseline."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous or not previous.get('cpu_seconds'):
+            continue
+        ratio = result['cpu_seconds'] / previous['cpu_seconds']
+        if ratio > tolerance:
+            regressions.append({
+                'case': key,
+                'baseline_cpu_seconds': previous['cpu_seconds'],
+                'cpu_seconds': result['cpu_seconds'],
+                'ratio': round(ratio, 2),
+            })
+    return regressions
@@ -0,0 +1,162 @@
+import numpy as np
+from typing import Dict, List, Optional
+from .utils import AudioProcessor
+
+
+class LiveQualityMonitor:
+    """Incremental quality checks over PCM frames pushed while recording.
+
+    The monitor keeps a fixed handful of counters and running estimates, so
+    its state stays the same size however long the take runs and can be
+    stored in the cache between requests. Each pushed chunk is split into
+    20 ms analysis frames; a minimum-statistics tracker follows the noise
+    floor and an exponential average follows the energy of frames that sit
+    well above it, giving a running SNR estimate. Bytes short of a whole
+    sample and samples short of a whole frame are carried into the next
+    chunk, so chunk boundaries need not line up with either.
+    """
+
+    ENCODINGS = {
+        'pcm_s16le': ('<i2', 32768.0),
+        'pcm_f32le': ('<f4', 1.0),
+    }
+
+    ANALYSIS_FRAME_SECONDS = 0.02
+    NOISE_FLOOR_RISE = 0.002  # Relative rise per frame when above the floor
+    SPEECH_FACTOR = 4.0  # Frames this far above the floor (6 dB) count as speech
+    SPEECH_SMOOTHING = 0.05
+
+    def __init__(self, sample_rate: int = AudioProcessor.TARGET_SAMPLE_RATE,
+                 encoding: str = 'pcm_s16le', state: Optional[Dict] = None):
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+        self.state = state or {
+            'sample_rate': sample_rate,
+            'encoding': encoding,
+            'samples': 0,
+            'clipped': 0,
+            'silent': 0,
+            'sum_squares': 0.0,
+            'noise_power': None,
+            'speech_power': None,
+            'partial_sample': b'',
+            'partial_frame': b'',
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'LiveQualityMonitor':
+        return cls(state=state)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        dtype, scale = self.ENCODINGS[self.state['encoding']]
+        data = self.state.get('partial_sample', b'') + data
+        usable = len(data) - len(data) % np.dtype(dtype).itemsize
+        self.state['partial_sample'] = data[usable:]
+        return np.frombuffer(data[:usable], dtype=dtype).astype(np.float32) / scale
+
+    def push(self, data: bytes) -> Dict:
+        """Fold a chunk of raw PCM into the running metrics and return a verdict."""
+        audio = self.decode(data)
+        state = self.state
+
+        if len(audio):
+            magnitude = np.abs(audio)
+            state['samples'] += len(audio)
+            state['clipped'] += int(np.count_nonzero(magnitude > AudioProcessor.CLIPPING_THRESHOLD))
+            state['silent'] += int(np.count_nonzero(magnitude < AudioProcessor.SILENCE_THRESHOLD))
+            state['sum_squares'] += float(np.dot(audio, audio))
+            self._track_energy(audio)
+
+        return self.verdict()
+
+    def _track_energy(self, audio: np.ndarray) -> None:
+        state = self.state
+        frame_length = max(1, int(state['sample_rate'] * self.ANALYSIS_FRAME_SECONDS))
+        partial = state.get('partial_frame', b'')
+        if partial:
+            audio = np.concatenate([np.frombuffer(partial, dtype=np.float32), audio])
+        n_frames = len(audio) // frame_length
+        state['partial_frame'] = audio[n_frames * frame_length:].tobytes()
+        if not n_frames:
+            return
+
+        frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energies = np.mean(frames ** 2, axis=1) + 1e-12
+
+        noise = state['noise_power']
+        speech = state['speech_power']
+        for energy in energies.tolist():
+            if noise is None or energy < noise:
+                noise = energy
+            else:
+                noise *= 1.0 + self.NOISE_FLOOR_RISE
+
+            if energy > noise * self.SPEECH_FACTOR:
+                speech = energy if speech is None else (
+                    speech + self.SPEECH_SMOOTHING * (energy - speech)
+                )
+
+        state['noise_power'] = noise
+        state['speech_power'] = speech
+
+    def metrics(self) -> Dict:
+        state = self.state
+        samples = state['samples']
+        if not samples:
+            return {
+                'duration': 0.0,
+                'rms_energy': 0.0,
+                'clipping_ratio': 0.0,
+                'silence_ratio': 0.0,
+                'snr': None,
+            }
+
+        snr = None
+        if state['noise_power'] and state['speech_power']:
+            snr = float(10 * np.log10(state['speech_power'] / state['noise_power']))
+
+        return {
+            'duration': samples / state['sample_rate'],
+            'rms_energy': float(np.sqrt(state['sum_squares'] / samples)),
+            'clipping_ratio': state['clipped'] / samples,
+            'silence_ratio': state['silent'] / samples,
+            'snr': snr,
+        }
+
+    def issues(self, final: bool = False) -> List[str]:
+        """Problems that would make ``_validate_audio_quality`` reject the take.
+
+        Level-based checks wait until the minimum duration has been heard so
+        the lead-in before the speaker starts is not reported as silence.
+        """
+        metrics = self.metrics()
+        issues = []
+
+        if metrics['clipping_ratio'] > AudioProcessor.MAX_CLIPPING_RATIO:
+            issues.append('clipping')
+        if metrics['duration'] > AudioProcessor.MAX_DURATION:
+            issues.append('too_long')
+
+        if final or metrics['duration'] >= AudioProcessor.MIN_DURATION:
+            if metrics['rms_energy'] < AudioProcessor.MIN_RMS_ENERGY:
+                issues.append('too_quiet')
+            if metrics['silence_ratio'] > AudioProcessor.MAX_SILENCE_RATIO:
+                issues.append('mostly_silent')
+            if metrics['snr'] is None:
+                issues.append('no_speech')
+            elif metrics['snr'] < AudioProcessor.MIN_SNR_DB:
+                issues.append('noisy')
+
+        if final and metrics['duration'] < AudioProcessor.MIN_DURATION:
+            issues.append('too_short')
+
+        return issues
+
+    def verdict(self, final: bool = False) -> Dict:
+        issues = self.issues(final)
+        return {
+            'status': 'ok' if not issues else 'warning',
+            'issues': issues,
+            'metrics': self.metrics(),
+        }
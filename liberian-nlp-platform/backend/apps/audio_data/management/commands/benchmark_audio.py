@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import json
+import os
+import platform
+from apps.audio_data import benchmarks
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'audio_processor_baseline.json')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark AudioProcessor on synthetic signals and compare against a stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signals', nargs='+', choices=benchmarks.SIGNAL_TYPES, help='Signal types to generate')
+        parser.add_argument('--sample-rates', nargs='+', type=int, help='Sample rates in Hz')
+        parser.add_argument('--durations', nargs='+', type=float, help='Signal durations in seconds')
+        parser.add_argument('--methods', nargs='+', help='Only benchmark these methods')
+        parser.add_argument('--repeats', type=int, default=3, help='Runs per case; the fastest is kept')
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Overwrite the baseline with these results')
+        parser.add_argument('--tolerance', type=float, default=1.25,
+                            help='CPU time ratio above which a case counts as a regression')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit non-zero on regressions')
+
+    def handle(self, *args, **options):
+        results = benchmarks.run_benchmarks(
+            signal_types=options['signals'],
+            sample_rates=options['sample_rates'],
+            durations=options['durations'],
+            methods=options['methods'],
+            repeats=options['repeats'],
+            progress=lambda key: self.stdout.write(f"  {key}"),
+        )
+
+        self.stdout.write(f"\n{'case':<55} {'cpu s':>9} {'audio s/cpu s':>14} {'peak MB':>9}")
+        for key, result in sorted(results.items()):
+            throughput = result['audio_seconds_per_cpu_second']
+            self.stdout.write(
+                f"{key:<55} {result['cpu_seconds']:>9.3g} "
+                f"{(f'{throughput:.1f}' if throughput else '-'):>14} {result['peak_rss_mb']:>9.1f}"
+            )
+
+        environment = self._environment()
+        stored = None
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as f:
+                stored = json.load(f)
+
+        if options['save_baseline']:
+            # Merge so a partial run only replaces the cases it measured, but
+            # never mix in timings taken on another stack
+            saved = {}
+            if stored and stored.get('environment') == environment:
+                saved = stored['results']
+            saved.update(results)
+
+            os.makedirs(os.path.dirname(options['baseline']), exist_ok=True)
+            with open(options['baseline'], 'w') as f:
+                json.dump({
+                    'environment': environment,
+                    'results': saved,
+                }, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {options['baseline']}"))
+            return
+
+        if stored is None:
+            self.stdout.write(self.style.WARNING(f"No baseline at {options['baseline']}; use --save-baseline"))
+            return
+
+        # Timings from another numpy, librosa or interpreter say nothing about this code
+        if stored.get('environment') != environment:
+            differences = ', '.join(
+                f"{name} {stored.get('environment', {}).get(name)} != {value}"
+                for name, value in sorted(environment.items())
+                if stored.get('environment', {}).get(name) != value
+            )
+            raise CommandError(
+                f"Baseline was recorded in a different environment ({differences}); "
+                f"rerun with --save-baseline on this stack to compare against it"
+            )
+
+        regressions = benchmarks.compare_to_baseline(results, stored['results'], options['tolerance'])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"Regression {regression['case']}: {regression['baseline_cpu_seconds']:.3g}s -> "
+                f"{regression['cpu_seconds']:.3g}s ({regression['ratio']}x)"
+            ))
+
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
+        elif options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} benchmark regressions')
+
+    @staticmethod
+    def _environment():
+        import librosa
+        import numpy
+
+        return {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'numpy': numpy.__version__,
+            'librosa': librosa.__version__,
+        }
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.audio_data.models import PromptCoverage
+from apps.languages.models import Language
+
+
+class Command(BaseCommand):
+    help = 'Recount the prompt features covered by each language\'s recordings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, action='append', help='Language id (repeatable; default: all)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Recordings counted per batch')
+
+    def handle(self, *args, **options):
+        languages = Language.objects.order_by('id')
+        if options['language']:
+            languages = languages.filter(id__in=options['language'])
+
+        start = time.perf_counter()
+        for language in languages:
+            recordings = PromptCoverage.rebuild(language.id, batch_size=options['batch_size'])
+            features = PromptCoverage.objects.filter(language=language).count()
+            self.stdout.write(f"{language.name}: {recordings} recordings cover {features} features")
+        self.stdout.write(self.style.SUCCESS(f"Prompt coverage rebuilt in {time.perf_counter() - start:.1f}s"))
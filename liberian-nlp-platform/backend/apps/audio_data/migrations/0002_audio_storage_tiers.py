@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("audio_data", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="audiorecording",
+            name="archive_size",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Archived file size in bytes", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="audiorecording",
+            name="storage_tier",
+            field=models.CharField(
+                choices=[
+                    ("wav", "WAV (uncompressed)"),
+                    ("flac", "FLAC (lossless archive)"),
+                    ("opus", "Opus (cold archive)"),
+                ],
+                default="wav",
+                help_text="Format of the canonical copy in audio_file",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="audiorecording",
+            name="wav_cached",
+            field=models.BooleanField(
+                default=False, help_text="Decoded 16 kHz WAV present in the cache"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="audiorecording",
+            index=models.Index(
+                fields=["storage_tier", "created_at"],
+                name="audio_data__storage_87a347_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("audio_data", "0002_audio_storage_tiers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="audioprocessingresult",
+            name="stage_timings",
+            field=models.JSONField(
+                blank=True, default=dict, help_text="Seconds spent per pipeline stage"
+            ),
+        ),
+        migrations.CreateModel(
+            name="AudioStageTiming",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("stage", models.CharField(max_length=50)),
+                (
+                    "bucket",
+                    models.PositiveSmallIntegerField(help_text="Index into BUCKETS"),
+                ),
+                ("count", models.PositiveBigIntegerField(default=0)),
+                ("total_seconds", models.FloatField(default=0.0)),
+            ],
+            options={
+                "unique_together": {("stage", "bucket")},
+            },
+        ),
+    ]
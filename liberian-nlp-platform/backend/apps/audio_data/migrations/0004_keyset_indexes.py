@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("audio_data", "0003_audio_stage_timings"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="audiorecording",
+            index=models.Index(
+                fields=["created_at", "id"], name="audio_data__created_d1582f_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:49
+
+from django.db import migrations, models
+from apps.text_data import splits
+
+
+def assign_existing_splits(apps, schema_editor):
+    AudioRecording = apps.get_model("audio_data", "AudioRecording")
+    splits.assign(
+        AudioRecording.objects.all(),
+        ["speaker_id", "recorded_by_id"],
+        lambda row: f"speaker:{row[1]}" if row[1] else f"user:{row[2]}",
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("audio_data", "0004_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="audiorecording",
+            name="split",
+            field=models.CharField(
+                blank=True,
+                choices=[("train", "Train"), ("dev", "Dev"), ("test", "Test")],
+                default="",
+                editable=False,
+                max_length=5,
+            ),
+        ),
+        migrations.RunPython(assign_existing_splits, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="audiorecording",
+            index=models.Index(
+                fields=["split", "language", "status"],
+                name="audio_data__split_c9c315_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+from apps.audio_data import prompts
+
+
+def count_existing_coverage(apps, schema_editor):
+    Language = apps.get_model("languages", "Language")
+    AudioRecording = apps.get_model("audio_data", "AudioRecording")
+    PromptCoverage = apps.get_model("audio_data", "PromptCoverage")
+
+    for language_id in Language.objects.values_list("id", flat=True):
+        changes = (
+            (language_id, normalized, 1)
+            for normalized in AudioRecording.objects.filter(
+                language_id=language_id, sentence__isnull=False
+            )
+            .exclude(status__in=["rejected", "error"])
+            .values_list("sentence__normalized_text", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        PromptCoverage.objects.bulk_create(
+            (
+                PromptCoverage(language_id=language_id, feature=feature, count=count)
+                for (_, feature), count in prompts.deltas(changes).items()
+            ),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("languages", "0002_audiodata_textdata_and_more"),
+        ("audio_data", "0005_splits"),
+        ("text_data", "0013_sentence_normalized_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PromptCoverage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("feature", models.CharField(max_length=255)),
+                ("count", models.BigIntegerField(default=0)),
+                (
+                    "language",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="prompt_coverage",
+                        to="languages.language",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="promptcoverage",
+            constraint=models.UniqueConstraint(
+                fields=("language", "feature"), name="unique_prompt_feature"
+            ),
+        ),
+        migrations.RunPython(count_existing_coverage, migrations.RunPython.noop),
+    ]
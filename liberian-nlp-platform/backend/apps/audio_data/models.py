@@ -1,8 +1,16 @@
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
+import random
 import uuid
 import os
+from apps.text_data import splits
+from apps.text_data.models import Sentence
+from . import prompts
 
 User = get_user_model()
 
@@ -31,6 +39,11 @@ class AudioRecording(models.Model):
         CONVERSATION = 'conversation', 'Conversation'
         NARRATION = 'narration', 'Narration'
     
+    class StorageTier(models.TextChoices):
+        WAV = 'wav', 'WAV (uncompressed)'
+        FLAC = 'flac', 'FLAC (lossless archive)'
+        OPUS = 'opus', 'Opus (cold archive)'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
     # Audio file and metadata
@@ -38,6 +51,16 @@ class AudioRecording(models.Model):
     original_filename = models.CharField(max_length=255)
     file_size = models.PositiveIntegerField(help_text="File size in bytes")
     
+    # Storage tiers
+    storage_tier = models.CharField(
+        max_length=10,
+        choices=StorageTier.choices,
+        default=StorageTier.WAV,
+        help_text="Format of the canonical copy in audio_file"
+    )
+    archive_size = models.PositiveIntegerField(null=True, blank=True, help_text="Archived file size in bytes")
+    wav_cached = models.BooleanField(default=False, help_text="Decoded 16 kHz WAV present in the cache")
+    
     # Audio properties
     duration = models.FloatField(validators=[MinValueValidator(0.1), MaxValueValidator(30.0)])
     sample_rate = models.PositiveIntegerField(default=16000)
@@ -95,17 +118,220 @@ class AudioRecording(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Train/dev/test assignment by speaker, so no voice appears in more than one split
+    split = models.CharField(max_length=5, choices=splits.SPLIT_CHOICES, default='', blank=True, editable=False)
+    
     class Meta:
         indexes = [
             models.Index(fields=['language', 'status']),
             models.Index(fields=['recorded_by']),
             models.Index(fields=['sentence']),
+            models.Index(fields=['storage_tier', 'created_at']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['split', 'language', 'status']),
         ]
     
+    @staticmethod
+    def split_group(speaker_id: str, recorded_by_id) -> str:
+        # Fall back to the uploading account when no speaker was recorded
+        return f'speaker:{speaker_id}' if speaker_id else f'user:{recorded_by_id}'
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what prompt coverage currently counts for this row
+        loaded = dict(zip(field_names, values))
+        if all(name in loaded for name in ('language_id', 'sentence_id', 'status')):
+            instance._covered = (loaded['language_id'], loaded['sentence_id'], loaded['status'])
+        return instance
+    
+    # Fields that decide which prompt features a recording covers
+    COVERAGE_FIELDS = ('language', 'sentence', 'status')
+    
+    def save(self, *args, **kwargs):
+        self.split = splits.split_for(self.split_group(self.speaker_id, self.recorded_by_id))
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not set(update_fields) & set(self.COVERAGE_FIELDS):
+            super().save(*args, **kwargs)
+            return
+        
+        with transaction.atomic():
+            covered = None
+            if not self._state.adding:
+                covered = getattr(self, '_covered', None) or AudioRecording.objects.filter(
+                    pk=self.pk
+                ).values_list('language_id', 'sentence_id', 'status').first()
+            
+            super().save(*args, **kwargs)
+            
+            current = (self.language_id, self.sentence_id, self.status)
+            if covered and update_fields is not None:
+                # Fields left out of update_fields keep their stored values
+                current = tuple(
+                    value if name in update_fields else stored
+                    for name, value, stored in zip(self.COVERAGE_FIELDS, current, covered)
+                )
+            if current != covered:
+                PromptCoverage.apply([*([(*covered, -1)] if covered else []), (*current, 1)])
+            self._covered = current
+    
     def __str__(self) -> str:
         return f"Audio {self.id} - {self.language.name}"
 
 
+class PromptCoverage(models.Model):
+    """How many recordings of a language cover each prompt feature.
+
+    Features are the characters, syllable bigrams and words of recorded
+    sentences (see ``prompts.features``). Rows are kept current by ``apply``
+    as recordings arrive, change status or are deleted, and removed when
+    they drop to zero. Prompt selection reads them to find what is still
+    under-recorded.
+    """
+    
+    UPSERT_CHUNK = 5000
+    LOOKUP_CHUNK = 500
+    
+    # Recordings that will not make it into a dataset cover nothing
+    UNCOUNTED_STATUSES = (AudioRecording.RecordingStatus.REJECTED, AudioRecording.RecordingStatus.ERROR)
+    
+    language = models.ForeignKey('languages.Language', on_delete=models.CASCADE, related_name='prompt_coverage')
+    feature = models.CharField(max_length=prompts.MAX_FEATURE_LENGTH)
+    count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['language', 'feature'], name='unique_prompt_feature'),
+        ]
+    
+    @classmethod
+    def apply(cls, changes) -> None:
+        """Add the features of entering recordings and subtract those of leaving ones.
+
+        ``changes`` are ``(language_id, sentence_id, status, sign)`` tuples;
+        recordings without a sentence or with an uncounted status are
+        skipped. One upsert per row adds the delta in the database, so
+        concurrent uploads never lose counts.
+        """
+        changes = [
+            (language_id, sentence_id, sign)
+            for language_id, sentence_id, status, sign in changes
+            if sentence_id and status not in cls.UNCOUNTED_STATUSES
+        ]
+        if not changes:
+            return
+        texts = dict(Sentence.objects.filter(
+            pk__in={sentence_id for _, sentence_id, _ in changes}
+        ).values_list('id', 'normalized_text'))
+        rows = prompts.deltas(
+            (language_id, texts[sentence_id], sign)
+            for language_id, sentence_id, sign in changes
+            if sentence_id in texts
+        )
+        if not rows:
+            return
+        
+        table = cls._meta.db_table
+        items = [(*key, delta) for key, delta in rows.items()]
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), cls.UPSERT_CHUNK):
+                cursor.executemany(
+                    f"INSERT INTO {table} (language_id, feature, count) VALUES (%s, %s, %s) "
+                    "ON CONFLICT (language_id, feature) DO UPDATE "
+                    f"SET count = {table}.count + excluded.count",
+                    items[start:start + cls.UPSERT_CHUNK]
+                )
+        
+        # Features no recording covers any more
+        shrunk = [(language_id, feature) for (language_id, feature), delta in rows.items() if delta < 0]
+        for start in range(0, len(shrunk), cls.LOOKUP_CHUNK):
+            chunk = shrunk[start:start + cls.LOOKUP_CHUNK]
+            cls.objects.filter(
+                language_id__in={language_id for language_id, _ in chunk},
+                feature__in=[feature for _, feature in chunk],
+                count__lte=0,
+            ).delete()
+    
+    @classmethod
+    def counts(cls, language_id, features) -> dict:
+        """Recordings covering each of ``features`` that any recording covers."""
+        features = list(features)
+        found = {}
+        for start in range(0, len(features), cls.LOOKUP_CHUNK):
+            found.update(cls.objects.filter(
+                language_id=language_id, feature__in=features[start:start + cls.LOOKUP_CHUNK]
+            ).values_list('feature', 'count'))
+        return found
+    
+    @classmethod
+    def select_prompts(cls, language_id, count: int, user=None):
+        """The next ``count`` validated sentences to record, as ``(sentence_id, gain)`` in pick order.
+
+        Lazy greedy over a random window of unrecorded candidates, seeking on
+        the indexed random key: each call sees a different pool, so speakers
+        asking at once are not handed the same prompts, and the pool bounds
+        the work per request.
+        """
+        candidates = Sentence.objects.filter(
+            language_id=language_id,
+            status=Sentence.SentenceStatus.VALIDATED,
+            word_count__lte=settings.PROMPT_MAX_WORDS,
+        ).exclude(
+            Exists(AudioRecording.objects.filter(sentence=OuterRef('pk')).exclude(status__in=cls.UNCOUNTED_STATUSES))
+        )
+        if user is not None:
+            candidates = candidates.exclude(
+                Exists(AudioRecording.objects.filter(sentence=OuterRef('pk'), recorded_by=user))
+            )
+        
+        size = settings.PROMPT_CANDIDATE_POOL
+        point = random.random()
+        rows = list(candidates.filter(random_key__gte=point).order_by('random_key').values_list(
+            'id', 'normalized_text'
+        )[:size])
+        if len(rows) < size:
+            rows += candidates.filter(random_key__lt=point).order_by('random_key').values_list(
+                'id', 'normalized_text'
+            )[:size - len(rows)]
+        
+        pool = {sentence_id: prompts.features(text) for sentence_id, text in rows}
+        objective = prompts.CoverageObjective(
+            cls.counts(language_id, set().union(*pool.values())),
+            settings.PROMPT_COVERAGE_TARGET,
+            settings.PROMPT_FEATURE_WEIGHTS,
+        )
+        return prompts.select(pool, objective, count)
+    
+    @classmethod
+    def rebuild(cls, language_id, batch_size: int = 5000) -> int:
+        """Recount one language's coverage from its recordings; return recordings read."""
+        counted = 0
+        with transaction.atomic():
+            cls.objects.filter(language_id=language_id).delete()
+            changes = []
+            recordings = AudioRecording.objects.filter(language_id=language_id).values_list(
+                'language_id', 'sentence_id', 'status'
+            )
+            for row in recordings.iterator(chunk_size=batch_size):
+                changes.append((*row, 1))
+                if len(changes) >= batch_size:
+                    cls.apply(changes)
+                    counted += len(changes)
+                    changes = []
+            cls.apply(changes)
+        return counted + len(changes)
+
+
+@receiver(pre_delete, sender=AudioRecording)
+def remove_recording_from_prompt_coverage(sender, instance, **kwargs):
+    # Fires for queryset and cascade deletes as well as AudioRecording.delete(). Before
+    # the delete rather than after, since a cascade from Sentence may remove the
+    # sentence row first and its text is needed; the delete runs in the same transaction
+    covered = getattr(instance, '_covered', None) or (instance.language_id, instance.sentence_id, instance.status)
+    PromptCoverage.apply([(*covered, -1)])
+
+
 class AudioProcessingResult(models.Model):
     """Results from audio processing pipeline."""
     
@@ -118,6 +344,7 @@ class AudioProcessingResult(models.Model):
     # Processing metadata
     processed_at = models.DateTimeField(auto_now_add=True)
     processing_duration = models.FloatField(help_text="Processing time in seconds")
+    stage_timings = models.JSONField(default=dict, blank=True, help_text="Seconds spent per pipeline stage")
     
     # Audio analysis results
     spectral_features = models.JSONField(default=dict, blank=True)
@@ -140,6 +367,51 @@ class AudioProcessingResult(models.Model):
         return f"Processing result for {self.recording.id}"
 
 
+class AudioStageTiming(models.Model):
+    """Histogram bucket of audio pipeline stage durations."""
+    
+    # Upper bounds in seconds; the last bucket catches everything slower
+    BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf')]
+    
+    stage = models.CharField(max_length=50)
+    bucket = models.PositiveSmallIntegerField(help_text="Index into BUCKETS")
+    count = models.PositiveBigIntegerField(default=0)
+    total_seconds = models.FloatField(default=0.0)
+    
+    class Meta:
+        unique_together = ['stage', 'bucket']
+    
+    @classmethod
+    def bucket_for(cls, seconds: float) -> int:
+        for index, upper_bound in enumerate(cls.BUCKETS):
+            if seconds <= upper_bound:
+                return index
+        return len(cls.BUCKETS) - 1
+    
+    @classmethod
+    def observe(cls, timings: dict) -> None:
+        """Add one observation per stage in a ``{stage: seconds}`` mapping."""
+        for stage, seconds in timings.items():
+            bucket = cls.bucket_for(seconds)
+            updated = cls.objects.filter(stage=stage, bucket=bucket).update(
+                count=models.F('count') + 1,
+                total_seconds=models.F('total_seconds') + seconds
+            )
+            if not updated:
+                _, created = cls.objects.get_or_create(
+                    stage=stage, bucket=bucket,
+                    defaults={'count': 1, 'total_seconds': seconds}
+                )
+                if not created:
+                    cls.objects.filter(stage=stage, bucket=bucket).update(
+                        count=models.F('count') + 1,
+                        total_seconds=models.F('total_seconds') + seconds
+                    )
+    
+    def __str__(self) -> str:
+        return f"{self.stage} <= {self.BUCKETS[self.bucket]}s: {self.count}"
+
+
 class SpeakerProfile(models.Model):
     """Anonymous speaker profiles for consistency."""
     
@@ -0,0 +1,181 @@
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, List, Mapping, Tuple
+import heapq
+import unicodedata
+from apps.text_data.normalization import tokenize
+
+
+MAX_FEATURE_LENGTH = 255
+
+# Feature kinds, prefixed to each feature as ``kind:value``
+CHARACTER = 'char'
+SYLLABLE_BIGRAM = 'syl'
+WORD = 'word'
+
+VOWELS = frozenset('aeiouɛɔəɪʊɨʌ')
+# Syllable-final nasals, as in Kpelle and Bassa "ŋ" and "n" codas
+NASAL_CODAS = frozenset('nŋm')
+
+
+def graphemes(word: str) -> List[str]:
+    """Letters with their combining marks, so a tone-marked vowel is one unit."""
+    units = []
+    for char in unicodedata.normalize('NFD', word):
+        if units and unicodedata.combining(char):
+            units[-1] += char
+        else:
+            units.append(char)
+    return [unicodedata.normalize('NFC', unit) for unit in units]
+
+
+def _is_vowel(grapheme: str) -> bool:
+    return unicodedata.normalize('NFD', grapheme)[0] in VOWELS
+
+
+def _is_syllabary(grapheme: str) -> bool:
+    # Vai and other syllabic scripts write one syllable per character
+    return grapheme[0].isalpha() and not unicodedata.name(grapheme[0], '').startswith('LATIN')
+
+
+def syllables(word: str) -> List[str]:
+    """Approximate syllables: an onset, a vowel nucleus with its tone marks and a nasal coda.
+
+    Consonants at the start of the next syllable stay there; a nasal
+    followed by another consonant or the end of the word closes the
+    current one.
+    """
+    units = graphemes(word)
+    result = []
+    current = ''
+    index = 0
+    while index < len(units):
+        unit = units[index]
+        if _is_syllabary(unit):
+            if current:
+                result.append(current)
+            result.append(unit)
+            current = ''
+            index += 1
+            continue
+        current += unit
+        index += 1
+        if not _is_vowel(unit):
+            continue
+        # Long vowels and diphthongs belong to the same nucleus
+        while index < len(units) and _is_vowel(units[index]):
+            current += units[index]
+            index += 1
+        nasal = index < len(units) and unicodedata.normalize('NFD', units[index])[0] in NASAL_CODAS
+        if nasal and (index + 1 == len(units) or not _is_vowel(units[index + 1])):
+            current += units[index]
+            index += 1
+        result.append(current)
+        current = ''
+    if current:
+        # Trailing consonants join the last syllable
+        if result:
+            result[-1] += current
+        else:
+            result.append(current)
+    return result
+
+
+@lru_cache(maxsize=100_000)
+def _word_features(word: str) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    # Words recur across sentences far more than they vary
+    found = {f'{CHARACTER}:{unit}' for unit in graphemes(word) if unit[0].isalpha()}
+    found.add(f'{WORD}:{word}')
+    return frozenset(found), tuple(syllables(word))
+
+
+def features(normalized: str) -> FrozenSet[str]:
+    """What recording this normalized text would cover: its characters, syllable bigrams and words.
+
+    Syllable bigrams run across word boundaries, so they capture the tone
+    sequences and transitions a speaker produces reading the sentence aloud.
+    """
+    found = set()
+    sequence = []
+    for word in tokenize(normalized):
+        covered, word_syllables = _word_features(word)
+        found.update(covered)
+        sequence.extend(word_syllables)
+    found.update(f'{SYLLABLE_BIGRAM}:{a} {b}' for a, b in zip(sequence, sequence[1:]))
+    return frozenset(feature for feature in found if len(feature) <= MAX_FEATURE_LENGTH)
+
+
+def kind(feature: str) -> str:
+    return feature.split(':', 1)[0]
+
+
+class CoverageObjective:
+    """Weighted, saturating coverage of features by recorded prompts.
+
+    A feature recorded ``c`` times is worth ``weight * (1 - c / target)``
+    more when one more recording covers it, and nothing from ``target`` on.
+    The gains shrink as coverage grows, so the objective is monotone
+    submodular and greedy selection is within ``1 - 1/e`` of optimal.
+    """
+
+    def __init__(self, coverage: Mapping[str, int], target: int, weights: Mapping[str, float]):
+        self.coverage = dict(coverage)
+        self.target = target
+        self.weights = weights
+        self._feature_weights: Dict[str, float] = {}
+
+    def weight(self, feature: str) -> float:
+        weight = self._feature_weights.get(feature)
+        if weight is None:
+            weight = self._feature_weights[feature] = self.weights.get(kind(feature), 0.0)
+        return weight
+
+    def gain(self, covered: FrozenSet[str]) -> float:
+        total = 0.0
+        for feature in covered:
+            remaining = 1 - self.coverage.get(feature, 0) / self.target
+            if remaining > 0:
+                total += self.weight(feature) * remaining
+        return total
+
+    def add(self, covered: FrozenSet[str]) -> None:
+        for feature in covered:
+            self.coverage[feature] = self.coverage.get(feature, 0) + 1
+
+
+def select(candidates: Mapping[Hashable, FrozenSet[str]], objective: CoverageObjective,
+           count: int) -> List[Tuple[Hashable, float]]:
+    """Lazy greedy: the ``count`` candidates with the largest marginal gains, in pick order.
+
+    A candidate's gain can only shrink as others are picked, so stale gains
+    in the heap are upper bounds; only the top one is re-evaluated, and it
+    is picked as soon as its fresh gain still beats the next bound. Stops
+    early when nothing adds coverage.
+    """
+    keys = list(candidates)
+    heap = [(-objective.gain(candidates[key]), position) for position, key in enumerate(keys)]
+    heapq.heapify(heap)
+
+    selected = []
+    while heap and len(selected) < count:
+        bound, position = heapq.heappop(heap)
+        if -bound <= 0:
+            break
+        covered = candidates[keys[position]]
+        gain = objective.gain(covered)
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, position))
+            continue
+        if gain <= 0:
+            break
+        selected.append((keys[position], gain))
+        objective.add(covered)
+    return selected
+
+
+def deltas(changes) -> Dict[Tuple[int, str], int]:
+    """Fold ``(language_id, normalized_text, sign)`` recording changes into per-feature deltas."""
+    totals: Dict[Tuple[int, str], int] = {}
+    for language_id, normalized, sign in changes:
+        for feature in features(normalized):
+            totals[(language_id, feature)] = totals.get((language_id, feature), 0) + sign
+    return {key: delta for key, delta in totals.items() if delta}
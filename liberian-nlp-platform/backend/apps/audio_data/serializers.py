@@ -2,9 +2,10 @@ from rest_framework import serializers
 from .models import AudioRecording, AudioProcessingResult, SpeakerProfile, AudioDataset
 from apps.languages.serializers import LanguageListSerializer
 from apps.accounts.serializers import UserSerializer
+from config.fieldsets import SparseFieldsetMixin
 
 
-class AudioRecordingSerializer(serializers.ModelSerializer):
+class AudioRecordingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for audio recordings."""
     
     language = LanguageListSerializer(read_only=True)
@@ -18,17 +19,17 @@ class AudioRecordingSerializer(serializers.ModelSerializer):
         model = AudioRecording
         fields = [
             'id', 'audio_file', 'original_filename', 'file_size',
-            'duration', 'sample_rate', 'channels', 'bit_depth',
+            'storage_tier', 'archive_size', 'wav_cached', 'duration', 'sample_rate', 'channels', 'bit_depth',
             'language', 'language_id', 'sentence', 'transcript',
             'status', 'recording_type', 'signal_to_noise_ratio',
             'silence_ratio', 'clipping_detected', 'quality_score',
-            'speaker_id', 'speaker_age_range', 'speaker_gender',
+            'speaker_id', 'speaker_age_range', 'speaker_gender', 'split',
             'recorded_by', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'file_size', 'duration', 'sample_rate', 'channels',
+            'id', 'file_size', 'storage_tier', 'archive_size', 'wav_cached', 'duration', 'sample_rate', 'channels',
             'bit_depth', 'signal_to_noise_ratio', 'silence_ratio',
-            'clipping_detected', 'quality_score', 'recorded_by',
+            'clipping_detected', 'quality_score', 'split', 'recorded_by',
             'created_at', 'updated_at'
         ]
     
@@ -37,7 +38,7 @@ class AudioRecordingSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class AudioRecordingListSerializer(serializers.ModelSerializer):
+class AudioRecordingListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for audio recording lists."""
     
     language_name = serializers.CharField(source='language.name', read_only=True)
@@ -58,7 +59,7 @@ class AudioProcessingResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = AudioProcessingResult
         fields = [
-            'processed_at', 'processing_duration', 'spectral_features',
+            'processed_at', 'processing_duration', 'stage_timings', 'spectral_features',
             'mfcc_features', 'pitch_features', 'noise_level',
             'speech_segments', 'silence_segments', 'auto_transcript',
             'transcript_confidence', 'processing_errors'
@@ -84,7 +85,7 @@ class SpeakerProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class AudioDatasetSerializer(serializers.ModelSerializer):
+class AudioDatasetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for audio datasets."""
     
     language = LanguageListSerializer(read_only=True)
@@ -0,0 +1,213 @@
+import librosa
+import soundfile as sf
+from pydub import AudioSegment
+from django.conf import settings
+from django.core.cache import cache
+from typing import Iterable, List, Optional
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TieredAudioStorage:
+    """Canonical compressed archive with a size-bounded LRU cache of 16 kHz WAVs.
+
+    The canonical copy of a recording lives in ``audio_file`` as FLAC
+    (lossless) or, for cold data, high-bitrate Opus. Training export and
+    review playback read a decoded 16 kHz mono WAV that is materialized on
+    demand into ``AUDIO_CACHE_DIR`` and evicted least-recently-used first
+    once the cache grows past ``AUDIO_CACHE_MAX_BYTES``. Routine eviction
+    runs in the ``evict_audio_cache`` beat task; a cache miss only evicts
+    inline when a running byte counter says the budget is exceeded.
+    """
+
+    FORMATS = {
+        'flac': {'extension': 'flac'},
+        'opus': {'extension': 'opus'},
+    }
+
+    # Approximate bytes in the WAV cache; reset to the real total by each eviction walk
+    SIZE_CACHE_KEY = 'audio_cache:bytes'
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or settings.AUDIO_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else settings.AUDIO_CACHE_MAX_BYTES
+        self.sample_rate = settings.AUDIO_SAMPLE_RATE
+
+    # Archive tier
+
+    @staticmethod
+    def encode(input_file: str, output_file: str, archive_format: str) -> bool:
+        """Encode an audio file into the given archive format."""
+        try:
+            if archive_format == 'flac':
+                audio, sr = sf.read(input_file, dtype='int16', always_2d=False)
+                sf.write(output_file, audio, sr, format='FLAC', subtype='PCM_16')
+            elif archive_format == 'opus':
+                audio = AudioSegment.from_file(input_file)
+                audio.export(
+                    output_file,
+                    format='opus',
+                    codec='libopus',
+                    bitrate=settings.AUDIO_OPUS_BITRATE,
+                )
+            else:
+                raise ValueError(f"Unsupported archive format: {archive_format}")
+
+            return True
+
+        except Exception:
+            logger.exception("Error encoding %s to %s", input_file, archive_format)
+            return False
+
+    def archive(self, recording, archive_format: Optional[str] = None) -> bool:
+        """Re-encode a recording's canonical file into an archive tier."""
+        from .models import AudioRecording
+
+        archive_format = archive_format or settings.AUDIO_ARCHIVE_FORMAT
+        if archive_format not in self.FORMATS:
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+        if recording.storage_tier == archive_format:
+            return True
+
+        extension = self.FORMATS[archive_format]['extension']
+        with tempfile.NamedTemporaryFile(suffix=f'.{extension}', delete=False) as temp_file:
+            temp_path = temp_file.name
+
+        try:
+            if not self.encode(recording.audio_file.path, temp_path, archive_format):
+                return False
+
+            old_name = recording.audio_file.name
+            with open(temp_path, 'rb') as encoded_file:
+                recording.audio_file.save(
+                    f"{recording.id}.{extension}",
+                    encoded_file,
+                    save=False
+                )
+            if old_name and old_name != recording.audio_file.name:
+                recording.audio_file.storage.delete(old_name)
+
+            recording.storage_tier = AudioRecording.StorageTier(archive_format)
+            recording.archive_size = recording.audio_file.size
+            recording.save(update_fields=['audio_file', 'storage_tier', 'archive_size', 'updated_at'])
+
+            return True
+
+        finally:
+            os.unlink(temp_path)
+
+    # WAV cache tier
+
+    def cache_path(self, recording) -> str:
+        return os.path.join(self.cache_dir, str(recording.language_id), f"{recording.id}.wav")
+
+    def materialize(self, recording) -> str:
+        """Return a path to a 16 kHz mono WAV for the recording, decoding if needed."""
+        from .models import AudioRecording
+
+        path = self.cache_path(recording)
+        try:
+            # Touch so eviction treats this entry as recently used
+            os.utime(path, None)
+            return path
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        audio, _ = librosa.load(recording.audio_file.path, sr=self.sample_rate, mono=True)
+
+        # Write beside the final path and rename so readers never see partial files
+        fd, temp_path = tempfile.mkstemp(suffix='.wav', dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            sf.write(temp_path, audio, self.sample_rate, subtype='PCM_16')
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        AudioRecording.objects.filter(id=recording.id).update(wav_cached=True)
+        recording.wav_cached = True
+
+        if self._count_bytes(os.path.getsize(path)) > self.max_bytes:
+            self.evict(keep=[path])
+        return path
+
+    def open_wav(self, recording):
+        """Open the recording's 16 kHz WAV for reading, materializing it if needed.
+
+        An open file stays readable after eviction unlinks it; one retry
+        covers an eviction landing between materializing and opening.
+        """
+        try:
+            return open(self.materialize(recording), 'rb')
+        except FileNotFoundError:
+            return open(self.materialize(recording), 'rb')
+
+    def _count_bytes(self, delta: int) -> int:
+        cache.add(self.SIZE_CACHE_KEY, 0, timeout=None)
+        try:
+            return cache.incr(self.SIZE_CACHE_KEY, delta)
+        except ValueError:
+            # Expired between add and incr; the next eviction walk recounts
+            return 0
+
+    def evict(self, keep: Iterable[str] = ()) -> List[str]:
+        """Evict least-recently-used WAVs until the cache fits its byte budget.
+
+        Paths in ``keep``, such as a WAV about to be served, are never evicted.
+        """
+        from .models import AudioRecording
+
+        keep = set(keep)
+
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.wav'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        evicted = []
+        if total_size > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                evicted.append(os.path.splitext(os.path.basename(path))[0])
+
+        cache.set(self.SIZE_CACHE_KEY, total_size, timeout=None)
+        if evicted:
+            AudioRecording.objects.filter(id__in=evicted).update(wav_cached=False)
+
+        return evicted
+
+    def discard(self, recording) -> None:
+        """Drop the cached WAV for a recording, e.g. after its audio changed."""
+        path = self.cache_path(recording)
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        else:
+            self._count_bytes(-size)
+        recording.wav_cached = False
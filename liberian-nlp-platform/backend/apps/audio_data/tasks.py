@@ -1,7 +1,11 @@
 from celery import shared_task
 from django.conf import settings
-from .models import AudioRecording, AudioProcessingResult
+from .models import AudioRecording, AudioProcessingResult, AudioStageTiming
 from .utils import AudioProcessor
+from .storage import TieredAudioStorage
+from .timing import StageTimings
+from django.utils import timezone
+from datetime import timedelta
 import os
 import tempfile
 
@@ -11,17 +15,26 @@ def process_audio_file(recording_id):
     """Process audio file asynchronously."""
     
     try:
-        recording = AudioRecording.objects.get(id=recording_id)
-        recording.status = AudioRecording.RecordingStatus.PROCESSING
-        recording.save()
+        timings = StageTimings()
+        
+        with timings.stage('db_read'):
+            recording = AudioRecording.objects.get(id=recording_id)
+        
+        with timings.stage('db_write'):
+            recording.status = AudioRecording.RecordingStatus.PROCESSING
+            recording.save()
         
         # Get file path
         audio_file_path = recording.audio_file.path
         
-        # Analyze audio
-        analysis_result = AudioProcessor.analyze_audio_file(audio_file_path)
+        # Analyze audio with the full profile
+        profile = AudioProcessor.get_profile('full', pitch=settings.AUDIO_PITCH_TRACKER)
+        analysis_result = AudioProcessor.analyze_audio_file(audio_file_path, timings, profile=profile)
         
-        if analysis_result.get('is_valid', False):
+        # The upload passed the fast profile, whose decimated SNR can land on
+        # the other side of the threshold; the full-rate verdict is recorded
+        # but never rejects an accepted recording. Only a failed analysis does.
+        if 'error' not in analysis_result:
             # Update recording with quality metrics
             quality_metrics = analysis_result['quality_metrics']
             recording.signal_to_noise_ratio = quality_metrics['snr']
@@ -33,22 +46,50 @@ def process_audio_file(recording_id):
             recording.quality_score = quality_score
             
             # Update processing result
-            processing_result = recording.processing_result
-            processing_result.spectral_features = analysis_result['spectral_features']
-            processing_result.noise_level = quality_metrics['rms_energy']
-            processing_result.speech_segments = analysis_result['speech_segments']
-            processing_result.silence_segments = analysis_result['silence_segments']
-            processing_result.save()
+            with timings.stage('db_read'):
+                processing_result = recording.processing_result
             
-            # Convert to standard format if needed
-            if recording.sample_rate != AudioProcessor.TARGET_SAMPLE_RATE:
-                convert_audio_format.delay(recording_id)
+            with timings.stage('db_write'):
+                processing_result.spectral_features = analysis_result['spectral_features']
+                processing_result.mfcc_features = {
+                    'mean': analysis_result['spectral_features']['mfcc_mean'],
+                    'std': analysis_result['spectral_features']['mfcc_std'],
+                }
+                processing_result.pitch_features = {
+                    'mean': analysis_result['spectral_features'].get('pitch_mean', 0.0),
+                    'method': analysis_result['spectral_features'].get('pitch_method'),
+                }
+                processing_result.noise_level = quality_metrics['rms_energy']
+                processing_result.speech_segments = analysis_result['speech_segments']
+                processing_result.silence_segments = analysis_result['silence_segments']
+                if not analysis_result['is_valid']:
+                    processing_result.processing_errors.append({
+                        'stage': 'quality_metrics',
+                        'error': 'Full-rate analysis is below the quality thresholds the upload passed',
+                    })
+                # Keep the upload's stages; ones that ran in both accumulate
+                merged = StageTimings(processing_result.stage_timings)
+                for name, seconds in timings.durations.items():
+                    merged.add(name, seconds)
+                processing_result.processing_duration = merged.total
+                processing_result.stage_timings = merged.as_dict()
+                processing_result.save()
             
             recording.status = AudioRecording.RecordingStatus.PROCESSED
         else:
             recording.status = AudioRecording.RecordingStatus.ERROR
-            
-        recording.save()
+        
+        with timings.stage('db_write'):
+            recording.save()
+        AudioStageTiming.observe(timings.as_dict())
+        
+        # Convert to standard format if needed; dispatched after saving so an
+        # eager task never races this function's stale copy of the recording
+        if recording.status == AudioRecording.RecordingStatus.PROCESSED:
+            if recording.sample_rate != AudioProcessor.TARGET_SAMPLE_RATE:
+                convert_audio_format.delay(recording_id)
+            else:
+                archive_recording.delay(recording_id)
         
         return f"Processing completed for recording {recording_id}"
         
@@ -66,37 +107,60 @@ def process_audio_file(recording_id):
 
 @shared_task
 def convert_audio_format(recording_id):
-    """Convert audio to standard format."""
+    """Convert audio to standard format and store it in the archive tier."""
     
     try:
         recording = AudioRecording.objects.get(id=recording_id)
+        archive_format = settings.AUDIO_ARCHIVE_FORMAT
+        storage = TieredAudioStorage()
+        timings = StageTimings()
         
-        # Create temporary file for converted audio
+        # Create temporary files for converted and encoded audio
         with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
             temp_path = temp_file.name
+        with tempfile.NamedTemporaryFile(suffix=f'.{archive_format}', delete=False) as temp_file:
+            encoded_path = temp_file.name
         
-        # Convert audio
-        success = AudioProcessor.convert_to_standard_format(
-            recording.audio_file.path,
-            temp_path
-        )
+        # Convert audio, then encode it instead of keeping 16-bit PCM
+        with timings.stage('conversion'):
+            success = (
+                AudioProcessor.convert_to_standard_format(recording.audio_file.path, temp_path)
+                and storage.encode(temp_path, encoded_path, archive_format)
+            )
         
         if success:
             # Replace original file
-            with open(temp_path, 'rb') as converted_file:
+            old_name = recording.audio_file.name
+            with open(encoded_path, 'rb') as encoded_file:
                 recording.audio_file.save(
-                    f"{recording.id}.wav",
-                    converted_file,
-                    save=True
+                    f"{recording.id}.{archive_format}",
+                    encoded_file,
+                    save=False
                 )
+            if old_name != recording.audio_file.name:
+                recording.audio_file.storage.delete(old_name)
+            storage.discard(recording)
             
             # Update properties
             recording.sample_rate = AudioProcessor.TARGET_SAMPLE_RATE
             recording.channels = AudioProcessor.TARGET_CHANNELS
+            recording.storage_tier = archive_format
+            recording.archive_size = recording.audio_file.size
             recording.save()
         
+        # Add conversion time to the recording's processing breakdown
+        AudioStageTiming.observe(timings.as_dict())
+        processing_result = AudioProcessingResult.objects.filter(recording=recording).first()
+        if processing_result:
+            stage_timings = StageTimings(processing_result.stage_timings)
+            stage_timings.add('conversion', timings.durations['conversion'])
+            processing_result.stage_timings = stage_timings.as_dict()
+            processing_result.processing_duration = stage_timings.total
+            processing_result.save(update_fields=['stage_timings', 'processing_duration'])
+        
         # Clean up
         os.unlink(temp_path)
+        os.unlink(encoded_path)
         
         return f"Format conversion completed for recording {recording_id}"
         
@@ -104,6 +168,48 @@ def convert_audio_format(recording_id):
         return f"Format conversion failed for recording {recording_id}: {str(e)}"
 
 
+@shared_task
+def archive_recording(recording_id, archive_format=None):
+    """Move a recording's canonical copy into a compressed archive tier."""
+    
+    try:
+        recording = AudioRecording.objects.get(id=recording_id)
+        
+        if TieredAudioStorage().archive(recording, archive_format):
+            return f"Archived recording {recording_id} as {recording.storage_tier}"
+        return f"Archiving failed for recording {recording_id}"
+        
+    except Exception as e:
+        return f"Archiving failed for recording {recording_id}: {str(e)}"
+
+
+@shared_task
+def archive_cold_recordings():
+    """Re-encode recordings older than AUDIO_COLD_AFTER_DAYS into the cold tier."""
+    
+    cold_format = settings.AUDIO_COLD_ARCHIVE_FORMAT
+    cutoff = timezone.now() - timedelta(days=settings.AUDIO_COLD_AFTER_DAYS)
+    
+    recording_ids = list(
+        AudioRecording.objects.filter(created_at__lt=cutoff)
+        .exclude(storage_tier=cold_format)
+        .values_list('id', flat=True)
+    )
+    
+    for recording_id in recording_ids:
+        archive_recording.delay(str(recording_id), cold_format)
+    
+    return f"Cold archiving started for {len(recording_ids)} recordings"
+
+
+@shared_task
+def evict_audio_cache():
+    """Trim the WAV materialization cache back under its byte budget."""
+    
+    evicted = TieredAudioStorage().evict()
+    return f"Evicted {len(evicted)} cached recordings"
+
+
 @shared_task
 def batch_process_recordings(recording_ids):
     """Process multiple recordings in batch."""
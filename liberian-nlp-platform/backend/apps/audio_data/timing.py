@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import time
+
+
+class StageTimings:
+    """Wall-clock timings for the named stages of the audio pipeline.
+
+    Timing a stage costs two ``perf_counter`` calls, so a collector can be
+    threaded through every request and task without measurable overhead.
+    Repeated stages accumulate into the same entry.
+    """
+
+    STAGES = [
+        'decode',
+        'stft',
+        'quality_metrics',
+        'spectral_features',
+        'segmentation',
+        'conversion',
+        'db_read',
+        'db_write',
+    ]
+
+    def __init__(self, initial: Optional[Dict[str, float]] = None):
+        self.durations: Dict[str, float] = dict(initial or {})
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 6) for name, seconds in self.durations.items()}
@@ -4,10 +4,15 @@ from . import views
 urlpatterns = [
     path('recordings/', views.AudioRecordingListView.as_view(), name='recording-list'),
     path('recordings/<uuid:pk>/', views.AudioRecordingDetailView.as_view(), name='recording-detail'),
+    path('recordings/<uuid:recording_id>/playback/', views.recording_playback, name='recording-playback'),
     path('recordings/<uuid:recording_id>/processing/', views.AudioProcessingResultView.as_view(), name='processing-result'),
     path('upload/', views.upload_audio, name='upload-audio'),
+    path('live-check/', views.start_live_check, name='start-live-check'),
+    path('live-check/<uuid:session_id>/', views.live_check, name='live-check'),
     path('speaker-profile/', views.SpeakerProfileView.as_view(), name='speaker-profile'),
     path('datasets/', views.AudioDatasetListView.as_view(), name='dataset-list'),
+    path('prompts/', views.recording_prompts, name='recording-prompts'),
     path('stats/', views.audio_stats, name='audio-stats'),
+    path('metrics/', views.processing_metrics, name='audio-processing-metrics'),
     path('sentence/<uuid:sentence_id>/recordings/', views.recording_for_sentence, name='sentence-recordings'),
 ]
\ No newline at end of file
@@ -5,6 +5,7 @@ from pydub import AudioSegment
 from typing import Dict, List, Tuple, Optional
 import tempfile
 import os
+from .timing import StageTimings
 
 
 class AudioProcessor:
@@ -15,12 +16,58 @@ class AudioProcessor:
     MIN_DURATION = 1.0  # seconds
     MAX_DURATION = 30.0  # seconds
     
+    # Quality thresholds shared by upload validation and live feedback
+    CLIPPING_THRESHOLD = 0.95
+    SILENCE_THRESHOLD = 0.01
+    MIN_SNR_DB = 10.0
+    MAX_CLIPPING_RATIO = 0.01
+    MAX_SILENCE_RATIO = 0.8
+    MIN_RMS_ENERGY = 0.001
+    
+    # Named analysis profiles. ``fast`` computes only what
+    # _validate_audio_quality needs and estimates SNR on a decimated copy,
+    # so it fits in the upload request; ``full`` adds the spectral, pitch
+    # and segmentation features and runs in Celery, where a failed quality
+    # check is only noted because the upload has already been accepted.
+    ANALYSIS_PROFILES = {
+        'fast': {
+            'snr_sample_rate': 8000,
+            'spectral_features': False,
+            'segmentation': False,
+            'pitch': None,
+        },
+        'full': {
+            'snr_sample_rate': None,
+            'spectral_features': True,
+            'segmentation': True,
+            'pitch': 'piptrack',
+        },
+    }
+    PITCH_TRACKERS = ['piptrack', 'yin']
+    
+    @staticmethod
+    def get_profile(profile, **overrides) -> Dict:
+        """Resolve a profile name (or dict) with optional per-call overrides."""
+        if isinstance(profile, str):
+            if profile not in AudioProcessor.ANALYSIS_PROFILES:
+                raise ValueError(f"Unknown analysis profile: {profile}")
+            profile = AudioProcessor.ANALYSIS_PROFILES[profile]
+        resolved = {**profile, **overrides}
+        if resolved.get('pitch') not in AudioProcessor.PITCH_TRACKERS + [None]:
+            raise ValueError(f"Unknown pitch tracker: {resolved['pitch']}")
+        return resolved
+    
     @staticmethod
-    def analyze_audio_file(file_path: str) -> Dict:
+    def analyze_audio_file(file_path: str, timings: Optional[StageTimings] = None,
+                           profile='full') -> Dict:
         """Analyze audio file and extract metadata and quality metrics."""
+        timings = timings if timings is not None else StageTimings()
         try:
+            options = AudioProcessor.get_profile(profile)
+            
             # Load audio file
-            audio, sr = librosa.load(file_path, sr=None)
+            with timings.stage('decode'):
+                audio, sr = librosa.load(file_path, sr=None)
             duration = len(audio) / sr
             
             # Basic properties
@@ -32,36 +79,57 @@ class AudioProcessor:
             }
             
             # Quality metrics
-            quality_metrics = AudioProcessor._calculate_quality_metrics(audio, sr)
+            with timings.stage('stft'):
+                snr_sr = options['snr_sample_rate']
+                if snr_sr and snr_sr < sr:
+                    decimated = librosa.resample(audio, orig_sr=sr, target_sr=snr_sr, res_type='soxr_qq')
+                    snr_magnitude = np.abs(librosa.stft(decimated, n_fft=512, hop_length=128))
+                    magnitude = None
+                else:
+                    magnitude = np.abs(librosa.stft(audio))
+                    snr_magnitude = magnitude
+            with timings.stage('quality_metrics'):
+                quality_metrics = AudioProcessor._calculate_quality_metrics(audio, sr, snr_magnitude)
+            
+            result = {
+                'profile': profile if isinstance(profile, str) else 'custom',
+                'properties': properties,
+                'quality_metrics': quality_metrics,
+                'is_valid': AudioProcessor._validate_audio_quality(quality_metrics, properties),
+            }
             
             # Spectral features
-            spectral_features = AudioProcessor._extract_spectral_features(audio, sr)
+            if options['spectral_features']:
+                with timings.stage('spectral_features'):
+                    result['spectral_features'] = AudioProcessor._extract_spectral_features(
+                        audio, sr, magnitude=magnitude, pitch=options['pitch']
+                    )
             
             # Speech/silence segmentation
-            speech_segments, silence_segments = AudioProcessor._segment_speech_silence(audio, sr)
+            if options['segmentation']:
+                with timings.stage('segmentation'):
+                    result['speech_segments'], result['silence_segments'] = (
+                        AudioProcessor._segment_speech_silence(audio, sr)
+                    )
             
-            return {
-                'properties': properties,
-                'quality_metrics': quality_metrics,
-                'spectral_features': spectral_features,
-                'speech_segments': speech_segments,
-                'silence_segments': silence_segments,
-                'is_valid': AudioProcessor._validate_audio_quality(quality_metrics, properties)
-            }
+            result['timings'] = timings.as_dict()
+            return result
             
         except Exception as e:
             return {
                 'error': str(e),
-                'is_valid': False
+                'is_valid': False,
+                'timings': timings.as_dict(),
             }
     
     @staticmethod
-    def _calculate_quality_metrics(audio: np.ndarray, sr: int) -> Dict:
+    def _calculate_quality_metrics(audio: np.ndarray, sr: int,
+                                   magnitude: Optional[np.ndarray] = None) -> Dict:
         """Calculate audio quality metrics."""
         # Signal-to-noise ratio estimation
         # Use spectral subtraction method for SNR estimation
-        stft = librosa.stft(audio)
-        magnitude = np.abs(stft)
+        if magnitude is None:
+            magnitude = np.abs(librosa.stft(audio))
         
         # Estimate noise from first and last 10% of the signal
         noise_frames = int(0.1 * magnitude.shape[1])
@@ -76,12 +144,12 @@ class AudioProcessor:
         snr = 10 * np.log10(signal_power / (noise_power + 1e-10))
         
         # Clipping detection
-        clipping_threshold = 0.95
+        clipping_threshold = AudioProcessor.CLIPPING_THRESHOLD
         clipping_detected = np.any(np.abs(audio) > clipping_threshold)
         clipping_ratio = np.sum(np.abs(audio) > clipping_threshold) / len(audio)
         
         # Silence ratio
-        silence_threshold = 0.01
+        silence_threshold = AudioProcessor.SILENCE_THRESHOLD
         silence_ratio = np.sum(np.abs(audio) < silence_threshold) / len(audio)
         
         # RMS energy
@@ -100,27 +168,66 @@ class AudioProcessor:
         }
     
     @staticmethod
-    def _extract_spectral_features(audio: np.ndarray, sr: int) -> Dict:
+    def _extract_spectral_features(audio: np.ndarray, sr: int,
+                                   magnitude: Optional[np.ndarray] = None,
+                                   pitch: Optional[str] = 'piptrack') -> Dict:
         """Extract spectral features from audio."""
+        # Share one magnitude spectrogram across all descriptors
+        if magnitude is None:
+            magnitude = np.abs(librosa.stft(audio))
+        
         # MFCC features
-        mfccs = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=13)
+        mel = librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr)
+        mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=13)
         
         # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=audio, sr=sr)
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=audio, sr=sr)
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(y=audio, sr=sr)
+        spectral_centroids = librosa.feature.spectral_centroid(S=magnitude, sr=sr)
+        spectral_rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr)
+        spectral_bandwidth = librosa.feature.spectral_bandwidth(S=magnitude, sr=sr)
         
-        # Pitch features
-        pitches, magnitudes = librosa.piptrack(y=audio, sr=sr)
-        
-        return {
+        features = {
             'mfcc_mean': mfccs.mean(axis=1).tolist(),
             'mfcc_std': mfccs.std(axis=1).tolist(),
             'spectral_centroid_mean': float(np.mean(spectral_centroids)),
             'spectral_rolloff_mean': float(np.mean(spectral_rolloff)),
             'spectral_bandwidth_mean': float(np.mean(spectral_bandwidth)),
-            'pitch_mean': float(np.mean(pitches[pitches > 0])) if np.any(pitches > 0) else 0.0,
         }
+        
+        # Pitch features
+        if pitch == 'yin':
+            features['pitch_mean'] = AudioProcessor._estimate_pitch_yin(audio, sr)
+            features['pitch_method'] = 'yin'
+        elif pitch == 'piptrack':
+            pitches, magnitudes = librosa.piptrack(S=magnitude, sr=sr)
+            features['pitch_mean'] = float(np.mean(pitches[pitches > 0])) if np.any(pitches > 0) else 0.0
+            features['pitch_method'] = 'piptrack'
+        
+        return features
+    
+    @staticmethod
+    def _estimate_pitch_yin(audio: np.ndarray, sr: int,
+                            fmin: float = 65.0, fmax: float = 500.0) -> float:
+        """Mean F0 over voiced frames using YIN on a decimated signal.
+        
+        Speech F0 sits well below 500 Hz, so tracking at 8 kHz loses nothing
+        and is several times cheaper than piptrack at the native rate.
+        """
+        pitch_sr = 8000
+        if sr > pitch_sr:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=pitch_sr, res_type='soxr_qq')
+            sr = pitch_sr
+        
+        frame_length, hop_length = 512, 256
+        if len(audio) < frame_length:
+            return 0.0
+        
+        f0 = librosa.yin(audio, fmin=fmin, fmax=fmax, sr=sr,
+                         frame_length=frame_length, hop_length=hop_length)
+        rms = librosa.feature.rms(y=audio, frame_length=frame_length, hop_length=hop_length)[0]
+        
+        # Only average frames loud enough to be speech
+        voiced = rms[:len(f0)] > max(np.percentile(rms, 30), AudioProcessor.SILENCE_THRESHOLD)
+        return float(np.mean(f0[:len(voiced)][voiced])) if np.any(voiced) else 0.0
     
     @staticmethod
     def _segment_speech_silence(audio: np.ndarray, sr: int, 
@@ -175,19 +282,19 @@ class AudioProcessor:
             return False
         
         # SNR check
-        if quality_metrics['snr'] < 10:  # Minimum 10 dB SNR
+        if quality_metrics['snr'] < AudioProcessor.MIN_SNR_DB:
             return False
         
         # Clipping check
-        if quality_metrics['clipping_ratio'] > 0.01:  # Max 1% clipping
+        if quality_metrics['clipping_ratio'] > AudioProcessor.MAX_CLIPPING_RATIO:
             return False
         
         # Silence check
-        if quality_metrics['silence_ratio'] > 0.8:  # Max 80% silence
+        if quality_metrics['silence_ratio'] > AudioProcessor.MAX_SILENCE_RATIO:
             return False
         
         # Energy check
-        if quality_metrics['rms_energy'] < 0.001:  # Minimum energy threshold
+        if quality_metrics['rms_energy'] < AudioProcessor.MIN_RMS_ENERGY:
             return False
         
         return True
@@ -4,23 +4,37 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Count, Sum, Avg
 from django.core.files.storage import default_storage
+from django.core.cache import cache
+from django.http import FileResponse
 from django.conf import settings
+from contextlib import contextmanager
 import os
 import tempfile
-from .models import AudioRecording, AudioProcessingResult, SpeakerProfile, AudioDataset
+import time
+import uuid
+from config.fieldsets import SparseFieldsetViewMixin
+from config.pagination import KeysetPagination
+from apps.languages.models import Language
+from apps.text_data.models import Sentence
+from apps.text_data.serializers import SentenceListSerializer
+from .models import AudioRecording, AudioProcessingResult, AudioStageTiming, SpeakerProfile, AudioDataset, PromptCoverage
 from .serializers import (
     AudioRecordingSerializer, AudioRecordingListSerializer,
     AudioProcessingResultSerializer, SpeakerProfileSerializer,
     AudioDatasetSerializer, AudioUploadSerializer, AudioStatsSerializer
 )
 from .utils import AudioProcessor
-from .tasks import process_audio_file  # Will be implemented with Celery
+from .storage import TieredAudioStorage
+from .timing import StageTimings
+from .live import LiveQualityMonitor
+from .tasks import process_audio_file
 
 
-class AudioRecordingListView(generics.ListCreateAPIView):
+class AudioRecordingListView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List and upload audio recordings."""
     
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     parser_classes = [MultiPartParser, FormParser]
     
     def get_serializer_class(self):
@@ -51,10 +65,15 @@ class AudioRecordingListView(generics.ListCreateAPIView):
         if contributor:
             queryset = queryset.filter(recorded_by_id=contributor)
         
+        # Filter by train/dev/test split
+        split = self.request.query_params.get('split')
+        if split:
+            queryset = queryset.filter(split=split)
+        
         return queryset.order_by('-created_at')
 
 
-class AudioRecordingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AudioRecordingDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete an audio recording."""
     
     queryset = AudioRecording.objects.all()
@@ -71,6 +90,7 @@ def upload_audio(request):
     serializer.is_valid(raise_exception=True)
     
     audio_file = serializer.validated_data['audio_file']
+    timings = StageTimings()
     
     try:
         # Save uploaded file temporarily
@@ -79,61 +99,59 @@ def upload_audio(request):
                 temp_file.write(chunk)
             temp_file_path = temp_file.name
         
-        # Analyze audio file
-        analysis_result = AudioProcessor.analyze_audio_file(temp_file_path)
+        # Validate with the fast profile; deep features are filled in later
+        analysis_result = AudioProcessor.analyze_audio_file(temp_file_path, timings, profile='fast')
         
         if not analysis_result.get('is_valid', False):
             os.unlink(temp_file_path)
+            AudioStageTiming.observe(timings.as_dict())
             return Response({
                 'error': 'Audio file does not meet quality requirements',
                 'details': analysis_result.get('error', 'Quality validation failed')
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create audio recording
-        recording = AudioRecording.objects.create(
-            audio_file=audio_file,
-            original_filename=audio_file.name,
-            file_size=audio_file.size,
-            duration=analysis_result['properties']['duration'],
-            sample_rate=analysis_result['properties']['sample_rate'],
-            channels=analysis_result['properties']['channels'],
-            language_id=serializer.validated_data['language_id'],
-            sentence_id=serializer.validated_data.get('sentence_id'),
-            transcript=serializer.validated_data.get('transcript', ''),
-            recording_type=serializer.validated_data['recording_type'],
-            speaker_age_range=serializer.validated_data.get('speaker_age_range', ''),
-            speaker_gender=serializer.validated_data.get('speaker_gender', ''),
-            recorded_by=request.user,
-            status=AudioRecording.RecordingStatus.PROCESSING,
-            # Quality metrics from analysis
-            signal_to_noise_ratio=analysis_result['quality_metrics']['snr'],
-            silence_ratio=analysis_result['quality_metrics']['silence_ratio'],
-            clipping_detected=analysis_result['quality_metrics']['clipping_detected'],
-        )
-        
-        # Create processing result
-        AudioProcessingResult.objects.create(
-            recording=recording,
-            processing_duration=0.0,  # Will be updated by async task
-            spectral_features=analysis_result['spectral_features'],
-            noise_level=analysis_result['quality_metrics']['rms_energy'],
-            speech_segments=analysis_result['speech_segments'],
-            silence_segments=analysis_result['silence_segments'],
-        )
+        with timings.stage('db_write'):
+            # Create audio recording
+            recording = AudioRecording.objects.create(
+                audio_file=audio_file,
+                original_filename=audio_file.name,
+                file_size=audio_file.size,
+                duration=analysis_result['properties']['duration'],
+                sample_rate=analysis_result['properties']['sample_rate'],
+                channels=analysis_result['properties']['channels'],
+                language_id=serializer.validated_data['language_id'],
+                sentence_id=serializer.validated_data.get('sentence_id'),
+                transcript=serializer.validated_data.get('transcript', ''),
+                recording_type=serializer.validated_data['recording_type'],
+                speaker_age_range=serializer.validated_data.get('speaker_age_range', ''),
+                speaker_gender=serializer.validated_data.get('speaker_gender', ''),
+                recorded_by=request.user,
+                status=AudioRecording.RecordingStatus.PROCESSING,
+                # Quality metrics from analysis
+                signal_to_noise_ratio=analysis_result['quality_metrics']['snr'],
+                silence_ratio=analysis_result['quality_metrics']['silence_ratio'],
+                clipping_detected=analysis_result['quality_metrics']['clipping_detected'],
+            )
+            
+            # Create processing result; the full profile fills in the features
+            AudioProcessingResult.objects.create(
+                recording=recording,
+                processing_duration=timings.total,
+                stage_timings=timings.as_dict(),
+                noise_level=analysis_result['quality_metrics']['rms_energy'],
+            )
         
         # Clean up temporary file
         os.unlink(temp_file_path)
+        AudioStageTiming.observe(timings.as_dict())
         
-        # Trigger async processing (if Celery is available)
-        # process_audio_file.delay(recording.id)
-        
-        # For now, mark as processed
-        recording.status = AudioRecording.RecordingStatus.PROCESSED
-        recording.save()
+        # Run the full analysis profile in Celery
+        process_audio_file.delay(str(recording.id))
+        recording.refresh_from_db()
         
         return Response({
             'recording': AudioRecordingSerializer(recording).data,
-            'message': 'Audio uploaded and processed successfully'
+            'message': 'Audio uploaded successfully; full analysis is queued'
         }, status=status.HTTP_201_CREATED)
     
     except Exception as e:
@@ -163,7 +181,7 @@ class SpeakerProfileView(generics.RetrieveUpdateAPIView):
         return profile
 
 
-class AudioDatasetListView(generics.ListCreateAPIView):
+class AudioDatasetListView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List and create audio datasets."""
     
     queryset = AudioDataset.objects.all()
@@ -271,6 +289,43 @@ def recording_for_sentence(request, sentence_id):
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recording_prompts(request):
+    """The next sentences to record in a language, chosen to cover what is still under-recorded.
+    
+    Sentences are picked greedily by how many of their characters, syllable
+    bigrams and words have fewer than ``PROMPT_COVERAGE_TARGET`` recordings,
+    counting those already picked in the batch. ``gain`` is that marginal
+    coverage. Sentences the requesting user has recorded are skipped.
+    """
+    
+    try:
+        language = Language.objects.get(pk=request.query_params.get('language'))
+    except (Language.DoesNotExist, ValueError, TypeError):
+        return Response({'error': 'language is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        count = min(max(int(request.query_params.get('count', 10)), 1), settings.MAX_PROMPT_BATCH_SIZE)
+    except ValueError:
+        return Response({'error': 'count must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    selected = PromptCoverage.select_prompts(language.pk, count, user=request.user)
+    sentences = Sentence.objects.select_related('language', 'corpus', 'contributed_by').in_bulk(
+        [sentence_id for sentence_id, _ in selected]
+    )
+    results = []
+    for sentence_id, gain in selected:
+        data = SentenceListSerializer(sentences[sentence_id]).data
+        data['gain'] = round(gain, 4)
+        results.append(data)
+    
+    return Response({
+        'language_id': language.pk,
+        'count': len(results),
+        'results': results,
+    })
+
+
 class AudioProcessingResultView(generics.RetrieveAPIView):
     """Get processing results for an audio recording."""
     
@@ -280,4 +335,148 @@ class AudioProcessingResultView(generics.RetrieveAPIView):
     def get_object(self):
         recording_id = self.kwargs['recording_id']
         recording = AudioRecording.objects.get(id=recording_id)
-        return recording.processing_result
\ No newline at end of file
+        return recording.processing_result
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recording_playback(request, recording_id):
+    """Stream a 16 kHz WAV of a recording, materializing it from the archive if needed."""
+    
+    try:
+        recording = AudioRecording.objects.get(id=recording_id)
+    except AudioRecording.DoesNotExist:
+        return Response({'error': 'Recording not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        wav_file = TieredAudioStorage().open_wav(recording)
+    except Exception as e:
+        return Response({
+            'error': f'Failed to decode audio: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return FileResponse(wav_file, content_type='audio/wav', filename=f"{recording.id}.wav")
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def processing_metrics(request):
+    """Get per-stage processing time histograms for the audio pipeline."""
+    
+    buckets = AudioStageTiming.BUCKETS
+    stages = {}
+    
+    for row in AudioStageTiming.objects.order_by('stage', 'bucket'):
+        stage = stages.setdefault(row.stage, {
+            'count': 0,
+            'total_seconds': 0.0,
+            'buckets': [0] * len(buckets),
+        })
+        stage['count'] += row.count
+        stage['total_seconds'] += row.total_seconds
+        stage['buckets'][row.bucket] += row.count
+    
+    for stage in stages.values():
+        # Report cumulative counts per upper bound, as histograms usually are
+        cumulative = 0
+        histogram = []
+        for upper_bound, count in zip(buckets, stage['buckets']):
+            cumulative += count
+            histogram.append({
+                'le': '+Inf' if upper_bound == float('inf') else upper_bound,
+                'count': cumulative,
+            })
+        stage['buckets'] = histogram
+        stage['mean_seconds'] = stage['total_seconds'] / stage['count'] if stage['count'] else 0.0
+    
+    return Response({'stages': stages})
+
+
+LIVE_CHECK_TIMEOUT = 300  # seconds a live session survives without frames
+LIVE_CHECK_LOCK_TIMEOUT = 10  # seconds before a crashed request's lock lapses
+LIVE_CHECK_LOCK_WAIT = 2.0  # seconds a chunk waits for the one before it
+
+
+def _live_check_key(user, session_id):
+    return f"audio:live:{user.id}:{session_id}"
+
+
+@contextmanager
+def _live_check_lock(key):
+    """Serialize the read-modify-write of one session's state across requests.
+    
+    Yields False if the session stayed locked for LIVE_CHECK_LOCK_WAIT.
+    """
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + LIVE_CHECK_LOCK_WAIT
+    while not cache.add(lock_key, token, LIVE_CHECK_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.01)
+    try:
+        yield True
+    finally:
+        # Only release our own lock, not one taken after ours lapsed
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def start_live_check(request):
+    """Start a live quality check session for a take that is being recorded."""
+    
+    try:
+        sample_rate = int(request.data.get('sample_rate', AudioProcessor.TARGET_SAMPLE_RATE))
+        if not 8000 <= sample_rate <= 96000:
+            raise ValueError(sample_rate)
+        monitor = LiveQualityMonitor(
+            sample_rate=sample_rate,
+            encoding=request.data.get('encoding', 'pcm_s16le')
+        )
+    except ValueError:
+        return Response({
+            'error': 'Unsupported sample rate or encoding',
+            'encodings': list(LiveQualityMonitor.ENCODINGS)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    session_id = str(uuid.uuid4())
+    cache.set(_live_check_key(request.user, session_id), monitor.state, LIVE_CHECK_TIMEOUT)
+    
+    return Response({
+        'session_id': session_id,
+        'sample_rate': sample_rate,
+        'encoding': monitor.state['encoding'],
+        'recommended_chunk_ms': 100,
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def live_check(request, session_id):
+    """Push raw PCM frames (POST) or finish the session for a final verdict (DELETE)."""
+    
+    key = _live_check_key(request.user, session_id)
+    with _live_check_lock(key) as locked:
+        if not locked:
+            return Response({'error': 'Live check session is busy with another chunk'},
+                            status=status.HTTP_409_CONFLICT)
+        
+        state = cache.get(key)
+        if state is None:
+            return Response({'error': 'Live check session not found or expired'},
+                            status=status.HTTP_404_NOT_FOUND)
+        
+        monitor = LiveQualityMonitor.from_state(state)
+        
+        if request.method == 'DELETE':
+            cache.delete(key)
+            verdict = monitor.verdict(final=True)
+            verdict['would_pass'] = not verdict['issues']
+            return Response(verdict)
+        
+        verdict = monitor.push(request.body)
+        cache.set(key, monitor.state, LIVE_CHECK_TIMEOUT)
+    return Response(verdict)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsetMixin
 from .models import Language, TextData, AudioData
 
 class LanguageSerializer(serializers.ModelSerializer):
@@ -9,6 +10,11 @@ class LanguageSerializer(serializers.ModelSerializer):
                  'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+class LanguageListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Language
+        fields = ['id', 'name', 'iso_code']
+
 class TextDataSerializer(serializers.ModelSerializer):
     source_language_name = serializers.CharField(source='source_language.name', read_only=True)
     target_language_name = serializers.CharField(source='target_language.name', read_only=True)
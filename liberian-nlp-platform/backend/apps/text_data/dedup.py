@@ -0,0 +1,72 @@
+import numpy as np
+from hashlib import blake2b
+from typing import List, Optional
+import zlib
+from .normalization import tokenize
+
+
+SHINGLE_SIZE = 4  # Characters per shingle
+NUM_BANDS = 20
+BAND_ROWS = 5
+NUM_PERM = NUM_BANDS * BAND_ROWS  # Candidate threshold ~ (1 / NUM_BANDS) ** (1 / BAND_ROWS) = 0.55
+
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Fixed seed: stored signatures are only comparable under the same permutations
+_rng = np.random.RandomState(20240601)
+PERM_A = _rng.randint(1, MERSENNE_PRIME, NUM_PERM).astype(np.uint64)
+PERM_B = _rng.randint(0, MERSENNE_PRIME, NUM_PERM).astype(np.uint64)
+
+
+def shingle_text(normalized: str) -> str:
+    """Words of normalized text joined by single spaces, so punctuation is ignored."""
+    return ' '.join(tokenize(normalized))
+
+
+def shingles(normalized: str) -> np.ndarray:
+    text = shingle_text(normalized)
+    if not text:
+        return np.empty(0, dtype=np.uint64)
+    grams = {text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+    return np.fromiter(
+        (zlib.crc32(gram.encode('utf-8')) & MERSENNE_PRIME for gram in grams),
+        dtype=np.uint64, count=len(grams)
+    )
+
+
+def signature(normalized: str) -> Optional[np.ndarray]:
+    """MinHash signature of normalized text, or None when it has no words to compare."""
+    hashes = shingles(normalized)
+    if not len(hashes):
+        return None
+    # a * x + b stays below 2**63 because every operand is below 2**31
+    permuted = (np.outer(PERM_A, hashes) + PERM_B[:, None]) % MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(minhash: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per LSH band."""
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = minhash[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(first == second)) / NUM_PERM
+
+
+def similarities(minhash: np.ndarray, others: List[np.ndarray]) -> np.ndarray:
+    """``similarity`` of one signature against each of ``others``, compared in one pass."""
+    return np.count_nonzero(np.vstack(others) == minhash, axis=1) / NUM_PERM
+
+
+def to_bytes(minhash: np.ndarray) -> bytes:
+    return minhash.astype('<u4').tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype='<u4')
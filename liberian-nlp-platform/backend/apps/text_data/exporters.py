@@ -0,0 +1,321 @@
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import io
+import json
+import tempfile
+import zipfile
+import zlib
+from .models import Translation, TranslationCluster
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+EXPORT_FORMATS = ['moses', 'jsonl', 'parquet']
+COMPRESSIONS = ['none', 'gzip', 'zstd']
+COMPRESSION_SUFFIXES = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+CONTENT_TYPES = {
+    'moses': 'application/zip',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+EXPORT_COLUMNS = ('id', 'source', 'target', 'split', 'translation_type', 'confidence_score', 'length_ratio')
+EXPORT_FIELDS = (
+    'id', 'source_sentence__text', 'target_sentence__text', 'split',
+    'translation_type', 'confidence_score', 'length_ratio'
+)
+
+# Spill the Moses target side to disk beyond this, so memory stays flat
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class ExportError(Exception):
+    """Requested format or compression cannot be produced in this environment."""
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+def compressor(compression: str):
+    """Incremental compressor with ``compress``/``flush``, whatever the codec."""
+    if compression == 'gzip':
+        return zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return _Identity()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink that hands back whatever was written since the last ``take``."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _line(text: str) -> bytes:
+    # Moses files are aligned by line number, so embedded breaks would shift every later pair
+    return (' '.join(text.splitlines()) + '\n').encode('utf-8')
+
+
+class ParallelExporter:
+    """Stream translation pairs for one language pair as Moses, JSONL or Parquet.
+
+    Rows are read with ``values_list(...).iterator()`` in key order, so no
+    model instances are built and memory stays flat however many pairs
+    there are. ``stream()`` yields encoded, compressed bytes chunk by chunk;
+    Moses pairs go out as a stored zip of the two compressed side files.
+    """
+
+    def __init__(self, source_language, target_language, export_format: str = 'jsonl',
+                 compression: str = 'none', chunk_size: int = 5000,
+                 status: Optional[str] = Translation.TranslationStatus.VALIDATED,
+                 corpus_id: Optional[int] = None, split: Optional[str] = None):
+        if export_format not in EXPORT_FORMATS:
+            raise ExportError(f'Unknown export format {export_format}')
+        if compression not in COMPRESSIONS:
+            raise ExportError(f'Unknown compression {compression}')
+        if export_format == 'parquet' and pa is None:
+            raise ExportError('Parquet export needs pyarrow installed')
+        if compression == 'zstd' and zstandard is None:
+            raise ExportError('zstd compression needs zstandard installed')
+
+        self.source_language = source_language
+        self.target_language = target_language
+        self.export_format = export_format
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.status = status
+        self.corpus_id = corpus_id
+        self.split = split
+        self.exported = 0
+
+    def queryset(self):
+        queryset = Translation.objects.filter(
+            source_sentence__language=self.source_language,
+            target_sentence__language=self.target_language,
+        )
+        if self.status:
+            queryset = queryset.filter(status=self.status)
+        if self.corpus_id:
+            queryset = queryset.filter(source_sentence__corpus_id=self.corpus_id)
+        if self.split:
+            queryset = queryset.filter(split=self.split)
+        return queryset.order_by('created_at', 'id')
+
+    def chunks(self) -> Iterator[List[Tuple]]:
+        rows = self.queryset().values_list(*EXPORT_FIELDS).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            self.exported += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def language_code(language) -> str:
+        return language.iso_code or str(language.pk)
+
+    @property
+    def stem(self) -> str:
+        return f'{self.language_code(self.source_language)}-{self.language_code(self.target_language)}'
+
+    def side_names(self) -> Tuple[str, str]:
+        """Moses file names, e.g. ``bsq-en.bsq.gz`` and ``bsq-en.en.gz``."""
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        return (
+            f'{self.stem}.{self.language_code(self.source_language)}{suffix}',
+            f'{self.stem}.{self.language_code(self.target_language)}{suffix}',
+        )
+
+    @property
+    def filename(self) -> str:
+        stem = self.stem
+        if self.export_format == 'moses':
+            return f'{stem}.zip'
+        if self.export_format == 'parquet':
+            return f'{stem}.parquet'
+        return f'{stem}.jsonl{COMPRESSION_SUFFIXES[self.compression]}'
+
+    @property
+    def content_type(self) -> str:
+        if self.export_format == 'jsonl' and self.compression != 'none':
+            return 'application/gzip' if self.compression == 'gzip' else 'application/zstd'
+        return CONTENT_TYPES[self.export_format]
+
+    def stream(self) -> Iterator[bytes]:
+        if self.export_format == 'moses':
+            return self.stream_moses()
+        if self.export_format == 'parquet':
+            return self.stream_parquet()
+        return self.stream_jsonl()
+
+    def stream_jsonl(self) -> Iterator[bytes]:
+        codec = compressor(self.compression)
+        for chunk in self.chunks():
+            lines = [
+                json.dumps(dict(zip(EXPORT_COLUMNS, (str(row[0]), *row[1:]))), ensure_ascii=False)
+                for row in chunk
+            ]
+            data = codec.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+            if data:
+                yield data
+        yield codec.flush()
+
+    def stream_parquet(self) -> Iterator[bytes]:
+        # Parquet compresses per column chunk, so the codec goes to the writer rather than the stream
+        schema = pa.schema([
+            ('id', pa.string()),
+            ('source', pa.string()),
+            ('target', pa.string()),
+            ('split', pa.string()),
+            ('translation_type', pa.string()),
+            ('confidence_score', pa.float64()),
+            ('length_ratio', pa.float64()),
+        ])
+        sink = _Drain()
+        writer = pq.ParquetWriter(sink, schema, compression=self.compression)
+        for chunk in self.chunks():
+            columns = list(zip(*chunk))
+            columns[0] = [str(value) for value in columns[0]]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            data = sink.take()
+            if data:
+                yield data
+        writer.close()
+        yield sink.take()
+
+    def write_moses(self, source_file: BinaryIO, target_file: BinaryIO) -> int:
+        """Write both sides to open binary files; return the number of pairs."""
+        source_codec = compressor(self.compression)
+        target_codec = compressor(self.compression)
+        for chunk in self.chunks():
+            source_file.write(source_codec.compress(b''.join(_line(row[1]) for row in chunk)))
+            target_file.write(target_codec.compress(b''.join(_line(row[2]) for row in chunk)))
+        source_file.write(source_codec.flush())
+        target_file.write(target_codec.flush())
+        return self.exported
+
+    def stream_moses(self) -> Iterator[bytes]:
+        # One pass over the pairs: the source side streams straight into the
+        # zip while the target side is spooled, then copied in after it
+        source_name, target_name = self.side_names()
+        sink = _Drain()
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool, \
+                zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+            source_codec = compressor(self.compression)
+            target_codec = compressor(self.compression)
+            with archive.open(source_name, 'w', force_zip64=True) as member:
+                for chunk in self.chunks():
+                    member.write(source_codec.compress(b''.join(_line(row[1]) for row in chunk)))
+                    spool.write(target_codec.compress(b''.join(_line(row[2]) for row in chunk)))
+                    yield sink.take()
+                member.write(source_codec.flush())
+            spool.write(target_codec.flush())
+
+            spool.seek(0)
+            with archive.open(target_name, 'w', force_zip64=True) as member:
+                for block in iter(lambda: spool.read(1024 * 1024), b''):
+                    member.write(block)
+                    yield sink.take()
+        yield sink.take()
+
+
+class AlignedExporter:
+    """Stream N-way aligned tuples as JSONL, one line per translation cluster.
+
+    A cluster qualifies when it holds a sentence in every requested
+    language, whether those were translated from each other directly or
+    through a pivot language. Cluster rows are read in cluster order with
+    ``values_list(...).iterator()``, so each cluster arrives as a run of
+    consecutive rows and memory stays flat. Where a cluster has several
+    sentences in one language, the oldest is used.
+    """
+
+    def __init__(self, languages, compression: str = 'none', chunk_size: int = 5000,
+                 status: Optional[str] = None):
+        if compression not in COMPRESSIONS:
+            raise ExportError(f'Unknown compression {compression}')
+        if compression == 'zstd' and zstandard is None:
+            raise ExportError('zstd compression needs zstandard installed')
+
+        self.languages = list(languages)
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.status = status
+        self.exported = 0
+
+    def queryset(self):
+        queryset = TranslationCluster.objects.filter(sentence__language__in=self.languages)
+        if self.status:
+            queryset = queryset.filter(sentence__status=self.status)
+        return queryset.order_by('cluster', 'sentence__language_id', 'sentence__created_at')
+
+    def tuples(self) -> Iterator[Dict[str, str]]:
+        codes = {language.pk: ParallelExporter.language_code(language) for language in self.languages}
+        rows = self.queryset().values_list('cluster', 'sentence__language_id', 'sentence__text')
+        for cluster, members in groupby(rows.iterator(chunk_size=self.chunk_size), key=itemgetter(0)):
+            texts = {}
+            for _, language_id, text in members:
+                texts.setdefault(codes[language_id], text)
+            if len(texts) == len(codes):
+                self.exported += 1
+                yield {'cluster': str(cluster), **texts}
+
+    @property
+    def filename(self) -> str:
+        stem = '-'.join(ParallelExporter.language_code(language) for language in self.languages)
+        return f'{stem}.jsonl{COMPRESSION_SUFFIXES[self.compression]}'
+
+    @property
+    def content_type(self) -> str:
+        if self.compression != 'none':
+            return 'application/gzip' if self.compression == 'gzip' else 'application/zstd'
+        return CONTENT_TYPES['jsonl']
+
+    def stream(self) -> Iterator[bytes]:
+        codec = compressor(self.compression)
+        tuples = self.tuples()
+        while True:
+            lines = [json.dumps(row, ensure_ascii=False) for row in islice(tuples, self.chunk_size)]
+            if not lines:
+                break
+            data = codec.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+            if data:
+                yield data
+        yield codec.flush()
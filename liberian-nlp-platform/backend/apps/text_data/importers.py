@@ -0,0 +1,469 @@
+from django.db import transaction
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from collections import defaultdict
+import csv
+import itertools
+import json
+import os
+import xml.etree.ElementTree as ET
+from . import quality, search, splits
+from .models import (
+    Corpus, CorpusStatistic, Sentence, SentenceSignature, Translation, TranslationCluster, VocabularyEntry
+)
+
+
+FORMATS = ['csv', 'tsv', 'jsonl', 'txt']
+PARALLEL_FORMATS = ['tmx', 'moses', 'tsv']
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.txt': 'txt',
+}
+DIFFICULTY_LEVELS = {'beginner', 'intermediate', 'advanced'}
+TRANSLATION_TYPES = {'literal', 'free', 'cultural'}
+MAX_SENTENCE_LENGTH = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportRowError(ValueError):
+    """A single input row that cannot become a sentence."""
+
+
+def detect_format(filename: str) -> Optional[str]:
+    return EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def _read_delimited(stream: TextIO, delimiter: str) -> Iterator[Tuple[int, Dict]]:
+    reader = csv.DictReader(stream, delimiter=delimiter)
+    if not reader.fieldnames or 'text' not in reader.fieldnames:
+        raise ImportRowError("Header row with a 'text' column is required")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _read_jsonl(stream: TextIO) -> Iterator[Tuple[int, Dict]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ImportRowError(f"Invalid JSON: {e.msg}")
+            continue
+        yield line_number, row if isinstance(row, dict) else {'text': row}
+
+
+def _read_text(stream: TextIO) -> Iterator[Tuple[int, Dict]]:
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_number, {'text': line}
+
+
+def read_rows(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield ``(line_number, row)`` pairs from a text stream without buffering it."""
+    if file_format == 'csv':
+        return _read_delimited(stream, ',')
+    if file_format == 'tsv':
+        return _read_delimited(stream, '\t')
+    if file_format == 'jsonl':
+        return _read_jsonl(stream)
+    if file_format == 'txt':
+        return _read_text(stream)
+    raise ValueError(f"Unsupported format: {file_format}")
+
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+
+def _segment_text(seg) -> str:
+    # Keep the running text but drop inline markup such as <ph> or <bpt>
+    return (seg.text or '') + ''.join(child.tail or '' for child in seg)
+
+
+def read_tmx(stream, source_lang: Optional[str] = None,
+             target_lang: Optional[str] = None) -> Iterator[Tuple[int, Dict]]:
+    """Yield translation units from a TMX file using incremental parsing.
+
+    Units are matched to the source and target by ``xml:lang`` prefix when
+    language codes are given, otherwise the first two variants are used.
+    Parsed units are detached from the tree so memory does not grow with
+    the file.
+    """
+    unit_number = 0
+    # Open elements, so a finished unit can be removed from its parent
+    # (ElementTree has no parent pointers)
+    open_elements = []
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(element)
+            continue
+        open_elements.pop()
+        if element.tag != 'tu':
+            continue
+        unit_number += 1
+
+        variants = []
+        for tuv in element.findall('tuv'):
+            lang = (tuv.get(XML_LANG) or tuv.get('lang') or '').lower()
+            seg = tuv.find('seg')
+            variants.append((lang, _segment_text(seg) if seg is not None else ''))
+        element.clear()
+        if open_elements:
+            open_elements[-1].remove(element)
+
+        def pick(code, fallback_index):
+            if code:
+                code = code.lower()
+                for lang, text in variants:
+                    if lang == code or lang.split('-')[0] == code:
+                        return text
+                return None
+            return variants[fallback_index][1] if len(variants) > fallback_index else None
+
+        source_text, target_text = pick(source_lang, 0), pick(target_lang, 1)
+        if source_text is None or target_text is None:
+            yield unit_number, ImportRowError('Translation unit is missing the source or target variant')
+            continue
+        yield unit_number, {'source_text': source_text, 'target_text': target_text}
+
+
+def read_moses(source_stream: TextIO, target_stream: TextIO) -> Iterator[Tuple[int, Dict]]:
+    """Yield line-aligned pairs from Moses-style parallel text files."""
+    for line_number, (source, target) in enumerate(
+        itertools.zip_longest(source_stream, target_stream), start=1
+    ):
+        if source is None or target is None:
+            yield line_number, ImportRowError('Source and target files have different line counts')
+            return
+        if not source.strip() and not target.strip():
+            continue
+        yield line_number, {'source_text': source, 'target_text': target}
+
+
+def read_parallel_tsv(stream: TextIO) -> Iterator[Tuple[int, Dict]]:
+    """Yield pairs from ``source<TAB>target`` lines; a source/target header is skipped."""
+    reader = csv.reader(stream, delimiter='\t', quoting=csv.QUOTE_NONE)
+    for row in reader:
+        if reader.line_num == 1 and [cell.strip().lower() for cell in row[:2]] == ['source', 'target']:
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) != 2:
+            yield reader.line_num, ImportRowError(f'Expected 2 tab-separated columns, got {len(row)}')
+            continue
+        yield reader.line_num, {'source_text': row[0], 'target_text': row[1]}
+
+
+def detect_parallel_format(filename: str) -> Optional[str]:
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.tmx':
+        return 'tmx'
+    return 'tsv' if EXTENSIONS.get(extension) == 'tsv' else None
+
+
+def clean_text(text) -> str:
+    if not isinstance(text, str):
+        raise ImportRowError("Missing or non-string text")
+    text = text.strip()
+    if not text:
+        raise ImportRowError("Empty sentence")
+    if len(text) > MAX_SENTENCE_LENGTH:
+        raise ImportRowError(f"Sentence longer than {MAX_SENTENCE_LENGTH} characters")
+    return text
+
+
+class BulkImporter:
+    """Shared batching and reject bookkeeping for the bulk importers.
+
+    Subclasses turn one parsed row into whatever ``build`` returns and
+    insert a full batch of ``(line_number, item)`` pairs in ``insert``;
+    each batch is written in its own transaction so memory stays bounded
+    by the batch size. Rows whose text already exists are skipped and
+    reported with the id of the existing record; with ``report_ids`` the
+    ids of created records are reported too.
+    """
+
+    def __init__(self, batch_size: int = 1000, report_ids: bool = False):
+        self.batch_size = batch_size
+        self.report_ids = report_ids
+        self.created = 0
+        self.rejected = 0
+        self.errors: List[Dict] = []
+        self.duplicates = 0
+        self.existing: List[Dict] = []
+        self.ids: List[Dict] = []
+
+    def build(self, row: Dict):
+        raise NotImplementedError
+
+    def insert(self, batch: List[Tuple[int, object]]) -> int:
+        """Write one batch and return how many items were created."""
+        raise NotImplementedError
+
+    def reject(self, line_number: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def skip_duplicate(self, line_number: int, existing_id) -> None:
+        self.duplicates += 1
+        if len(self.existing) < MAX_REPORTED_ERRORS:
+            self.existing.append({'line': line_number, 'id': str(existing_id)})
+
+    def record_created(self, line_number: int, created_id) -> None:
+        if self.report_ids:
+            self.ids.append({'line': line_number, 'id': str(created_id)})
+
+    def create_sentences(self, sentences: List[Sentence]) -> None:
+        """Bulk-create sentences with everything ``Sentence.save()`` would maintain."""
+        if not sentences:
+            return
+        # match_existing has normally normalized them already
+        Sentence.normalize([sentence for sentence in sentences if not sentence.normalized_text])
+        for sentence in sentences:
+            sentence.split = splits.split_for(sentence.pk)
+        Sentence.detect_languages(sentences)
+        fingerprints = SentenceSignature.flag(sentences)
+        Sentence.objects.bulk_create(sentences, batch_size=self.batch_size)
+        SentenceSignature.store(sentences, fingerprints)
+
+        totals = defaultdict(lambda: [0, 0])
+        for sentence in sentences:
+            totals[sentence.corpus_id][0] += 1
+            totals[sentence.corpus_id][1] += sentence.word_count
+        for corpus_id, (count, words) in totals.items():
+            Corpus.adjust_counts(corpus_id, sentences=count, words=words)
+        CorpusStatistic.apply(
+            change
+            for sentence in sentences
+            for change in CorpusStatistic.sentence_changes(sentence.language_id, sentence.status, 1)
+        )
+        VocabularyEntry.apply([
+            (*VocabularyEntry.sentence_state(
+                sentence.language_id, sentence.corpus_id, sentence.status, sentence.normalized_text
+            ), 1)
+            for sentence in sentences
+        ])
+
+        search.index_sentences(sentences)
+
+    def flush(self, batch: List) -> None:
+        if not batch:
+            return
+        with transaction.atomic():
+            self.created += self.insert(batch)
+        batch.clear()
+
+    def run(self, rows: Iterable[Tuple[int, Dict]]) -> Dict:
+        batch: List = []
+        for line_number, row in rows:
+            if isinstance(row, ImportRowError):
+                self.reject(line_number, str(row))
+                continue
+            try:
+                batch.append((line_number, self.build(row)))
+            except ImportRowError as e:
+                self.reject(line_number, str(e))
+                continue
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+        self.flush(batch)
+        return self.report()
+
+    def report(self) -> Dict:
+        report = {
+            'created': self.created,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'duplicates': self.duplicates,
+            'existing': self.existing,
+        }
+        if self.report_ids:
+            report['ids'] = self.ids
+        return report
+
+
+class SentenceImporter(BulkImporter):
+    """Stream rows into a corpus with batched ``bulk_create``.
+
+    Rows are validated and counted in the parser, so ``Sentence.save()``
+    never runs.
+    """
+
+    def __init__(self, corpus, contributed_by, batch_size: int = 1000,
+                 status: str = Sentence.SentenceStatus.SUBMITTED,
+                 difficulty_level: str = 'intermediate'):
+        super().__init__(batch_size)
+        self.corpus = corpus
+        self.contributed_by = contributed_by
+        self.status = status
+        self.difficulty_level = difficulty_level
+
+    def build(self, row: Dict) -> Sentence:
+        text = clean_text(row.get('text'))
+
+        difficulty_level = row.get('difficulty_level') or self.difficulty_level
+        if not isinstance(difficulty_level, str) or difficulty_level not in DIFFICULTY_LEVELS:
+            raise ImportRowError(f"Unknown difficulty level: {difficulty_level}")
+
+        word_count, character_count = Sentence.count_text(text)
+        return Sentence(
+            text=text,
+            language_id=self.corpus.language_id,
+            corpus=self.corpus,
+            status=self.status,
+            difficulty_level=difficulty_level,
+            source_text=str(row.get('source_text') or ''),
+            word_count=word_count,
+            character_count=character_count,
+            contributed_by=self.contributed_by,
+        )
+
+    def insert(self, batch: List[Tuple[int, Sentence]]) -> int:
+        sentences = [sentence for _, sentence in batch]
+        created = []
+        for (line_number, sentence), existing_id in zip(batch, Sentence.match_existing(sentences)):
+            if existing_id:
+                self.skip_duplicate(line_number, existing_id)
+            else:
+                created.append(sentence)
+                self.record_created(line_number, sentence.pk)
+        self.create_sentences(created)
+        return len(created)
+
+    def report(self) -> Dict:
+        return {'corpus_id': self.corpus.id, **super().report()}
+
+
+class TranslationPairImporter(BulkImporter):
+    """Bulk-create source sentences, target sentences and translations.
+
+    Mirrors ``create_translation_pair`` for every aligned pair, but with
+    length ratios and quality flags computed for the whole batch at once
+    instead of by ``Translation.save()`` one pair at a time. Rows may
+    override ``translation_type`` and ``difficulty_level``.
+    """
+
+    def __init__(self, corpus, source_language_id: int, target_language_id: int,
+                 translated_by, batch_size: int = 1000,
+                 status: str = Translation.TranslationStatus.SUBMITTED,
+                 translation_type: str = 'free',
+                 difficulty_level: str = 'intermediate',
+                 report_ids: bool = False):
+        super().__init__(batch_size, report_ids)
+        self.corpus = corpus
+        self.source_language_id = source_language_id
+        self.target_language_id = target_language_id
+        self.translated_by = translated_by
+        self.status = status
+        self.translation_type = translation_type
+        self.difficulty_level = difficulty_level
+
+    def build(self, row: Dict) -> Tuple[Sentence, Sentence, Translation]:
+        source_text = clean_text(row.get('source_text'))
+        target_text = clean_text(row.get('target_text'))
+
+        translation_type = row.get('translation_type') or self.translation_type
+        if not isinstance(translation_type, str) or translation_type not in TRANSLATION_TYPES:
+            raise ImportRowError(f"Unknown translation type: {translation_type}")
+        difficulty_level = row.get('difficulty_level') or self.difficulty_level
+        if not isinstance(difficulty_level, str) or difficulty_level not in DIFFICULTY_LEVELS:
+            raise ImportRowError(f"Unknown difficulty level: {difficulty_level}")
+
+        source_words, source_chars = Sentence.count_text(source_text)
+        target_words, target_chars = Sentence.count_text(target_text)
+
+        source_sentence = Sentence(
+            text=source_text,
+            language_id=self.source_language_id,
+            corpus=self.corpus,
+            difficulty_level=difficulty_level,
+            word_count=source_words,
+            character_count=source_chars,
+            contributed_by=self.translated_by,
+            status=Sentence.SentenceStatus.SUBMITTED,
+        )
+        target_sentence = Sentence(
+            text=target_text,
+            language_id=self.target_language_id,
+            corpus=self.corpus,
+            difficulty_level=difficulty_level,
+            source_text=source_text,
+            source_language_id=self.source_language_id,
+            word_count=target_words,
+            character_count=target_chars,
+            contributed_by=self.translated_by,
+            status=Sentence.SentenceStatus.SUBMITTED,
+        )
+        translation = Translation(
+            source_sentence=source_sentence,
+            target_sentence=target_sentence,
+            translation_type=translation_type,
+            translated_by=self.translated_by,
+            status=self.status,
+        )
+        return source_sentence, target_sentence, translation
+
+    def insert(self, batch: List[Tuple[int, Tuple[Sentence, Sentence, Translation]]]) -> int:
+        # Reuse sentences whose text already exists instead of copying them
+        source_matches = Sentence.match_existing([source for _, (source, _, _) in batch])
+        target_matches = Sentence.match_existing([target for _, (_, target, _) in batch])
+
+        sentences = []
+        for (_, (source, target, _)), source_id, target_id in zip(batch, source_matches, target_matches):
+            if not source_id:
+                sentences.append(source)
+            if not target_id:
+                sentences.append(target)
+
+        # A match is an earlier sentence of this batch or a stored one; point
+        # translations at the objects themselves so the quality checks below
+        # never read a sentence back one at a time
+        matched = {sentence.pk: sentence for sentence in sentences}
+        stored_ids = {sentence_id for sentence_id in source_matches + target_matches if sentence_id} - matched.keys()
+        if stored_ids:
+            matched.update(Sentence.objects.only(
+                'text', 'language_id', 'word_count', 'character_count', 'text_hash', 'normalized_text'
+            ).in_bulk(stored_ids))
+        for (_, (_, _, translation)), source_id, target_id in zip(batch, source_matches, target_matches):
+            if source_id:
+                translation.source_sentence = matched[source_id]
+            if target_id:
+                translation.target_sentence = matched[target_id]
+
+        known_pairs = {}
+        reused = [(source_id, target_id) for source_id, target_id in zip(source_matches, target_matches)
+                  if source_id and target_id]
+        if reused:
+            rows = Translation.objects.filter(
+                source_sentence_id__in={source_id for source_id, _ in reused},
+                target_sentence_id__in={target_id for _, target_id in reused},
+            ).values_list('source_sentence_id', 'target_sentence_id', 'id')
+            known_pairs = {(source_id, target_id): translation_id for source_id, target_id, translation_id in rows}
+
+        translations = []
+        for line_number, (_, _, translation) in batch:
+            pair = (translation.source_sentence_id, translation.target_sentence_id)
+            if pair in known_pairs:
+                self.skip_duplicate(line_number, known_pairs[pair])
+                continue
+            known_pairs[pair] = translation.pk
+            translations.append(translation)
+            self.record_created(line_number, translation.pk)
+
+        for translation in translations:
+            translation.split = splits.split_for(translation.source_sentence_id)
+        quality.assess(translations)
+        self.create_sentences(sentences)
+        Translation.objects.bulk_create(translations, batch_size=self.batch_size)
+        TranslationCluster.link(
+            [(translation.source_sentence_id, translation.target_sentence_id) for translation in translations]
+        )
+        CorpusStatistic.apply([(CorpusStatistic.TRANSLATIONS, '', len(translations))])
+        return len(translations)
+
+    def report(self) -> Dict:
+        return {'corpus_id': self.corpus.id, **super().report()}
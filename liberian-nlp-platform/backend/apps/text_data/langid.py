@@ -0,0 +1,131 @@
+from datetime import datetime
+from django.conf import settings
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import os
+import tempfile
+import threading
+from .normalization import normalize_text
+
+
+NGRAM_RANGE = (1, 3)  # Character n-grams within word boundaries
+NUM_FEATURES = 2 ** 17
+SMOOTHING = 0.1  # Additive smoothing on n-gram counts
+
+VECTORIZER = HashingVectorizer(
+    analyzer='char_wb',
+    ngram_range=NGRAM_RANGE,
+    n_features=NUM_FEATURES,
+    preprocessor=normalize_text,
+    alternate_sign=False,
+    norm=None,
+    dtype=np.float32,
+)
+
+
+class LanguageIdentifier:
+    """Multinomial naive Bayes over hashed character n-grams, one class per ``Language``.
+
+    The model is nothing but per-language n-gram counts, so training more
+    sentences or a new language only adds to them. Classes get a uniform
+    prior: a language with little text is not outvoted by one with a lot.
+    """
+
+    def __init__(self, language_ids: Sequence[int] = (), counts: Optional[np.ndarray] = None,
+                 trained_until: Optional[datetime] = None):
+        self.language_ids = list(language_ids)
+        self.counts = counts if counts is not None else np.zeros((0, NUM_FEATURES), dtype=np.float32)
+        self.trained_until = trained_until
+        self._log_probs = None
+
+    def partial_fit(self, texts: Sequence[str], language_ids: Sequence[int]) -> None:
+        features = VECTORIZER.transform(texts)
+        for language_id in sorted(set(language_ids) - set(self.language_ids)):
+            self.language_ids.append(language_id)
+            self.counts = np.vstack([self.counts, np.zeros((1, NUM_FEATURES), dtype=np.float32)])
+
+        rows = np.array([self.language_ids.index(language_id) for language_id in language_ids])
+        for row in np.unique(rows):
+            self.counts[row] += np.asarray(features[rows == row].sum(axis=0)).ravel()
+        self._log_probs = None
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[Optional[int], float]]:
+        """``(language_id, probability)`` for each text, scored as one sparse matrix product."""
+        if not self.language_ids or not len(texts):
+            return [(None, 0.0)] * len(texts)
+        if self._log_probs is None:
+            smoothed = self.counts + SMOOTHING
+            self._log_probs = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+
+        scores = np.asarray(VECTORIZER.transform(texts) @ self._log_probs.T)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [
+            (self.language_ids[index], float(probabilities[row, index]))
+            for row, index in enumerate(best)
+        ]
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename, so running processes never load a half-written file
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as handle:
+            np.savez_compressed(
+                handle,
+                language_ids=np.array(self.language_ids, dtype=np.int64),
+                counts=self.counts,
+                trained_until=np.array(self.trained_until.isoformat() if self.trained_until else ''),
+            )
+        os.replace(handle.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LanguageIdentifier':
+        with np.load(path) as data:
+            trained_until = str(data['trained_until'])
+            return cls(
+                data['language_ids'].tolist(),
+                data['counts'],
+                datetime.fromisoformat(trained_until) if trained_until else None,
+            )
+
+
+_cache: Dict[str, Tuple[float, LanguageIdentifier]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_identifier() -> Optional[LanguageIdentifier]:
+    """The trained model, reloaded whenever the file on disk changes; None before first training."""
+    path = settings.LID_MODEL_PATH
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _cache_lock:
+        cached = _cache.get(path)
+        if not cached or cached[0] != modified:
+            cached = _cache[path] = (modified, LanguageIdentifier.load(path))
+        return cached[1]
+
+
+def is_confident(text: str, probability: float) -> bool:
+    # A few characters can look like anything
+    return (len(normalize_text(text)) >= settings.LID_MIN_CHARACTERS
+            and probability >= settings.LID_MIN_CONFIDENCE)
+
+
+def detect(texts: Sequence[str]) -> List[Tuple[Optional[int], float]]:
+    """Confident ``(language_id, probability)`` per text; ``(None, p)`` when unsure.
+
+    Texts shorter than ``LID_MIN_CHARACTERS`` or scored below
+    ``LID_MIN_CONFIDENCE`` get no language.
+    """
+    identifier = get_identifier()
+    if identifier is None:
+        return [(None, 0.0)] * len(texts)
+    return [
+        (language_id if is_confident(text, probability) else None, probability)
+        for text, (language_id, probability) in zip(texts, identifier.predict(texts))
+    ]
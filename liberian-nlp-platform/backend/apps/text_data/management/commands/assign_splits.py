@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.audio_data.models import AudioRecording
+from apps.text_data import splits
+from apps.text_data.models import Sentence, Translation
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored train/dev/test split of every sentence, translation and recording'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows read per batch')
+        parser.add_argument('--missing-only', action='store_true', help='Only assign rows that have no split yet')
+
+    def handle(self, *args, **options):
+        targets = [
+            ('sentences', Sentence.objects.all(), [], lambda row: row[0]),
+            ('translations', Translation.objects.all(), ['source_sentence_id'], lambda row: row[1]),
+            ('recordings', AudioRecording.objects.all(), ['speaker_id', 'recorded_by_id'],
+             lambda row: AudioRecording.split_group(row[1], row[2])),
+        ]
+        for label, queryset, fields, group in targets:
+            if options['missing_only']:
+                queryset = queryset.filter(split='')
+            start = time.perf_counter()
+            counts = splits.assign(queryset, fields, group, batch_size=options['batch_size'])
+            summary = ', '.join(f'{counts[name]} {name}' for name in splits.SPLITS)
+            self.stdout.write(self.style.SUCCESS(
+                f"Assigned {label}: {summary} in {time.perf_counter() - start:.1f}s"
+            ))
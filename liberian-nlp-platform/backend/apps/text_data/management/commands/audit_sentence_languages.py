@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F
+from collections import defaultdict
+import time
+from apps.text_data import langid
+from apps.text_data.models import Sentence
+
+
+class Command(BaseCommand):
+    help = 'Re-score sentence languages with the trained identifier and report likely mislabels'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, help='Only audit sentences labelled with this language id')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sentences scored per batch')
+
+    def handle(self, *args, **options):
+        if langid.get_identifier() is None:
+            raise CommandError('No language identifier trained yet; run train_language_id first')
+
+        sentences = Sentence.objects.all()
+        if options['language']:
+            sentences = sentences.filter(language_id=options['language'])
+
+        start = time.perf_counter()
+        scored = 0
+        batch = []
+        for row in sentences.values_list('id', 'text').iterator(chunk_size=options['batch_size']):
+            batch.append(row)
+            if len(batch) >= options['batch_size']:
+                scored += self.score(batch)
+                batch = []
+        scored += self.score(batch)
+
+        mismatches = (
+            sentences.exclude(detected_language=None)
+            .exclude(detected_language=F('language'))
+            .values_list('language__name', 'detected_language__name')
+            .annotate(count=Count('id'))
+            .order_by('-count')
+        )
+        for labelled, detected, count in mismatches:
+            self.stdout.write(self.style.WARNING(f"{count} labelled {labelled} look like {detected}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {scored} sentences in {time.perf_counter() - start:.1f}s"
+        ))
+
+    @staticmethod
+    def score(batch) -> int:
+        if not batch:
+            return 0
+        ids, texts = zip(*batch)
+        # One UPDATE per detected language rather than one per sentence
+        groups = defaultdict(list)
+        for sentence_id, (language_id, _) in zip(ids, langid.detect(texts)):
+            groups[language_id].append(sentence_id)
+        for language_id, sentence_ids in groups.items():
+            Sentence.objects.filter(pk__in=sentence_ids).update(detected_language_id=language_id)
+        return len(batch)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+import time
+from apps.languages.models import Language
+from apps.text_data import similarity
+
+
+class Command(BaseCommand):
+    help = 'Compact the TF-IDF similar-sentence index of each language, folding in sentences changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, action='append', help='Language id (repeatable; default: all)')
+        parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of compacting')
+
+    def handle(self, *args, **options):
+        languages = Language.objects.order_by('id')
+        if options['language']:
+            languages = languages.filter(id__in=options['language'])
+
+        start = time.perf_counter()
+        for language in languages:
+            index = similarity.compact(language.id, full=options['full'])
+            self.stdout.write(f"{language.name}: {len(index)} sentences, {index.postings.nnz} postings")
+        self.stdout.write(self.style.SUCCESS(
+            f"Similarity indexes written to {settings.SIMILARITY_INDEX_DIR} in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.text_data.models import Sentence, SentenceSignature
+
+
+class Command(BaseCommand):
+    help = 'Compute missing MinHash signatures and cluster near-duplicate sentences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, help='Only this language id')
+        parser.add_argument('--threshold', type=float, help='Estimated Jaccard similarity (default: NEAR_DUPLICATE_THRESHOLD)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sentences or candidate pairs per batch')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        sentences = Sentence.objects.all()
+        if options['language']:
+            sentences = sentences.filter(language_id=options['language'])
+        stored = SentenceSignature.backfill(sentences, batch_size=options['batch_size'])
+        self.stdout.write(f"Computed {stored} missing signatures")
+
+        result = SentenceSignature.cluster(
+            language_id=options['language'],
+            threshold=options['threshold'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Found {result['clusters']} clusters covering {result['duplicates']} near-duplicates "
+            f"in {time.perf_counter() - start:.1f}s"
+        ))
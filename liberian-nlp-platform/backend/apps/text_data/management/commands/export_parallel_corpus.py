@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+import time
+from apps.languages.models import Language
+from apps.text_data.exporters import COMPRESSIONS, EXPORT_FORMATS, ExportError, ParallelExporter
+from apps.text_data.models import Translation
+from apps.text_data.splits import SPLITS
+
+
+class Command(BaseCommand):
+    help = 'Export translation pairs for a language pair as Moses parallel files, JSONL or Parquet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Directory receiving the exported file(s)')
+        parser.add_argument('--source-language', type=int, required=True, help='Source language id')
+        parser.add_argument('--target-language', type=int, required=True, help='Target language id')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='moses', help='Output format')
+        parser.add_argument('--compression', choices=COMPRESSIONS, default='none',
+                            help='Compression for each output file (Parquet compresses internally)')
+        parser.add_argument('--status', default=Translation.TranslationStatus.VALIDATED,
+                            choices=Translation.TranslationStatus.values, help='Only export pairs with this status')
+        parser.add_argument('--corpus', type=int, help='Only export pairs from this corpus')
+        parser.add_argument('--split', choices=SPLITS, help='Only export pairs in this train/dev/test split')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        languages = Language.objects.in_bulk([options['source_language'], options['target_language']])
+        for side in ('source', 'target'):
+            if options[f'{side}_language'] not in languages:
+                raise CommandError(f"Language {options[f'{side}_language']} does not exist")
+
+        try:
+            exporter = ParallelExporter(
+                languages[options['source_language']],
+                languages[options['target_language']],
+                export_format=options['format'],
+                compression=options['compression'],
+                chunk_size=options['chunk_size'],
+                status=options['status'],
+                corpus_id=options['corpus'],
+                split=options['split'],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        os.makedirs(options['output_dir'], exist_ok=True)
+        start = time.perf_counter()
+
+        # Moses sides go to two plain files instead of the zip served over HTTP
+        if options['format'] == 'moses':
+            paths = [os.path.join(options['output_dir'], name) for name in exporter.side_names()]
+            with open(paths[0], 'wb') as source, open(paths[1], 'wb') as target:
+                exported = exporter.write_moses(source, target)
+            summary = f"{exported} translation pairs to {paths[0]} and {paths[1]}"
+        else:
+            path = os.path.join(options['output_dir'], exporter.filename)
+            with open(path, 'wb') as output:
+                for data in exporter.stream():
+                    output.write(data)
+            summary = f"{exporter.exported} translation pairs to {path}"
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Exported {summary} in {elapsed:.1f}s"))
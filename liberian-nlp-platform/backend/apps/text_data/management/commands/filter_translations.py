@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.text_data import quality
+from apps.text_data.models import Translation
+
+
+class Command(BaseCommand):
+    help = 'Re-run the translation quality checks over every pair and store the flags'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', type=int, help='Only check pairs whose source sentence is in this corpus')
+        parser.add_argument('--source-language', type=int, help='Only check pairs from this language id')
+        parser.add_argument('--target-language', type=int, help='Only check pairs into this language id')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Pairs evaluated per chunk')
+
+    def handle(self, *args, **options):
+        translations = Translation.objects.all()
+        if options['corpus']:
+            translations = translations.filter(source_sentence__corpus_id=options['corpus'])
+        if options['source_language']:
+            translations = translations.filter(source_sentence__language_id=options['source_language'])
+        if options['target_language']:
+            translations = translations.filter(target_sentence__language_id=options['target_language'])
+
+        start = time.perf_counter()
+        totals = quality.sweep(translations, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        for name in quality.FLAG_NAMES.values():
+            if totals.get(name):
+                self.stdout.write(self.style.WARNING(f"{totals[name]} pairs flagged {name}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {totals.get('checked', 0)} pairs: {totals.get('flagged', 0)} flagged, "
+            f"{totals.get('updated', 0)} updated in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+import time
+import xml.etree.ElementTree as ET
+from apps.languages.models import Language
+from apps.text_data.importers import (
+    PARALLEL_FORMATS, TRANSLATION_TYPES, TranslationPairImporter,
+    detect_parallel_format, read_moses, read_parallel_tsv, read_tmx
+)
+from apps.text_data.models import Corpus, Translation
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Import aligned translation pairs from a TMX file, Moses-style parallel files or a TSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus_id', type=int, help='Corpus receiving both sides of each pair')
+        parser.add_argument('path', help='TMX or TSV file, or the source side of a Moses pair')
+        parser.add_argument('target_path', nargs='?', help='Target side of a Moses pair')
+        parser.add_argument('--source-language', type=int, required=True, help='Source language id')
+        parser.add_argument('--target-language', type=int, required=True, help='Target language id')
+        parser.add_argument('--user', required=True, help='Username recorded as translator')
+        parser.add_argument('--format', choices=PARALLEL_FORMATS,
+                            help='Input format (default: moses with two paths, else from file extension)')
+        parser.add_argument('--source-lang-code', help='TMX xml:lang of the source variant (default: first)')
+        parser.add_argument('--target-lang-code', help='TMX xml:lang of the target variant (default: second)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Pairs per bulk_create transaction')
+        parser.add_argument('--status', default=Translation.TranslationStatus.SUBMITTED,
+                            choices=Translation.TranslationStatus.values, help='Status for imported translations')
+        parser.add_argument('--translation-type', default='free', choices=sorted(TRANSLATION_TYPES))
+        parser.add_argument('--difficulty', default='intermediate',
+                            choices=['beginner', 'intermediate', 'advanced'], help='Difficulty level for sentences')
+
+    def handle(self, *args, **options):
+        try:
+            corpus = Corpus.objects.get(pk=options['corpus_id'])
+        except Corpus.DoesNotExist:
+            raise CommandError(f"Corpus {options['corpus_id']} does not exist")
+
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        for side in ('source', 'target'):
+            language_id = options[f'{side}_language']
+            if not Language.objects.filter(pk=language_id).exists():
+                raise CommandError(f"Language {language_id} does not exist")
+
+        file_format = options['format'] or (
+            'moses' if options['target_path'] else detect_parallel_format(options['path'])
+        )
+        if not file_format:
+            raise CommandError('Cannot detect file format; pass --format')
+        if file_format == 'moses' and not options['target_path']:
+            raise CommandError('Moses imports need both a source and a target path')
+
+        importer = TranslationPairImporter(
+            corpus,
+            options['source_language'],
+            options['target_language'],
+            user,
+            batch_size=options['batch_size'],
+            status=options['status'],
+            translation_type=options['translation_type'],
+            difficulty_level=options['difficulty'],
+        )
+
+        start = time.perf_counter()
+        try:
+            if file_format == 'tmx':
+                with open(options['path'], 'rb') as stream:
+                    report = importer.run(
+                        read_tmx(stream, options['source_lang_code'], options['target_lang_code'])
+                    )
+            elif file_format == 'moses':
+                with open(options['path'], encoding='utf-8-sig') as source, \
+                        open(options['target_path'], encoding='utf-8-sig') as target:
+                    report = importer.run(read_moses(source, target))
+            else:
+                with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                    report = importer.run(read_parallel_tsv(stream))
+        except ET.ParseError as e:
+            raise CommandError(f"Invalid TMX: {e}")
+        elapsed = time.perf_counter() - start
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['error']}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} translation pairs into {corpus} "
+                f"({report['rejected']} rejected, {report['duplicates']} already present) in {elapsed:.1f}s"
+            )
+        )
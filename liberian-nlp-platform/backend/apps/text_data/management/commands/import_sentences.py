@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+import time
+from apps.text_data.importers import FORMATS, ImportRowError, SentenceImporter, detect_format, read_rows
+from apps.text_data.models import Corpus, Sentence
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Stream sentences from a CSV, TSV, JSONL or plain text file into a corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus_id', type=int, help='Target corpus id')
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user', required=True, help='Username recorded as contributor')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from file extension)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create transaction')
+        parser.add_argument('--status', default=Sentence.SentenceStatus.SUBMITTED,
+                            choices=Sentence.SentenceStatus.values, help='Status for imported sentences')
+        parser.add_argument('--difficulty', default='intermediate',
+                            choices=['beginner', 'intermediate', 'advanced'], help='Default difficulty level')
+
+    def handle(self, *args, **options):
+        try:
+            corpus = Corpus.objects.get(pk=options['corpus_id'])
+        except Corpus.DoesNotExist:
+            raise CommandError(f"Corpus {options['corpus_id']} does not exist")
+
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        file_format = options['format'] or detect_format(options['path'])
+        if not file_format:
+            raise CommandError('Cannot detect file format; pass --format')
+
+        importer = SentenceImporter(
+            corpus,
+            user,
+            batch_size=options['batch_size'],
+            status=options['status'],
+            difficulty_level=options['difficulty'],
+        )
+
+        start = time.perf_counter()
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            try:
+                report = importer.run(read_rows(stream, file_format))
+            except ImportRowError as e:
+                raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['error']}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} sentences into {corpus} "
+                f"({report['rejected']} rejected, {report['duplicates']} already present) in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,98 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import transaction
+import django
+import multiprocessing
+import os
+import time
+from apps.languages.models import Language
+from apps.text_data import search
+from apps.text_data.models import Sentence, SentenceSignature, VocabularyEntry
+from apps.text_data.normalization import pipeline_for
+
+FIELDS = ('id', 'language_id', 'corpus_id', 'status', 'text', 'normalized_text')
+
+
+def normalize_chunk(rows, codes):
+    """Rows whose stored normalized text is out of date, with the new form and hash appended."""
+    changed = []
+    for row in rows:
+        normalized = pipeline_for(codes.get(row[1]))(row[4])
+        if normalized != row[5]:
+            changed.append((*row, normalized, Sentence.hash_text(normalized)))
+    return changed
+
+
+class Command(BaseCommand):
+    help = "Recompute every sentence's normalized text with its language's pipeline, in parallel chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, action='append', help='Language id (repeatable; default: all)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Parallel worker processes')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sentences per chunk')
+
+    def chunks(self, queryset, batch_size):
+        # Keyset pages rather than one open cursor, since rows are rewritten as we go
+        last_id = None
+        while True:
+            page = queryset.order_by('id')
+            if last_id is not None:
+                page = page.filter(id__gt=last_id)
+            rows = list(page.values_list(*FIELDS)[:batch_size])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    def write(self, changed):
+        if not changed:
+            return
+        sentences = [
+            Sentence(pk=sentence_id, language_id=language_id, normalized_text=normalized, text_hash=text_hash)
+            for sentence_id, language_id, _, _, _, _, normalized, text_hash in changed
+        ]
+        with transaction.atomic():
+            Sentence.objects.bulk_update(sentences, ['normalized_text', 'text_hash'], batch_size=1000)
+            VocabularyEntry.apply([
+                change
+                for _, language_id, corpus_id, status, _, stored, normalized, _ in changed
+                for change in (
+                    (*VocabularyEntry.sentence_state(language_id, corpus_id, status, stored), -1),
+                    (*VocabularyEntry.sentence_state(language_id, corpus_id, status, normalized), 1),
+                )
+            ])
+            SentenceSignature.store(sentences, SentenceSignature.fingerprint(sentences), replace=True)
+            search.index_sentences(sentences)
+
+    def handle(self, *args, **options):
+        queryset = Sentence.objects.all()
+        if options['language']:
+            queryset = queryset.filter(language_id__in=options['language'])
+        codes = dict(Language.objects.values_list('id', 'iso_code'))
+        workers = max(1, options['workers'])
+
+        start = time.perf_counter()
+        read = updated = 0
+        # Workers only normalize; every database write happens here. Spawned
+        # rather than forked, so they never share this process's connection
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+        ) as pool:
+            pending = deque()
+            for rows in self.chunks(queryset, options['batch_size']):
+                read += len(rows)
+                pending.append(pool.submit(normalize_chunk, rows, codes))
+                if len(pending) >= workers * 2:
+                    changed = pending.popleft().result()
+                    self.write(changed)
+                    updated += len(changed)
+            while pending:
+                changed = pending.popleft().result()
+                self.write(changed)
+                updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Normalized {read} sentences, {updated} changed, with {workers} workers "
+            f"in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.text_data import search
+from apps.text_data.models import Sentence
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over all sentences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Sentences indexed per statement batch')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        indexed = search.rebuild(Sentence.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} sentences in {time.perf_counter() - start:.1f}s"
+        ))
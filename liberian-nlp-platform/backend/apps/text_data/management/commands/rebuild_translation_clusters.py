@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+import time
+from apps.text_data.models import TranslationCluster
+
+
+class Command(BaseCommand):
+    help = 'Recompute the translation clusters linking sentences across languages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Translations read per batch')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        clusters = TranslationCluster.rebuild(batch_size=options['batch_size'])
+        sentences = TranslationCluster.objects.count()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {clusters} clusters covering {sentences} sentences in {time.perf_counter() - start:.1f}s"
+        ))
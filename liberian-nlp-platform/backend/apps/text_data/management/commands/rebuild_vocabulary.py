@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+import os
+import time
+from apps.languages.models import Language
+from apps.text_data.models import VocabularyEntry
+
+
+def rebuild_language(language_id: int, batch_size: int):
+    # Worker processes open their own database connection on first use
+    return language_id, VocabularyEntry.rebuild(language_id, batch_size=batch_size)
+
+
+class Command(BaseCommand):
+    help = 'Recount unigram and bigram vocabulary statistics, one worker process per language'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', type=int, action='append', help='Language id (repeatable; default: all)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Parallel worker processes')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sentences counted per upsert batch')
+
+    def handle(self, *args, **options):
+        language_ids = options['language'] or list(Language.objects.values_list('id', flat=True))
+        missing = set(language_ids) - set(Language.objects.filter(pk__in=language_ids).values_list('id', flat=True))
+        if missing:
+            raise CommandError(f"Language {min(missing)} does not exist")
+
+        # SQLite allows one writer at a time, so parallel rebuilds would only wait on each other
+        workers = 1 if connection.vendor == 'sqlite' else max(1, min(options['workers'], len(language_ids)))
+
+        start = time.perf_counter()
+        if workers == 1:
+            results = [rebuild_language(language_id, options['batch_size']) for language_id in language_ids]
+        else:
+            # Forked workers must not share the parent's open connection
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(rebuild_language, language_id, options['batch_size'])
+                    for language_id in language_ids
+                ]
+                results = [future.result() for future in as_completed(futures)]
+
+        for language_id, counted in sorted(results):
+            self.stdout.write(f"Language {language_id}: {counted} sentences")
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt vocabulary for {len(results)} languages with {workers} workers "
+            f"in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from apps.text_data.models import Corpus, CorpusStatistic
+
+
+class Command(BaseCommand):
+    help = 'Recompute Corpus.sentence_count and word_count, and the stats counters, from the source tables'
+
+    def handle(self, *args, **options):
+        fixed = Corpus.reconcile_counts()
+        counters = CorpusStatistic.reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled counts; {fixed} corpora and {counters} statistics counters had drifted"
+        ))
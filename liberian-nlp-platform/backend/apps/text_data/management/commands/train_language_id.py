@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from collections import Counter
+import os
+import time
+from apps.text_data.langid import LanguageIdentifier
+from apps.text_data.models import Sentence
+
+
+class Command(BaseCommand):
+    help = 'Train the character n-gram language identifier on validated sentences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Retrain from scratch instead of adding sentences validated since the last run')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sentences vectorized per batch')
+
+    def handle(self, *args, **options):
+        path = settings.LID_MODEL_PATH
+        identifier = LanguageIdentifier()
+        if not options['full'] and os.path.exists(path):
+            identifier = LanguageIdentifier.load(path)
+
+        sentences = Sentence.objects.filter(status=Sentence.SentenceStatus.VALIDATED)
+        if identifier.trained_until:
+            sentences = sentences.filter(updated_at__gt=identifier.trained_until)
+        rows = sentences.order_by('updated_at').values_list('language_id', 'text', 'updated_at')
+
+        start = time.perf_counter()
+        trained = Counter()
+        batch = []
+        for row in rows.iterator(chunk_size=options['batch_size']):
+            batch.append(row)
+            if len(batch) >= options['batch_size']:
+                self.train(identifier, batch, trained)
+                batch = []
+        self.train(identifier, batch, trained)
+
+        if not trained:
+            self.stdout.write(self.style.SUCCESS('No newly validated sentences; model unchanged'))
+            return
+
+        identifier.save(path)
+        for language_id, count in sorted(trained.items()):
+            self.stdout.write(f"Language {language_id}: {count} sentences")
+        self.stdout.write(self.style.SUCCESS(
+            f"Trained on {sum(trained.values())} sentences across {len(identifier.language_ids)} languages "
+            f"in {time.perf_counter() - start:.1f}s; saved to {path}"
+        ))
+
+    @staticmethod
+    def train(identifier, batch, trained):
+        if not batch:
+            return
+        language_ids, texts, updated = zip(*batch)
+        identifier.partial_fit(texts, language_ids)
+        identifier.trained_until = updated[-1]
+        trained.update(language_ids)
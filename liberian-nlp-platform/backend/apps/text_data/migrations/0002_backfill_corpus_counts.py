@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:29
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_corpus_counts(apps, schema_editor):
+    Corpus = apps.get_model("text_data", "Corpus")
+    Sentence = apps.get_model("text_data", "Sentence")
+
+    totals = {
+        row["corpus_id"]: (row["sentences"], row["words"] or 0)
+        for row in Sentence.objects.order_by()
+        .values("corpus_id")
+        .annotate(sentences=Count("id"), words=Sum("word_count"))
+    }
+    corpora = list(Corpus.objects.only("id"))
+    for corpus in corpora:
+        corpus.sentence_count, corpus.word_count = totals.get(corpus.id, (0, 0))
+    Corpus.objects.bulk_update(corpora, ["sentence_count", "word_count"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_corpus_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:30
+
+import apps.text_data.models
+from django.db import migrations, models
+import random
+
+
+def assign_random_keys(apps, schema_editor):
+    # AddField evaluates the default once, so every existing row shares a key
+    Sentence = apps.get_model("text_data", "Sentence")
+    batch = []
+    for sentence in Sentence.objects.only("id").iterator(chunk_size=2000):
+        sentence.random_key = random.random()
+        batch.append(sentence)
+        if len(batch) >= 2000:
+            Sentence.objects.bulk_update(batch, ["random_key"])
+            batch = []
+    Sentence.objects.bulk_update(batch, ["random_key"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0002_backfill_corpus_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sentence",
+            name="random_key",
+            field=models.FloatField(
+                default=apps.text_data.models.random_key, editable=False
+            ),
+        ),
+        migrations.RunPython(assign_random_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["status", "random_key"], name="text_data_s_status_6aee21_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["status", "language", "random_key"],
+                name="text_data_s_status_57c2c5_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["status", "corpus", "random_key"],
+                name="text_data_s_status_bac7df_idx",
+            ),
+        ),
+    ]
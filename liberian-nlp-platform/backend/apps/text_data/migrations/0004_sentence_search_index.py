@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:41
+
+from django.db import migrations
+from apps.text_data import search
+
+
+def create_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection.vendor)
+    if not backend:
+        return
+    for statement in backend.ddl:
+        schema_editor.execute(statement)
+
+    Sentence = apps.get_model("text_data", "Sentence")
+    search.rebuild(Sentence.objects.all())
+
+
+def drop_search_index(apps, schema_editor):
+    if search.get_backend(schema_editor.connection.vendor):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {search.SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0003_sentence_random_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
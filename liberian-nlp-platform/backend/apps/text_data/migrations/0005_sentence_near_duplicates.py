@@ -0,0 +1,79 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("languages", "0002_audiodata_textdata_and_more"),
+        ("text_data", "0004_sentence_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SentenceSignature",
+            fields=[
+                (
+                    "sentence",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="minhash",
+                        serialize=False,
+                        to="text_data.sentence",
+                    ),
+                ),
+                ("minhash", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="sentence",
+            name="near_duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="near_duplicates",
+                to="text_data.sentence",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SentenceLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.BigIntegerField()),
+                (
+                    "language",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="languages.language",
+                    ),
+                ),
+                (
+                    "sentence",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_buckets",
+                        to="text_data.sentence",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["language", "key"],
+                        name="text_data_s_languag_bb0399_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:40
+
+from django.db import migrations, models
+from hashlib import blake2b
+from apps.text_data.normalization import normalize_text
+
+
+def hash_existing_text(apps, schema_editor):
+    Sentence = apps.get_model("text_data", "Sentence")
+    batch = []
+    for sentence in Sentence.objects.only("id", "text").iterator(chunk_size=2000):
+        digest = blake2b(normalize_text(sentence.text).encode("utf-8"), digest_size=8).digest()
+        sentence.text_hash = int.from_bytes(digest, "big", signed=True)
+        batch.append(sentence)
+        if len(batch) >= 2000:
+            Sentence.objects.bulk_update(batch, ["text_hash"])
+            batch = []
+    Sentence.objects.bulk_update(batch, ["text_hash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0005_sentence_near_duplicates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sentence",
+            name="text_hash",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(hash_existing_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["language", "text_hash"], name="text_data_s_languag_001a61_idx"
+            ),
+        ),
+    ]
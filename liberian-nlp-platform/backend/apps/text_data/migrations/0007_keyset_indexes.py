@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0006_sentence_text_hash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["created_at", "id"], name="text_data_s_created_98942f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                fields=["created_at", "id"], name="text_data_t_created_26b3b3_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:49
+
+from django.db import migrations, models
+from apps.text_data import splits
+
+
+def assign_existing_splits(apps, schema_editor):
+    Sentence = apps.get_model("text_data", "Sentence")
+    Translation = apps.get_model("text_data", "Translation")
+    splits.assign(Sentence.objects.all(), [], lambda row: row[0])
+    splits.assign(Translation.objects.all(), ["source_sentence_id"], lambda row: row[1])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0007_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sentence",
+            name="split",
+            field=models.CharField(
+                blank=True,
+                choices=[("train", "Train"), ("dev", "Dev"), ("test", "Test")],
+                default="",
+                editable=False,
+                max_length=5,
+            ),
+        ),
+        migrations.AddField(
+            model_name="translation",
+            name="split",
+            field=models.CharField(
+                blank=True,
+                choices=[("train", "Train"), ("dev", "Dev"), ("test", "Test")],
+                default="",
+                editable=False,
+                max_length=5,
+            ),
+        ),
+        migrations.RunPython(assign_existing_splits, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["split", "language", "status"],
+                name="text_data_s_split_314df0_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                fields=["split", "status", "created_at", "id"],
+                name="text_data_t_split_924787_idx",
+            ),
+        ),
+    ]
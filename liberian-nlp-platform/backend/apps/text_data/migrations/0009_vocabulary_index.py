@@ -0,0 +1,95 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+from apps.text_data import vocabulary
+
+
+def count_existing_vocabulary(apps, schema_editor):
+    Language = apps.get_model("languages", "Language")
+    Sentence = apps.get_model("text_data", "Sentence")
+    VocabularyEntry = apps.get_model("text_data", "VocabularyEntry")
+
+    # One language at a time keeps the in-memory totals to a single vocabulary
+    for language_id in Language.objects.values_list("id", flat=True):
+        changes = (
+            (language_id, corpus_id, status == "validated", text, 1)
+            for corpus_id, status, text in Sentence.objects.filter(
+                language_id=language_id
+            )
+            .values_list("corpus_id", "status", "text")
+            .iterator(chunk_size=2000)
+        )
+        VocabularyEntry.objects.bulk_create(
+            (
+                VocabularyEntry(
+                    language_id=language_id,
+                    scope=scope,
+                    n=n,
+                    ngram=gram,
+                    count=count,
+                    validated_count=validated_count,
+                )
+                for (_, scope, n, gram), (count, validated_count) in vocabulary.deltas(
+                    changes
+                ).items()
+            ),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("languages", "0002_audiodata_textdata_and_more"),
+        ("text_data", "0008_splits"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VocabularyEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.PositiveIntegerField()),
+                ("n", models.PositiveSmallIntegerField()),
+                ("ngram", models.CharField(max_length=255)),
+                ("count", models.BigIntegerField(default=0)),
+                ("validated_count", models.BigIntegerField(default=0)),
+                (
+                    "language",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vocabulary",
+                        to="languages.language",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["language", "scope", "n", "-count"],
+                        name="text_data_v_languag_c01d7b_idx",
+                    ),
+                    models.Index(
+                        fields=["language", "scope", "n", "-validated_count"],
+                        name="text_data_v_languag_2562a3_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="vocabularyentry",
+            constraint=models.UniqueConstraint(
+                fields=("language", "scope", "n", "ngram"),
+                name="unique_vocabulary_ngram",
+            ),
+        ),
+        migrations.RunPython(count_existing_vocabulary, migrations.RunPython.noop),
+    ]
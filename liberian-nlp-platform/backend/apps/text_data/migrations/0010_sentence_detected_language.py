@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("languages", "0002_audiodata_textdata_and_more"),
+        ("text_data", "0009_vocabulary_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sentence",
+            name="detected_language",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="languages.language",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["language", "detected_language"],
+                name="text_data_s_languag_17c78e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:57
+
+from django.db import migrations, models
+from apps.text_data import quality
+
+
+def flag_existing_translations(apps, schema_editor):
+    Translation = apps.get_model("text_data", "Translation")
+    quality.sweep(Translation.objects.all())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0010_sentence_detected_language"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="translation",
+            name="quality_flags",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Bit flags from quality.evaluate"
+            ),
+        ),
+        migrations.RunPython(flag_existing_translations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+from apps.text_data import pivot
+
+
+def cluster_existing_translations(apps, schema_editor):
+    Translation = apps.get_model("text_data", "Translation")
+    TranslationCluster = apps.get_model("text_data", "TranslationCluster")
+
+    edges = Translation.objects.values_list("source_sentence_id", "target_sentence_id")
+    roots = pivot.components(edges.iterator(chunk_size=5000))
+    TranslationCluster.objects.bulk_create(
+        (
+            TranslationCluster(sentence_id=sentence_id, cluster=root)
+            for sentence_id, root in roots.items()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0011_translation_quality_flags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationCluster",
+            fields=[
+                (
+                    "sentence",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="translation_cluster",
+                        serialize=False,
+                        to="text_data.sentence",
+                    ),
+                ),
+                ("cluster", models.UUIDField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(cluster_existing_translations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:18
+
+from django.db import migrations, models
+from hashlib import blake2b
+from apps.text_data.normalization import pipeline_for
+
+
+def normalize_existing_sentences(apps, schema_editor):
+    Language = apps.get_model("languages", "Language")
+    Sentence = apps.get_model("text_data", "Sentence")
+
+    codes = dict(Language.objects.values_list("id", "iso_code"))
+    last_id = None
+    while True:
+        rows = Sentence.objects.order_by("id")
+        if last_id is not None:
+            rows = rows.filter(id__gt=last_id)
+        rows = list(rows.values_list("id", "language_id", "text")[:2000])
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        batch = []
+        for sentence_id, language_id, text in rows:
+            normalized = pipeline_for(codes.get(language_id))(text)
+            digest = blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+            batch.append(
+                Sentence(
+                    id=sentence_id,
+                    normalized_text=normalized,
+                    text_hash=int.from_bytes(digest, "big", signed=True),
+                )
+            )
+        Sentence.objects.bulk_update(
+            batch, ["normalized_text", "text_hash"], batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0012_translation_clusters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sentence",
+            name="normalized_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(normalize_existing_sentences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0013_sentence_normalized_text"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sentence",
+            index=models.Index(
+                fields=["language", "updated_at"], name="text_data_s_languag_cf5132_idx"
+            ),
+        ),
+    ]
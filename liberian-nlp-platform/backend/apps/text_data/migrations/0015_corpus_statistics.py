@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:57
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_statistics(apps, schema_editor):
+    Corpus = apps.get_model("text_data", "Corpus")
+    Sentence = apps.get_model("text_data", "Sentence")
+    Translation = apps.get_model("text_data", "Translation")
+    CorpusStatistic = apps.get_model("text_data", "CorpusStatistic")
+
+    counts = {
+        ("corpora", ""): Corpus.objects.count(),
+        ("sentences", ""): Sentence.objects.count(),
+        ("translations", ""): Translation.objects.count(),
+    }
+    for metric, model, field in (
+        ("corpus_type", Corpus, "corpus_type"),
+        ("sentence_language", Sentence, "language_id"),
+        ("sentence_status", Sentence, "status"),
+    ):
+        for key, count in (
+            model.objects.order_by().values_list(field).annotate(count=Count("pk"))
+        ):
+            counts[(metric, str(key))] = count
+    CorpusStatistic.objects.bulk_create(
+        CorpusStatistic(metric=metric, key=key, count=count)
+        for (metric, key), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0014_sentence_similarity_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CorpusStatistic",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("metric", models.CharField(max_length=30)),
+                ("key", models.CharField(blank=True, default="", max_length=50)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="corpusstatistic",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "key"), name="unique_corpus_statistic"
+            ),
+        ),
+        migrations.RunPython(count_existing_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:10
+
+from django.db import migrations
+from apps.text_data import search, vocabulary
+
+
+def reindex_normalized_text(apps, schema_editor):
+    Language = apps.get_model("languages", "Language")
+    Sentence = apps.get_model("text_data", "Sentence")
+    VocabularyEntry = apps.get_model("text_data", "VocabularyEntry")
+
+    # 0004 and 0009 indexed text before it had a per-language normalized
+    # form; recount from that, one language at a time as 0009 does
+    VocabularyEntry.objects.all().delete()
+    for language_id in Language.objects.values_list("id", flat=True):
+        changes = (
+            (language_id, corpus_id, status == "validated", normalized, 1)
+            for corpus_id, status, normalized in Sentence.objects.filter(
+                language_id=language_id
+            )
+            .values_list("corpus_id", "status", "normalized_text")
+            .iterator(chunk_size=2000)
+        )
+        VocabularyEntry.objects.bulk_create(
+            (
+                VocabularyEntry(
+                    language_id=language_id,
+                    scope=scope,
+                    n=n,
+                    ngram=gram,
+                    count=count,
+                    validated_count=validated_count,
+                )
+                for (_, scope, n, gram), (count, validated_count) in vocabulary.deltas(
+                    changes
+                ).items()
+            ),
+            batch_size=2000,
+        )
+
+    if search.get_backend(schema_editor.connection.vendor):
+        search.rebuild(Sentence.objects.all())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("text_data", "0015_corpus_statistics"),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_normalized_text, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,27 @@
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Sum, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.core.validators import MinLengthValidator, MaxLengthValidator
 from django.contrib.auth import get_user_model
+from collections import defaultdict
+from hashlib import blake2b
+import random
 import uuid
+from apps.languages.models import Language
+from . import dedup, langid, pivot, quality, search, splits, vocabulary
+from .normalization import pipeline_for
 
 User = get_user_model()
 
 
+def random_key() -> float:
+    return random.random()
+
+
 class Corpus(models.Model):
     """Text corpus for organizing sentences."""
     
@@ -36,6 +52,53 @@ class Corpus(models.Model):
     
     def __str__(self) -> str:
         return f"{self.name} ({self.language.name})"
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            previous_type = None
+            if not adding and (update_fields is None or 'corpus_type' in update_fields):
+                previous_type = Corpus.objects.filter(pk=self.pk).values_list('corpus_type', flat=True).first()
+            super().save(*args, **kwargs)
+            if adding:
+                CorpusStatistic.apply([(CorpusStatistic.CORPORA, '', 1), (CorpusStatistic.CORPUS_TYPE, self.corpus_type, 1)])
+            elif previous_type is not None and previous_type != self.corpus_type:
+                CorpusStatistic.apply([
+                    (CorpusStatistic.CORPUS_TYPE, previous_type, -1), (CorpusStatistic.CORPUS_TYPE, self.corpus_type, 1)
+                ])
+    
+    @classmethod
+    def adjust_counts(cls, corpus_id, sentences: int = 0, words: int = 0) -> None:
+        """Apply sentence and word count deltas in the database without a read."""
+        if not corpus_id or not (sentences or words):
+            return
+        # Clamp at zero so drift from before counts were maintained cannot
+        # break a delete; reconcile_corpus_counts repairs the totals
+        cls.objects.filter(pk=corpus_id).update(
+            sentence_count=Greatest(F('sentence_count') + sentences, Value(0)),
+            word_count=Greatest(F('word_count') + words, Value(0)),
+        )
+    
+    @classmethod
+    def reconcile_counts(cls) -> int:
+        """Recompute every corpus's counts with one grouped query; return corpora fixed."""
+        totals = {
+            row['corpus_id']: (row['sentences'], row['words'] or 0)
+            for row in Sentence.objects.order_by().values('corpus_id').annotate(
+                sentences=Count('id'), words=Sum('word_count')
+            )
+        }
+        
+        drifted = []
+        for corpus in cls.objects.only('id', 'sentence_count', 'word_count').iterator():
+            counts = totals.get(corpus.id, (0, 0))
+            if (corpus.sentence_count, corpus.word_count) != counts:
+                corpus.sentence_count, corpus.word_count = counts
+                drifted.append(corpus)
+        
+        cls.objects.bulk_update(drifted, ['sentence_count', 'word_count'], batch_size=1000)
+        return len(drifted)
 
 
 class Sentence(models.Model):
@@ -80,6 +143,36 @@ class Sentence(models.Model):
     character_count = models.PositiveIntegerField(default=0)
     confidence_score = models.FloatField(default=0.0)
     
+    # ``text`` through its language's normalization pipeline, computed on write so
+    # duplicate matching, near-duplicate signatures, search and vocabulary read it as is
+    normalized_text = models.TextField(blank=True, default='', editable=False)
+    # 64-bit hash of the normalized text for exact duplicate lookups
+    text_hash = models.BigIntegerField(default=0, editable=False)
+    near_duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='near_duplicates'
+    )
+    
+    # Language the built-in identifier is confident the text is in; differs from
+    # ``language`` when the sentence is probably mislabelled
+    detected_language = models.ForeignKey(
+        'languages.Language',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    
+    # Uniform key in [0, 1) for indexed random sampling
+    random_key = models.FloatField(default=random_key, editable=False)
+    
+    # Train/dev/test assignment, a stable hash of the sentence id
+    split = models.CharField(max_length=5, choices=splits.SPLIT_CHOICES, default='', blank=True, editable=False)
+    
     # Contributor information
     contributed_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='contributed_sentences')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -90,13 +183,214 @@ class Sentence(models.Model):
             models.Index(fields=['language', 'status']),
             models.Index(fields=['corpus', 'status']),
             models.Index(fields=['contributed_by']),
+            models.Index(fields=['status', 'random_key']),
+            models.Index(fields=['status', 'language', 'random_key']),
+            models.Index(fields=['status', 'corpus', 'random_key']),
+            models.Index(fields=['language', 'text_hash']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['split', 'language', 'status']),
+            models.Index(fields=['language', 'detected_language']),
+            models.Index(fields=['language', 'updated_at']),
         ]
     
+    @staticmethod
+    def random_from(queryset):
+        """Pick a random sentence from ``queryset`` with an index range scan.
+        
+        Seeks to the first row whose ``random_key`` is at or above a fresh
+        random point, wrapping to the start when the point lands past the
+        last key. Reads only: the stored keys are never rewritten, so drawing
+        takes no row locks.
+        """
+        point = random.random()
+        return (
+            queryset.filter(random_key__gte=point).order_by('random_key').first()
+            or queryset.filter(random_key__lt=point).order_by('random_key').first()
+        )
+    
+    @staticmethod
+    def hash_text(normalized: str) -> int:
+        """Signed 64-bit hash of normalized text."""
+        digest = blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+    
+    @staticmethod
+    def normalize(sentences) -> None:
+        """Set ``normalized_text`` and ``text_hash`` through each sentence's language pipeline."""
+        codes = {
+            sentence.language_id: sentence.language.iso_code
+            for sentence in sentences if Sentence.language.is_cached(sentence)
+        }
+        missing = {sentence.language_id for sentence in sentences} - codes.keys()
+        if missing:
+            codes.update(Language.objects.filter(pk__in=missing).values_list('id', 'iso_code'))
+        for sentence in sentences:
+            sentence.normalized_text = pipeline_for(codes.get(sentence.language_id))(sentence.text)
+            sentence.text_hash = Sentence.hash_text(sentence.normalized_text)
+    
+    @classmethod
+    def match_existing(cls, sentences: list) -> list:
+        """Return, per unsaved sentence, the id of a sentence with the same text.
+        
+        Matches are sentences in the same language whose normalized text is
+        equal, found through the ``(language, text_hash)`` index; a repeat
+        within ``sentences`` matches its first occurrence. ``None`` marks
+        sentences that are new.
+        """
+        cls.normalize(sentences)
+        hashes_by_language = defaultdict(set)
+        for sentence in sentences:
+            hashes_by_language[sentence.language_id].add(sentence.text_hash)
+        
+        known = {}
+        for language_id, hashes in hashes_by_language.items():
+            for chunk in _chunks(list(hashes), 500):
+                rows = cls.objects.filter(
+                    language_id=language_id, text_hash__in=chunk
+                ).order_by('created_at').values_list('id', 'text_hash', 'normalized_text')
+                for sentence_id, text_hash, normalized in rows:
+                    known.setdefault((language_id, text_hash, normalized), sentence_id)
+        
+        matches = []
+        for sentence in sentences:
+            key = (sentence.language_id, sentence.text_hash, sentence.normalized_text)
+            match = known.get(key)
+            if match is None:
+                known[key] = sentence.pk
+            matches.append(match)
+        return matches
+    
+    @classmethod
+    def find_duplicate(cls, language_id, text: str):
+        """Existing sentence with the same normalized text in ``language_id``, if any."""
+        sentence_id = cls.match_existing([cls(language_id=language_id, text=text)])[0]
+        return cls.objects.filter(pk=sentence_id).first() if sentence_id else None
+    
+    @staticmethod
+    def count_text(text: str) -> tuple:
+        """Return (word_count, character_count) for a sentence text."""
+        return len(text.split()), len(text)
+    
+    @staticmethod
+    def detect_languages(sentences) -> None:
+        """Set ``detected_language`` on each sentence from one batched identifier pass."""
+        predictions = langid.detect([sentence.text for sentence in sentences])
+        for sentence, (language_id, _) in zip(sentences, predictions):
+            sentence.detected_language_id = language_id
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the corpus totals currently include for this row
+        loaded = dict(zip(field_names, values))
+        if 'corpus_id' in loaded and 'word_count' in loaded:
+            instance._counted = (loaded['corpus_id'], loaded['word_count'])
+        # ...and what the vocabulary index currently holds for it
+        if all(name in loaded for name in ('language_id', 'corpus_id', 'status', 'normalized_text')):
+            instance._indexed = VocabularyEntry.sentence_state(
+                loaded['language_id'], loaded['corpus_id'], loaded['status'], loaded['normalized_text']
+            )
+        # ...and which corpus statistics count it
+        if 'language_id' in loaded and 'status' in loaded:
+            instance._tallied = (loaded['language_id'], loaded['status'])
+        return instance
+    
+    # Fields that decide what a sentence contributes to the vocabulary index
+    VOCABULARY_FIELDS = ('language', 'corpus', 'status', 'normalized_text')
+    # ...and to the corpus statistics
+    STATISTICS_FIELDS = ('language', 'status')
+    
     def save(self, *args, **kwargs):
         # Update word and character counts
-        self.word_count = len(self.text.split())
-        self.character_count = len(self.text)
-        super().save(*args, **kwargs)
+        self.word_count, self.character_count = self.count_text(self.text)
+        self.split = splits.split_for(self.pk)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'text', 'language'} & set(update_fields):
+            # Derived columns must be written with the text they come from; the
+            # normalized form also depends on the language's pipeline
+            derived = {'normalized_text', 'text_hash'}
+            if 'text' in update_fields:
+                derived |= {'word_count', 'character_count', 'detected_language'}
+            update_fields = kwargs['update_fields'] = {*update_fields, *derived}
+        text_changed = update_fields is None or 'text' in update_fields
+        normalized_changed = update_fields is None or 'normalized_text' in update_fields
+        if normalized_changed:
+            self.normalize([self])
+        if text_changed:
+            self.detect_languages([self])
+        vocabulary_changed = update_fields is None or bool(set(update_fields) & set(self.VOCABULARY_FIELDS))
+        statistics_changed = update_fields is None or bool(set(update_fields) & set(self.STATISTICS_FIELDS))
+        adding = self._state.adding
+        
+        with transaction.atomic():
+            if normalized_changed:
+                fingerprints = SentenceSignature.flag([self])
+            if adding:
+                counted = (None, 0)
+            else:
+                counted = getattr(self, '_counted', None) or Sentence.objects.filter(
+                    pk=self.pk
+                ).values_list('corpus_id', 'word_count').first() or (None, 0)
+            
+            indexed = None
+            if vocabulary_changed and not adding:
+                indexed = getattr(self, '_indexed', None)
+                if indexed is None:
+                    row = Sentence.objects.filter(pk=self.pk).values_list(
+                        'language_id', 'corpus_id', 'status', 'normalized_text'
+                    ).first()
+                    indexed = VocabularyEntry.sentence_state(*row) if row else None
+            
+            tallied = None
+            if statistics_changed and not adding:
+                tallied = getattr(self, '_tallied', None) or Sentence.objects.filter(
+                    pk=self.pk
+                ).values_list('language_id', 'status').first()
+            
+            super().save(*args, **kwargs)
+            
+            corpus_id = self.corpus_id if update_fields is None or 'corpus' in update_fields else counted[0]
+            word_count = self.word_count if update_fields is None or 'word_count' in update_fields else counted[1]
+            
+            if corpus_id == counted[0]:
+                Corpus.adjust_counts(corpus_id, words=word_count - counted[1])
+            else:
+                Corpus.adjust_counts(counted[0], sentences=-1, words=-counted[1])
+                Corpus.adjust_counts(corpus_id, sentences=1, words=word_count)
+            self._counted = (corpus_id, word_count)
+            
+            if vocabulary_changed:
+                current = VocabularyEntry.sentence_state(
+                    self.language_id, self.corpus_id, self.status, self.normalized_text
+                )
+                if indexed and update_fields is not None:
+                    # Fields left out of update_fields keep their stored values
+                    current = tuple(
+                        new if name in update_fields else old
+                        for name, new, old in zip(self.VOCABULARY_FIELDS, current, indexed)
+                    )
+                if current != indexed:
+                    VocabularyEntry.apply(([(*indexed, -1)] if indexed else []) + [(*current, 1)])
+                self._indexed = current
+            
+            if statistics_changed:
+                current = (self.language_id, self.status)
+                if tallied and update_fields is not None:
+                    current = tuple(
+                        new if name in update_fields else old
+                        for name, new, old in zip(self.STATISTICS_FIELDS, current, tallied)
+                    )
+                if current != tallied:
+                    CorpusStatistic.apply(
+                        (CorpusStatistic.sentence_changes(*tallied, -1) if tallied else [])
+                        + CorpusStatistic.sentence_changes(*current, 1)
+                    )
+                self._tallied = current
+            
+            if normalized_changed:
+                SentenceSignature.store([self], fingerprints, replace=not adding)
+                search.index_sentences([self])
     
     def __str__(self) -> str:
         return f"{self.text[:50]}..." if len(self.text) > 50 else self.text
@@ -139,6 +433,10 @@ class Translation(models.Model):
     # Quality metrics
     confidence_score = models.FloatField(default=0.0)
     length_ratio = models.FloatField(default=0.0)
+    quality_flags = models.PositiveIntegerField(default=0, editable=False, help_text="Bit flags from quality.evaluate")
+    
+    # Follows the source sentence, so a sentence and all its translations share a split
+    split = models.CharField(max_length=5, choices=splits.SPLIT_CHOICES, default='', blank=True, editable=False)
     
     # Contributor information
     translated_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='translations')
@@ -150,13 +448,24 @@ class Translation(models.Model):
         indexes = [
             models.Index(fields=['source_sentence', 'status']),
             models.Index(fields=['target_sentence', 'status']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['split', 'status', 'created_at', 'id']),
         ]
     
+    @property
+    def quality_issues(self) -> list:
+        return quality.flag_names(self.quality_flags)
+    
     def save(self, *args, **kwargs):
-        # Calculate length ratio
-        if self.source_sentence.word_count > 0:
-            self.length_ratio = self.target_sentence.word_count / self.source_sentence.word_count
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        # Calculate length ratio and quality flags
+        quality.assess([self])
+        self.split = splits.split_for(self.source_sentence_id)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                TranslationCluster.link([(self.source_sentence_id, self.target_sentence_id)])
+                CorpusStatistic.apply([(CorpusStatistic.TRANSLATIONS, '', 1)])
     
     def __str__(self) -> str:
         return f"{self.source_sentence.language.name} → {self.target_sentence.language.name}"
@@ -190,4 +499,573 @@ class SentenceMetadata(models.Model):
     audio_duration = models.FloatField(null=True, blank=True)
     
     def __str__(self) -> str:
-        return f"Metadata for {self.sentence}"
\ No newline at end of file
+        return f"Metadata for {self.sentence}"
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SentenceSignature(models.Model):
+    """MinHash signature of a sentence's normalized text."""
+    
+    sentence = models.OneToOneField(Sentence, on_delete=models.CASCADE, primary_key=True, related_name='minhash')
+    minhash = models.BinaryField()
+    
+    LOOKUP_CHUNK = 500
+    
+    @classmethod
+    def fingerprint(cls, sentences: list) -> list:
+        fingerprints = []
+        for sentence in sentences:
+            minhash = dedup.signature(sentence.normalized_text)
+            fingerprints.append((minhash, dedup.band_keys(minhash)) if minhash is not None else None)
+        return fingerprints
+    
+    @classmethod
+    def load(cls, sentence_ids) -> dict:
+        """Map sentence ids to ``(signature, cluster root id)``."""
+        signatures = {}
+        for chunk in _chunks(list(sentence_ids), cls.LOOKUP_CHUNK):
+            rows = cls.objects.filter(sentence_id__in=chunk).values_list(
+                'sentence_id', 'minhash', 'sentence__near_duplicate_of_id'
+            )
+            for sentence_id, minhash, root_id in rows:
+                signatures[sentence_id] = (dedup.from_bytes(minhash), root_id or sentence_id)
+        return signatures
+    
+    @classmethod
+    def flag(cls, sentences: list) -> list:
+        """Point each sentence's ``near_duplicate_of`` at its closest match.
+        
+        Candidates are the stored sentences sharing an LSH bucket in the same
+        language, read with their signatures in one indexed join per chunk of
+        keys, plus earlier sentences of the batch itself. A sentence's
+        candidates are scored together against its own signature, and the
+        best counts when its estimated similarity reaches
+        ``NEAR_DUPLICATE_THRESHOLD``. Returns fingerprints to pass to
+        ``store`` once the sentences are saved.
+        """
+        fingerprints = cls.fingerprint(sentences)
+        
+        keys_by_language = defaultdict(set)
+        for sentence, fingerprint in zip(sentences, fingerprints):
+            if fingerprint:
+                keys_by_language[sentence.language_id].update(fingerprint[1])
+        
+        # Runs on every sentence save; skip the ORM's query building and read
+        # buckets, signatures and cluster roots in one join
+        buckets = defaultdict(list)
+        stored = {}
+        to_id = Sentence._meta.pk.to_python
+        with connection.cursor() as cursor:
+            for language_id, keys in keys_by_language.items():
+                for chunk in _chunks(list(keys), cls.LOOKUP_CHUNK):
+                    cursor.execute(
+                        f"SELECT b.key, b.sentence_id, g.minhash, s.near_duplicate_of_id "
+                        f"FROM {SentenceLSHBucket._meta.db_table} b "
+                        f"JOIN {cls._meta.db_table} g ON g.sentence_id = b.sentence_id "
+                        f"JOIN {Sentence._meta.db_table} s ON s.id = b.sentence_id "
+                        f"WHERE b.language_id = %s AND b.key IN ({', '.join(['%s'] * len(chunk))})",
+                        [language_id, *chunk]
+                    )
+                    for key, sentence_id, minhash, root_id in cursor.fetchall():
+                        sentence_id = to_id(sentence_id)
+                        buckets[(language_id, key)].append(sentence_id)
+                        if sentence_id not in stored:
+                            stored[sentence_id] = (dedup.from_bytes(minhash), to_id(root_id) if root_id else sentence_id)
+        
+        threshold = settings.NEAR_DUPLICATE_THRESHOLD
+        batch_buckets = defaultdict(list)
+        for sentence, fingerprint in zip(sentences, fingerprints):
+            sentence.near_duplicate_of_id = None
+            if not fingerprint:
+                continue
+            minhash, keys = fingerprint
+            
+            candidates = {}
+            for key in keys:
+                bucket = (sentence.language_id, key)
+                for candidate_id in buckets.get(bucket, ()):
+                    candidates.setdefault(candidate_id, stored[candidate_id])
+                for candidate_id, candidate in batch_buckets[bucket]:
+                    candidates.setdefault(candidate_id, candidate)
+            candidates.pop(sentence.pk, None)
+            
+            # Point at the cluster root so every copy flags the same original;
+            # ties go to the first candidate found
+            if candidates:
+                matches = list(candidates.values())
+                scores = dedup.similarities(minhash, [candidate[0] for candidate in matches])
+                best = int(scores.argmax())
+                if scores[best] >= threshold:
+                    sentence.near_duplicate_of_id = matches[best][1]
+            
+            entry = (sentence.pk, (minhash, sentence.near_duplicate_of_id or sentence.pk))
+            for key in keys:
+                batch_buckets[(sentence.language_id, key)].append(entry)
+        
+        return fingerprints
+    
+    @classmethod
+    def store(cls, sentences: list, fingerprints: list, replace: bool = False) -> None:
+        """Persist signatures and LSH buckets for saved sentences."""
+        if replace:
+            sentence_ids = [sentence.pk for sentence in sentences]
+            cls.objects.filter(sentence_id__in=sentence_ids).delete()
+            SentenceLSHBucket.objects.filter(sentence_id__in=sentence_ids).delete()
+        
+        pairs = [(sentence, fingerprint) for sentence, fingerprint in zip(sentences, fingerprints) if fingerprint]
+        cls.objects.bulk_create(
+            [cls(sentence_id=sentence.pk, minhash=dedup.to_bytes(minhash)) for sentence, (minhash, _) in pairs],
+            batch_size=1000
+        )
+        
+        # Twenty rows per sentence; skip model instances and write them directly
+        rows = []
+        sentence_id_field = SentenceLSHBucket._meta.get_field('sentence').target_field
+        for sentence, (_, keys) in pairs:
+            sentence_id = sentence_id_field.get_db_prep_value(sentence.pk, connection)
+            rows.extend((sentence_id, sentence.language_id, key) for key in keys)
+        with connection.cursor() as cursor:
+            for chunk in _chunks(rows, 5000):
+                cursor.executemany(
+                    f"INSERT INTO {SentenceLSHBucket._meta.db_table} (sentence_id, language_id, key) "
+                    "VALUES (%s, %s, %s)",
+                    chunk
+                )
+    
+    @classmethod
+    def backfill(cls, queryset, batch_size: int = 2000) -> int:
+        """Store signatures for sentences in ``queryset`` that have none yet."""
+        stored = 0
+        batch = []
+        missing = queryset.filter(minhash__isnull=True).only('id', 'normalized_text', 'language_id')
+        for sentence in missing.iterator(chunk_size=batch_size):
+            batch.append(sentence)
+            if len(batch) >= batch_size:
+                with transaction.atomic():
+                    cls.store(batch, cls.fingerprint(batch))
+                stored += len(batch)
+                batch = []
+        with transaction.atomic():
+            cls.store(batch, cls.fingerprint(batch))
+        return stored + len(batch)
+    
+    @classmethod
+    def cluster(cls, language_id=None, threshold=None, batch_size: int = 5000) -> dict:
+        """Group stored sentences into near-duplicate clusters.
+        
+        Streams every LSH bucket holding more than one sentence of a language
+        in a single ordered scan, checks each member's signature against
+        every later member of its bucket and merges verified pairs with
+        union-find. Every cluster member then points at the cluster's oldest
+        sentence.
+        """
+        threshold = settings.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        
+        shared = SentenceLSHBucket.objects.filter(
+            language_id=OuterRef('language_id'), key=OuterRef('key')
+        ).exclude(pk=OuterRef('pk'))
+        rows = SentenceLSHBucket.objects.filter(Exists(shared))
+        if language_id:
+            rows = rows.filter(language_id=language_id)
+        rows = rows.order_by('language_id', 'key', 'sentence_id').values_list('language_id', 'key', 'sentence_id')
+        
+        parent = {}
+        
+        def find(node):
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+        
+        def verify(buckets):
+            signatures = cls.load({node for members in buckets for node in members})
+            for members in buckets:
+                members = [node for node in members if node in signatures]
+                for index, node in enumerate(members[:-1]):
+                    others = members[index + 1:]
+                    scores = dedup.similarities(signatures[node][0], [signatures[other][0] for other in others])
+                    for other, score in zip(others, scores):
+                        if score >= threshold:
+                            parent[find(other)] = find(node)
+        
+        pending, pending_size = [], 0
+        current = None
+        for language, key, sentence_id in rows.iterator(chunk_size=batch_size):
+            if (language, key) != current:
+                current = (language, key)
+                if pending_size >= batch_size:
+                    verify(pending)
+                    pending, pending_size = [], 0
+                pending.append([])
+            pending[-1].append(sentence_id)
+            pending_size += 1
+        verify(pending)
+        
+        clusters = defaultdict(list)
+        for node in parent:
+            clusters[find(node)].append(node)
+        clusters = [members for members in clusters.values() if len(members) > 1]
+        
+        created = {}
+        for chunk in _chunks([node for members in clusters for node in members], cls.LOOKUP_CHUNK):
+            created.update(Sentence.objects.filter(pk__in=chunk).values_list('id', 'created_at'))
+        
+        updates = []
+        for members in clusters:
+            members = sorted((node for node in members if node in created), key=lambda node: (created[node], str(node)))
+            if not members:
+                continue
+            updates.append(Sentence(pk=members[0], near_duplicate_of_id=None))
+            updates.extend(Sentence(pk=node, near_duplicate_of_id=members[0]) for node in members[1:])
+        for chunk in _chunks(updates, batch_size):
+            Sentence.objects.bulk_update(chunk, ['near_duplicate_of'])
+        
+        return {
+            'clusters': len(clusters),
+            'duplicates': sum(len(members) - 1 for members in clusters),
+        }
+
+
+class SentenceLSHBucket(models.Model):
+    """One LSH band of a sentence signature, keyed for indexed candidate lookup."""
+    
+    sentence = models.ForeignKey(Sentence, on_delete=models.CASCADE, related_name='lsh_buckets')
+    language = models.ForeignKey('languages.Language', on_delete=models.CASCADE)
+    key = models.BigIntegerField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['language', 'key']),
+        ]
+
+
+class VocabularyEntry(models.Model):
+    """Unigram and bigram counts for a language, per corpus and language-wide.
+
+    ``scope`` is the corpus id, or ``vocabulary.LANGUAGE_SCOPE`` for the rows
+    summing every corpus of the language. ``count`` covers every sentence and
+    ``validated_count`` only validated ones. Rows are kept current by
+    ``apply`` as sentences are written and removed when they drop to zero.
+    """
+    
+    UPSERT_CHUNK = 5000
+    LOOKUP_CHUNK = 500
+    
+    language = models.ForeignKey('languages.Language', on_delete=models.CASCADE, related_name='vocabulary')
+    scope = models.PositiveIntegerField()
+    n = models.PositiveSmallIntegerField()
+    ngram = models.CharField(max_length=vocabulary.MAX_NGRAM_LENGTH)
+    count = models.BigIntegerField(default=0)
+    validated_count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['language', 'scope', 'n', 'ngram'], name='unique_vocabulary_ngram'),
+        ]
+        indexes = [
+            models.Index(fields=['language', 'scope', 'n', '-count']),
+            models.Index(fields=['language', 'scope', 'n', '-validated_count']),
+        ]
+    
+    @classmethod
+    def apply(cls, changes) -> None:
+        """Add the n-grams of entering sentences and subtract those of leaving ones.
+
+        ``changes`` are ``(language_id, corpus_id, validated, text, sign)``
+        tuples, see ``vocabulary.deltas``. One upsert per row adds the delta
+        in the database, so concurrent writers never lose counts.
+        """
+        rows = vocabulary.deltas(changes)
+        if not rows:
+            return
+        
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            for chunk in _chunks([(*key, *row) for key, row in rows.items()], cls.UPSERT_CHUNK):
+                cursor.executemany(
+                    f"INSERT INTO {table} (language_id, scope, n, ngram, count, validated_count) "
+                    "VALUES (%s, %s, %s, %s, %s, %s) "
+                    "ON CONFLICT (language_id, scope, n, ngram) DO UPDATE "
+                    f"SET count = {table}.count + excluded.count, "
+                    f"validated_count = {table}.validated_count + excluded.validated_count",
+                    chunk
+                )
+        
+        # N-grams no sentence uses any more
+        shrunk = defaultdict(list)
+        for (language_id, scope, n, gram), (count, _) in rows.items():
+            if count < 0:
+                shrunk[(language_id, scope, n)].append(gram)
+        for (language_id, scope, n), grams in shrunk.items():
+            for chunk in _chunks(grams, cls.LOOKUP_CHUNK):
+                cls.objects.filter(
+                    language_id=language_id, scope=scope, n=n, ngram__in=chunk, count__lte=0
+                ).delete()
+    
+    @staticmethod
+    def sentence_state(language_id, corpus_id, status, normalized_text):
+        return (language_id, corpus_id, status == Sentence.SentenceStatus.VALIDATED, normalized_text)
+    
+    @classmethod
+    def rebuild(cls, language_id, batch_size: int = 5000) -> int:
+        """Recount the vocabulary of one language from its sentences; return sentences read."""
+        counted = 0
+        with transaction.atomic():
+            cls.objects.filter(language_id=language_id).delete()
+            changes = []
+            sentences = Sentence.objects.filter(language_id=language_id).values_list(
+                'language_id', 'corpus_id', 'status', 'normalized_text'
+            )
+            for row in sentences.iterator(chunk_size=batch_size):
+                changes.append((*cls.sentence_state(*row), 1))
+                if len(changes) >= batch_size:
+                    cls.apply(changes)
+                    counted += len(changes)
+                    changes = []
+            cls.apply(changes)
+        return counted + len(changes)
+
+
+class TranslationCluster(models.Model):
+    """The connected component of the translation graph a sentence belongs to.
+
+    Sentences linked by translations, directly or through any number of
+    pivot languages, share ``cluster``, so every version of a sentence is
+    one indexed lookup away. Sentences without translations have no row.
+    ``link`` merges clusters as translations are added and ``split``
+    recomputes a cluster when one of its translations is deleted.
+    """
+    
+    LOOKUP_CHUNK = 500
+    
+    sentence = models.OneToOneField(
+        Sentence, on_delete=models.CASCADE, primary_key=True, related_name='translation_cluster'
+    )
+    cluster = models.UUIDField(db_index=True)
+    
+    @classmethod
+    def equivalents(cls, sentence_id):
+        """Sentences joined to ``sentence_id`` by any chain of translations, itself included."""
+        return Sentence.objects.filter(
+            translation_cluster__cluster__in=cls.objects.filter(sentence_id=sentence_id).values('cluster')
+        )
+    
+    @classmethod
+    def link(cls, edges) -> None:
+        """Merge the clusters joined by new ``(source_sentence_id, target_sentence_id)`` edges.
+        
+        Stored clusters enter the union-find with their sizes, so the largest
+        cluster of each merge keeps its label and only the smaller ones are
+        rewritten; new sentences get a row in the resulting cluster.
+        """
+        edges = list(edges)
+        if not edges:
+            return
+        sentence_ids = list({sentence_id for edge in edges for sentence_id in edge})
+        
+        labels = {}
+        for chunk in _chunks(sentence_ids, cls.LOOKUP_CHUNK):
+            labels.update(cls.objects.filter(sentence_id__in=chunk).values_list('sentence_id', 'cluster'))
+        forest = pivot.DisjointSet()
+        for chunk in _chunks(list(set(labels.values())), cls.LOOKUP_CHUNK):
+            sizes = cls.objects.filter(cluster__in=chunk).values('cluster').annotate(
+                size=Count('pk')
+            ).values_list('cluster', 'size')
+            for label, size in sizes:
+                forest.add(label, size)
+        
+        # A sentence without a row is its own cluster, labelled with its id
+        for source_id, target_id in edges:
+            forest.union(labels.get(source_id, source_id), labels.get(target_id, target_id))
+        
+        absorbed = defaultdict(list)
+        for label in set(labels.values()):
+            root = forest.find(label)
+            if root != label:
+                absorbed[root].append(label)
+        for root, merged in absorbed.items():
+            for chunk in _chunks(merged, cls.LOOKUP_CHUNK):
+                cls.objects.filter(cluster__in=chunk).update(cluster=root)
+        cls.objects.bulk_create(
+            [cls(sentence_id=sentence_id, cluster=forest.find(sentence_id))
+             for sentence_id in sentence_ids if sentence_id not in labels],
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+    
+    @classmethod
+    def split(cls, cluster) -> None:
+        """Recompute one cluster from the translations still joining its members."""
+        members = list(cls.objects.filter(cluster=cluster).values_list('sentence_id', flat=True))
+        edges = []
+        for chunk in _chunks(members, cls.LOOKUP_CHUNK):
+            edges.extend(Translation.objects.filter(source_sentence_id__in=chunk).values_list(
+                'source_sentence_id', 'target_sentence_id'
+            ))
+        with transaction.atomic():
+            cls.objects.filter(cluster=cluster).delete()
+            cls.link(edges)
+    
+    @classmethod
+    def rebuild(cls, batch_size: int = 5000) -> int:
+        """Recompute every cluster from scratch; return the number of clusters."""
+        edges = Translation.objects.values_list('source_sentence_id', 'target_sentence_id')
+        roots = pivot.components(edges.iterator(chunk_size=batch_size))
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(
+                (cls(sentence_id=sentence_id, cluster=root) for sentence_id, root in roots.items()),
+                batch_size=batch_size
+            )
+        return len(set(roots.values()))
+
+
+class CorpusStatistic(models.Model):
+    """Running totals behind the stats endpoint, one row per counter.
+
+    ``metric`` names what is counted and ``key`` the group within it: the
+    corpus type, language id or sentence status, or '' for grand totals.
+    Rows are kept current by ``apply`` as corpora, sentences and
+    translations are written, so reading every statistic is one query on a
+    table of a few dozen rows. ``reconcile`` recounts them from the source
+    tables to repair drift from writes that bypass the model hooks.
+    """
+    
+    CORPORA = 'corpora'
+    CORPUS_TYPE = 'corpus_type'
+    SENTENCES = 'sentences'
+    SENTENCE_LANGUAGE = 'sentence_language'
+    SENTENCE_STATUS = 'sentence_status'
+    TRANSLATIONS = 'translations'
+    
+    # Bump when the payload of ``snapshot`` changes shape, so no process serves a stale one
+    CACHE_VERSION = 1
+    CACHE_KEY = f'corpus-stats:v{CACHE_VERSION}'
+    
+    metric = models.CharField(max_length=30)
+    key = models.CharField(max_length=50, blank=True, default='')
+    count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='unique_corpus_statistic'),
+        ]
+    
+    @classmethod
+    def sentence_changes(cls, language_id, status, sign: int) -> list:
+        return [
+            (cls.SENTENCES, '', sign),
+            (cls.SENTENCE_LANGUAGE, str(language_id), sign),
+            (cls.SENTENCE_STATUS, status, sign),
+        ]
+    
+    @classmethod
+    def apply(cls, changes) -> None:
+        """Add ``(metric, key, delta)`` changes with one upsert per counter, safe under concurrent writers."""
+        totals = defaultdict(int)
+        for metric, key, delta in changes:
+            totals[(metric, key)] += delta
+        rows = [(metric, key, delta) for (metric, key), delta in totals.items() if delta]
+        if not rows:
+            return
+        
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (metric, key, count) VALUES (%s, %s, %s) "
+                "ON CONFLICT (metric, key) DO UPDATE "
+                f"SET count = {table}.count + excluded.count",
+                rows
+            )
+    
+    @classmethod
+    def snapshot(cls) -> dict:
+        """Every statistic the stats endpoint reports, from the counters."""
+        counters = defaultdict(dict)
+        for metric, key, count in cls.objects.filter(count__gt=0).values_list('metric', 'key', 'count'):
+            counters[metric][key] = count
+        
+        languages = counters[cls.SENTENCE_LANGUAGE]
+        names = dict(Language.objects.filter(pk__in=[int(key) for key in languages]).values_list('id', 'name'))
+        return {
+            'total_corpora': counters[cls.CORPORA].get('', 0),
+            'total_sentences': counters[cls.SENTENCES].get('', 0),
+            'total_translations': counters[cls.TRANSLATIONS].get('', 0),
+            'validated_sentences': counters[cls.SENTENCE_STATUS].get(Sentence.SentenceStatus.VALIDATED, 0),
+            'by_language': {names[int(key)]: count for key, count in languages.items() if int(key) in names},
+            'by_status': counters[cls.SENTENCE_STATUS],
+            'by_corpus_type': counters[cls.CORPUS_TYPE],
+        }
+    
+    @classmethod
+    def recount(cls) -> dict:
+        """``(metric, key) -> count`` straight from the corpus, sentence and translation tables."""
+        counts = {
+            (cls.CORPORA, ''): Corpus.objects.count(),
+            (cls.SENTENCES, ''): Sentence.objects.count(),
+            (cls.TRANSLATIONS, ''): Translation.objects.count(),
+        }
+        grouped = (
+            (cls.CORPUS_TYPE, Corpus.objects, 'corpus_type'),
+            (cls.SENTENCE_LANGUAGE, Sentence.objects, 'language_id'),
+            (cls.SENTENCE_STATUS, Sentence.objects, 'status'),
+        )
+        for metric, manager, field in grouped:
+            for key, count in manager.order_by().values_list(field).annotate(count=Count('pk')):
+                counts[(metric, str(key))] = count
+        return counts
+    
+    @classmethod
+    def reconcile(cls) -> int:
+        """Reset every counter to a fresh recount; return how many had drifted."""
+        with transaction.atomic():
+            counts = cls.recount()
+            stored = {(metric, key): count for metric, key, count in cls.objects.values_list('metric', 'key', 'count')}
+            drifted = {
+                counter: counts.get(counter, 0)
+                for counter in set(counts) | set(stored)
+                if counts.get(counter, 0) != stored.get(counter, 0)
+            }
+            for (metric, key), count in drifted.items():
+                cls.objects.update_or_create(metric=metric, key=key, defaults={'count': count})
+        cache.delete(cls.CACHE_KEY)
+        return len(drifted)
+
+
+@receiver(post_delete, sender=Translation)
+def split_translation_cluster(sender, instance, **kwargs):
+    # The sentence on either side may be the one being deleted, and its row gone already
+    cluster = TranslationCluster.objects.filter(
+        sentence_id__in=[instance.source_sentence_id, instance.target_sentence_id]
+    ).values_list('cluster', flat=True).first()
+    if cluster:
+        TranslationCluster.split(cluster)
+
+
+@receiver(post_delete, sender=Translation)
+def remove_translation_from_statistics(sender, instance, **kwargs):
+    CorpusStatistic.apply([(CorpusStatistic.TRANSLATIONS, '', -1)])
+
+
+@receiver(post_delete, sender=Corpus)
+def remove_corpus_from_statistics(sender, instance, **kwargs):
+    CorpusStatistic.apply([(CorpusStatistic.CORPORA, '', -1), (CorpusStatistic.CORPUS_TYPE, instance.corpus_type, -1)])
+
+
+@receiver(post_delete, sender=Sentence)
+def remove_sentence_from_corpus_counts(sender, instance, **kwargs):
+    # Fires for queryset and cascade deletes as well as Sentence.delete()
+    corpus_id, word_count = getattr(instance, '_counted', (instance.corpus_id, instance.word_count))
+    Corpus.adjust_counts(corpus_id, sentences=-1, words=-word_count)
+    search.remove_sentences([instance.pk])
+    indexed = getattr(instance, '_indexed', None) or VocabularyEntry.sentence_state(
+        instance.language_id, instance.corpus_id, instance.status, instance.normalized_text
+    )
+    VocabularyEntry.apply([(*indexed, -1)])
+    tallied = getattr(instance, '_tallied', None) or (instance.language_id, instance.status)
+    CorpusStatistic.apply(CorpusStatistic.sentence_changes(*tallied, -1))
@@ -0,0 +1,126 @@
+from django.conf import settings
+from typing import Optional
+import re
+import unicodedata
+
+
+# Look-alike code points typed in place of the orthography's special letters
+LOOKALIKES = {
+    'ε': 'ɛ',  # Greek epsilon -> open e
+    'є': 'ɛ',  # Cyrillic ukrainian ie -> open e
+    'Ε': 'Ɛ',  # Greek capital epsilon -> capital open e
+    'ͻ': 'ɔ',  # Greek reversed lunate sigma -> open o
+    'ↄ': 'ɔ',  # Reversed c -> open o
+    'Ͻ': 'Ɔ',  # Greek capital reversed lunate sigma -> capital open o
+    'η': 'ŋ',  # Greek eta -> eng
+}
+
+PUNCTUATION = {
+    '‘': "'",
+    '’': "'",
+    'ʼ': "'",
+    '“': '"',
+    '”': '"',
+}
+
+# Zero-width and formatting characters pasted in from word processors and web forms
+INVISIBLES = {
+    '\u00ad': None,  # Soft hyphen
+    '\u200b': None,  # Zero-width space
+    '\u2060': None,  # Word joiner
+    '\ufeff': None,  # Byte order mark
+}
+
+# Spacing accents typed after a letter instead of combining tone marks
+SPACING_TONES = {
+    '\u00b4': '\u0301',  # Acute accent -> combining acute (high tone)
+    '\u02ca': '\u0301',  # Modifier acute -> combining acute
+    '`': '\u0300',  # Backtick -> combining grave (low tone)
+    '\u02cb': '\u0300',  # Modifier grave -> combining grave
+    '\u02c6': '\u0302',  # Modifier circumflex -> combining circumflex (falling tone)
+    '\u02c7': '\u030c',  # Caron -> combining caron (rising tone)
+    '\u00af': '\u0304',  # Macron -> combining macron (mid tone)
+}
+SPACING_TONE_RE = re.compile('(?<=[^\\W\\d_])[' + ''.join(SPACING_TONES) + ']')
+
+# Base Latin letters used when folding for diacritic-insensitive matching
+FOLDS = str.maketrans({
+    'ɛ': 'e',
+    'ɔ': 'o',
+    'ŋ': 'n',
+    'ɓ': 'b',
+    'ɗ': 'd',
+    'ʋ': 'v',
+    'ƒ': 'f',
+    'ɣ': 'g',
+})
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Tone marks stay attached to their letters, since ɛ̀ has no precomposed form
+TOKEN_RE = re.compile('[\\w\u0300-\u036f]+')
+
+
+class Pipeline:
+    """Normalization for one orthography, compiled once: a translation table plus regex rewrites.
+
+    Text is composed to NFC, mapped through the table, rewritten, casefolded,
+    composed again (casefolding and rewrites can leave combining marks
+    loose) and has its whitespace collapsed.
+    """
+
+    def __init__(self, replacements: dict, rewrites=()):
+        self.table = str.maketrans(replacements)
+        self.rewrites = [(re.compile(pattern) if isinstance(pattern, str) else pattern, replacement)
+                         for pattern, replacement in rewrites]
+
+    def __call__(self, text: str) -> str:
+        text = unicodedata.normalize('NFC', text).translate(self.table)
+        for pattern, replacement in self.rewrites:
+            text = pattern.sub(replacement, text)
+        text = unicodedata.normalize('NFC', text.casefold())
+        return WHITESPACE_RE.sub(' ', text).strip()
+
+
+PIPELINES = {
+    # Languages written with ɛ/ɔ/ŋ: look-alike letters are mapped to them
+    'orthography': Pipeline({**INVISIBLES, **LOOKALIKES, **PUNCTUATION}),
+    # ...and tone marks typed as spacing accents are attached to their letter
+    'tonal': Pipeline(
+        {**INVISIBLES, **LOOKALIKES, **PUNCTUATION},
+        [(SPACING_TONE_RE, lambda match: SPACING_TONES[match.group()])]
+    ),
+    # Greek and Cyrillic letters in English text are meant as typed
+    'latin': Pipeline({**INVISIBLES, **PUNCTUATION}),
+}
+DEFAULT_PIPELINE = 'orthography'
+
+
+def pipeline_for(iso_code: Optional[str]) -> Pipeline:
+    """The pipeline ``LANGUAGE_NORMALIZATION`` assigns to a language code."""
+    return PIPELINES[settings.LANGUAGE_NORMALIZATION.get(iso_code or '', DEFAULT_PIPELINE)]
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for matching: NFC, look-alikes mapped, casefolded, single spaces.
+
+    Uses the default pipeline, for text whose language is not known; stored
+    sentences carry their language's form in ``Sentence.normalized_text``.
+    """
+    return PIPELINES[DEFAULT_PIPELINE](text)
+
+
+def fold_normalized(normalized: str) -> str:
+    """Diacritic- and special-letter-insensitive form of already normalized text."""
+    decomposed = unicodedata.normalize('NFD', normalized)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return unicodedata.normalize('NFC', stripped.translate(FOLDS))
+
+
+def fold_text(text: str) -> str:
+    """Diacritic- and special-letter-insensitive form of ``normalize_text``."""
+    return fold_normalized(normalize_text(text))
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(text)
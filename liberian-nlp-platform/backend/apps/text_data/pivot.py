@@ -0,0 +1,43 @@
+from typing import Dict, Hashable, Iterable, Tuple
+
+
+class DisjointSet:
+    """Union-find over hashable nodes, with path halving and union by size.
+
+    The root of a set is always its largest member, so merging a small
+    translation cluster into a big one relabels only the small one.
+    """
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, node: Hashable, size: int = 1) -> None:
+        if node not in self.parent:
+            self.parent[node] = node
+            self.size[node] = size
+
+    def find(self, node: Hashable) -> Hashable:
+        self.add(node)
+        while self.parent[node] != node:
+            self.parent[node] = self.parent[self.parent[node]]
+            node = self.parent[node]
+        return node
+
+    def union(self, a: Hashable, b: Hashable) -> Hashable:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+
+def components(edges: Iterable[Tuple[Hashable, Hashable]]) -> Dict[Hashable, Hashable]:
+    """Map every node of ``edges`` to the root of its connected component."""
+    forest = DisjointSet()
+    for a, b in edges:
+        forest.union(a, b)
+    return {node: forest.find(node) for node in forest.parent}
@@ -0,0 +1,177 @@
+from django.conf import settings
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+from apps.languages.models import Language
+from .normalization import pipeline_for
+
+
+# Bit flags stored in ``Translation.quality_flags``
+LENGTH_RATIO = 1
+CHARACTER_RATIO = 2
+IDENTICAL = 4
+SCRIPT_MISMATCH = 8
+NUMBER_MISMATCH = 16
+
+FLAG_NAMES = {
+    LENGTH_RATIO: 'length_ratio',
+    CHARACTER_RATIO: 'character_ratio',
+    IDENTICAL: 'identical',
+    SCRIPT_MISMATCH: 'script_mismatch',
+    NUMBER_MISMATCH: 'number_mismatch',
+}
+
+SCRIPT_PATTERNS = {
+    'latin': '[A-Za-z\u00c0-\u024f\u0250-\u02af\u1e00-\u1eff]',
+    'vai': '[\ua500-\ua63f]',
+    'arabic': '[\u0600-\u06ff]',
+}
+DEFAULT_SCRIPTS = ('latin',)
+
+NUMBER_PATTERN = r'\d+'
+
+COLUMNS = [
+    'source_text', 'target_text', 'source_words', 'target_words', 'source_chars', 'target_chars',
+    'source_hash', 'target_hash', 'source_language', 'target_language',
+]
+
+# Sweep query columns, in ``COLUMNS`` order after the id and the two stored results
+SWEEP_FIELDS = [
+    'id', 'length_ratio', 'quality_flags',
+    'source_sentence__text', 'target_sentence__text',
+    'source_sentence__word_count', 'target_sentence__word_count',
+    'source_sentence__character_count', 'target_sentence__character_count',
+    'source_sentence__text_hash', 'target_sentence__text_hash',
+    'source_sentence__language_id', 'target_sentence__language_id',
+]
+
+
+def flag_names(flags: int) -> List[str]:
+    return [name for bit, name in FLAG_NAMES.items() if flags & bit]
+
+
+def allowed_scripts(language_ids: Iterable[int]) -> set:
+    """``'<language_id>:<script>'`` keys for the scripts each language may be written in."""
+    codes = Language.objects.filter(pk__in=set(language_ids)).values_list('id', 'iso_code')
+    return {
+        f'{language_id}:{script}'
+        for language_id, code in codes
+        for script in settings.LANGUAGE_SCRIPTS.get(code or '', DEFAULT_SCRIPTS)
+    }
+
+
+def dominant_script(texts: pd.Series) -> pd.Series:
+    """Script with the most letters in each text; empty for texts without letters."""
+    counts = pd.DataFrame({name: texts.str.count(pattern) for name, pattern in SCRIPT_PATTERNS.items()})
+    return counts.idxmax(axis=1).where(counts.max(axis=1) > 0, '')
+
+
+def numbers(texts: pd.Series) -> pd.Series:
+    # int() reads any decimal digits, so Vai or Arabic-Indic numerals compare equal to ASCII ones
+    return texts.str.findall(NUMBER_PATTERN).map(lambda found: tuple(sorted(int(number) for number in found)))
+
+
+def evaluate(frame: pd.DataFrame) -> pd.DataFrame:
+    """``length_ratio`` and ``quality_flags`` for each pair in ``frame`` (see ``COLUMNS``).
+
+    Word and character ratios must lie within ``MIN_TRANSLATION_LENGTH_RATIO``
+    and ``MAX_TRANSLATION_LENGTH_RATIO``; the two sides must not normalize to
+    the same text, must each be written in a script their language uses and
+    must contain the same numbers.
+    """
+    low, high = settings.MIN_TRANSLATION_LENGTH_RATIO, settings.MAX_TRANSLATION_LENGTH_RATIO
+    source_words = frame['source_words'].to_numpy(dtype=float)
+    source_chars = frame['source_chars'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        length_ratio = np.where(source_words > 0, frame['target_words'].to_numpy(dtype=float) / source_words, 0.0)
+        char_ratio = np.where(source_chars > 0, frame['target_chars'].to_numpy(dtype=float) / source_chars, 0.0)
+
+    flags = np.zeros(len(frame), dtype=np.int64)
+    flags |= np.where((length_ratio < low) | (length_ratio > high), LENGTH_RATIO, 0)
+    flags |= np.where((char_ratio < low) | (char_ratio > high), CHARACTER_RATIO, 0)
+    flags |= np.where(frame['source_hash'].to_numpy() == frame['target_hash'].to_numpy(), IDENTICAL, 0)
+
+    allowed = allowed_scripts(pd.concat([frame['source_language'], frame['target_language']]).unique().tolist())
+    for side in ('source', 'target'):
+        script = dominant_script(frame[f'{side}_text'])
+        keys = frame[f'{side}_language'].astype(str) + ':' + script
+        flags |= np.where((script != '').to_numpy() & ~keys.isin(allowed).to_numpy(), SCRIPT_MISMATCH, 0)
+
+    flags |= np.where(
+        (numbers(frame['source_text']) != numbers(frame['target_text'])).to_numpy(), NUMBER_MISMATCH, 0
+    )
+    return pd.DataFrame({'length_ratio': length_ratio, 'quality_flags': flags}, index=frame.index)
+
+
+def assess(translations: List) -> None:
+    """Set ``length_ratio`` and ``quality_flags`` on unsaved or edited translations in one pass."""
+    if not translations:
+        return
+    # Stored hashes come from each language's pipeline; hash any text without one the same way
+    unhashed = {
+        sentence.language_id
+        for translation in translations
+        for sentence in (translation.source_sentence, translation.target_sentence)
+        if not sentence.text_hash
+    }
+    codes = dict(Language.objects.filter(pk__in=unhashed).values_list('id', 'iso_code')) if unhashed else {}
+
+    def text_hash(sentence):
+        return sentence.text_hash or sentence.hash_text(pipeline_for(codes.get(sentence.language_id))(sentence.text))
+
+    rows = []
+    for translation in translations:
+        source, target = translation.source_sentence, translation.target_sentence
+        rows.append((
+            source.text, target.text, source.word_count, target.word_count,
+            source.character_count, target.character_count,
+            text_hash(source), text_hash(target),
+            source.language_id, target.language_id,
+        ))
+    results = evaluate(pd.DataFrame(rows, columns=COLUMNS))
+    for translation, length_ratio, flags in zip(
+        translations, results['length_ratio'].tolist(), results['quality_flags'].tolist()
+    ):
+        translation.length_ratio = length_ratio
+        translation.quality_flags = flags
+
+
+def sweep(queryset, batch_size: int = 5000) -> Dict[str, int]:
+    """Re-evaluate every translation in ``queryset``; return pairs per flag plus totals.
+
+    Pairs are read with ``values_list`` in chunks and only rows whose ratio
+    or flags changed are written back, with ``bulk_update``.
+    """
+    model = queryset.model
+    totals = Counter()
+    rows = queryset.order_by().values_list(*SWEEP_FIELDS).iterator(chunk_size=batch_size)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        frame = pd.DataFrame(chunk, columns=['id', 'stored_ratio', 'stored_flags', *COLUMNS])
+        results = evaluate(frame)
+
+        changed = (
+            ~np.isclose(results['length_ratio'].to_numpy(), frame['stored_ratio'].to_numpy())
+            | (results['quality_flags'].to_numpy() != frame['stored_flags'].to_numpy())
+        )
+        model.objects.bulk_update(
+            [
+                model(pk=pk, length_ratio=ratio, quality_flags=flags)
+                for pk, ratio, flags in zip(
+                    frame['id'][changed], results['length_ratio'][changed], results['quality_flags'][changed]
+                )
+            ],
+            ['length_ratio', 'quality_flags'],
+            batch_size=1000,
+        )
+
+        totals['checked'] += len(frame)
+        totals['updated'] += int(changed.sum())
+        totals['flagged'] += int((results['quality_flags'] > 0).sum())
+        for bit, name in FLAG_NAMES.items():
+            totals[name] += int(((results['quality_flags'] & bit) > 0).sum())
+    return dict(totals)
@@ -0,0 +1,262 @@
+from django.db import connection
+from django.utils.html import escape
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+from apps.languages.models import Language
+from .normalization import TOKEN_RE, Pipeline, fold_normalized, pipeline_for, tokenize
+
+
+SEARCH_TABLE = 'text_data_sentence_search'
+
+# Combining marks count as part of a token so tone-marked vowels are not split
+FTS5_TOKENCHARS = ''.join(chr(code) for code in range(0x300, 0x370))
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        sentence_id UNINDEXED, normalized, folded,
+        tokenize="unicode61 remove_diacritics 0 tokenchars '{FTS5_TOKENCHARS}'"
+    )""",
+]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        sentence_id uuid PRIMARY KEY REFERENCES text_data_sentence (id) ON DELETE CASCADE,
+        normalized text NOT NULL,
+        folded text NOT NULL,
+        document tsvector GENERATED ALWAYS AS (to_tsvector('simple', normalized)) STORED,
+        folded_document tsvector GENERATED ALWAYS AS (to_tsvector('simple', folded)) STORED
+    )""",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_folded_document ON {SEARCH_TABLE} USING GIN (folded_document)",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_folded_trgm ON {SEARCH_TABLE} USING GIN (folded gin_trgm_ops)",
+]
+
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+
+def _rowid(sentence_id) -> int:
+    # FTS5 rows are keyed by integer; take 63 bits of the UUID
+    return uuid.UUID(str(sentence_id)).int >> 65
+
+
+def _filters(filters: Dict, params: List) -> str:
+    clauses = []
+    for column in ('language_id', 'corpus_id', 'status'):
+        if filters.get(column):
+            clauses.append(f's.{column} = %s')
+            params.append(filters[column])
+    return ''.join(f' AND {clause}' for clause in clauses)
+
+
+class SQLiteSearchBackend:
+    """FTS5 table with normalized and folded columns, ranked by BM25."""
+
+    ddl = SQLITE_DDL
+
+    def index(self, cursor, rows: List[Tuple]) -> None:
+        self.remove(cursor, [sentence_id for sentence_id, _, _ in rows])
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, sentence_id, normalized, folded) VALUES (%s, %s, %s, %s)",
+            [(_rowid(sentence_id), uuid.UUID(str(sentence_id)).hex, normalized, folded)
+             for sentence_id, normalized, folded in rows]
+        )
+
+    def remove(self, cursor, sentence_ids: List) -> None:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(_rowid(sentence_id),) for sentence_id in sentence_ids]
+        )
+
+    def clear(self, cursor) -> None:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    def search(self, cursor, tokens: List[str], fold: bool, filters: Dict, limit: int) -> List[Tuple]:
+        column = 'folded' if fold else 'normalized'
+        match = ' AND '.join(f'{column} : "{token}"*' for token in tokens)
+        params = [match]
+        where = _filters(filters, params)
+        params.append(limit)
+        cursor.execute(
+            f"""SELECT s.id, -bm25({SEARCH_TABLE}) AS rank
+                FROM {SEARCH_TABLE} JOIN text_data_sentence s ON s.id = {SEARCH_TABLE}.sentence_id
+                WHERE {SEARCH_TABLE} MATCH %s{where}
+                ORDER BY rank DESC LIMIT %s""",
+            params
+        )
+        return cursor.fetchall()
+
+
+class PostgresSearchBackend:
+    """Generated tsvector columns with GIN indexes plus a trigram index for fuzzy fallback."""
+
+    ddl = POSTGRES_DDL
+
+    def index(self, cursor, rows: List[Tuple]) -> None:
+        cursor.executemany(
+            f"""INSERT INTO {SEARCH_TABLE} (sentence_id, normalized, folded) VALUES (%s, %s, %s)
+                ON CONFLICT (sentence_id) DO UPDATE
+                SET normalized = EXCLUDED.normalized, folded = EXCLUDED.folded""",
+            [(str(sentence_id), normalized, folded) for sentence_id, normalized, folded in rows]
+        )
+
+    def remove(self, cursor, sentence_ids: List) -> None:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE sentence_id = ANY(%s::uuid[])",
+            [[str(sentence_id) for sentence_id in sentence_ids]]
+        )
+
+    def clear(self, cursor) -> None:
+        cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+
+    def search(self, cursor, tokens: List[str], fold: bool, filters: Dict, limit: int) -> List[Tuple]:
+        document = 'folded_document' if fold else 'document'
+        params = [' & '.join(f'{token}:*' for token in tokens)]
+        where = _filters(filters, params)
+        params.append(limit)
+        cursor.execute(
+            f"""SELECT s.id, ts_rank_cd(f.{document}, q) AS rank
+                FROM {SEARCH_TABLE} f JOIN text_data_sentence s ON s.id = f.sentence_id,
+                     to_tsquery('simple', %s) q
+                WHERE f.{document} @@ q{where}
+                ORDER BY rank DESC LIMIT %s""",
+            params
+        )
+        results = cursor.fetchall()
+
+        # Nothing matched word by word; fall back to trigram similarity for misspellings
+        query = ' '.join(tokens)
+        if not results and len(query) >= MIN_TRIGRAM_QUERY_LENGTH:
+            params = [query, query]
+            where = _filters(filters, params)
+            params.append(limit)
+            cursor.execute(
+                f"""SELECT s.id, similarity(f.folded, %s) AS rank
+                    FROM {SEARCH_TABLE} f JOIN text_data_sentence s ON s.id = f.sentence_id
+                    WHERE f.folded %% %s{where}
+                    ORDER BY rank DESC LIMIT %s""",
+                params
+            )
+            results = cursor.fetchall()
+        return results
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend(vendor: Optional[str] = None):
+    backend_class = BACKENDS.get(vendor or connection.vendor)
+    return backend_class() if backend_class else None
+
+
+def document_for(normalized: str) -> Tuple[str, str]:
+    return normalized, fold_normalized(normalized)
+
+
+def index_sentences(sentences: Iterable) -> None:
+    """Add or refresh search rows; call inside the transaction that wrote the sentences."""
+    backend = get_backend()
+    rows = [(sentence.pk, *document_for(sentence.normalized_text)) for sentence in sentences]
+    if backend and rows:
+        with connection.cursor() as cursor:
+            backend.index(cursor, rows)
+
+
+def remove_sentences(sentence_ids: Iterable) -> None:
+    backend = get_backend()
+    sentence_ids = list(sentence_ids)
+    if backend and sentence_ids:
+        with connection.cursor() as cursor:
+            backend.remove(cursor, sentence_ids)
+
+
+def rebuild(queryset, batch_size: int = 2000) -> int:
+    """Drop every search row and re-index ``queryset``; return rows indexed."""
+    backend = get_backend()
+    if not backend:
+        return 0
+
+    indexed = 0
+    batch = []
+    with connection.cursor() as cursor:
+        backend.clear(cursor)
+        if any(field.name == 'normalized_text' for field in queryset.model._meta.concrete_fields):
+            rows = queryset.values_list('id', 'normalized_text').iterator(chunk_size=batch_size)
+        else:
+            # Migrations before 0013 index through a Sentence without the column;
+            # normalize as 0013 will, so this index already agrees with 0016's
+            languages = queryset.model._meta.get_field('language').related_model
+            codes = dict(languages.objects.values_list('id', 'iso_code'))
+            rows = (
+                (sentence_id, pipeline_for(codes.get(language_id))(text))
+                for sentence_id, language_id, text in queryset.values_list(
+                    'id', 'language_id', 'text'
+                ).iterator(chunk_size=batch_size)
+            )
+        for sentence_id, normalized in rows:
+            batch.append((sentence_id, *document_for(normalized)))
+            if len(batch) >= batch_size:
+                backend.index(cursor, batch)
+                indexed += len(batch)
+                batch = []
+        backend.index(cursor, batch)
+    return indexed + len(batch)
+
+
+def query_pipeline(language_id=None) -> Pipeline:
+    """The pipeline sentences of ``language_id`` are indexed with; the default one without a language."""
+    iso_code = None
+    if language_id:
+        try:
+            iso_code = Language.objects.filter(pk=language_id).values_list('iso_code', flat=True).first()
+        except (TypeError, ValueError):
+            pass
+    return pipeline_for(iso_code)
+
+
+def search(query: str, fold: bool = False, filters: Optional[Dict] = None,
+           limit: int = 20) -> List[Tuple]:
+    """Return ``(sentence_id, rank)`` pairs, best first.
+
+    The query goes through the same normalization as the index (that of
+    the language in ``filters``, if any), so tone marks and special letters
+    match however they were typed; ``fold`` additionally ignores diacritics
+    and maps ɛ/ɔ/ŋ to e/o/n. Each token is matched as a prefix.
+    """
+    backend = get_backend()
+    normalized = query_pipeline((filters or {}).get('language_id'))(query)
+    tokens = tokenize(fold_normalized(normalized) if fold else normalized)
+    if not backend or not tokens:
+        return []
+    with connection.cursor() as cursor:
+        return backend.search(cursor, tokens, fold, filters or {}, limit)
+
+
+def highlight(text: str, query: str, fold: bool = False,
+              open_tag: str = '<mark>', close_tag: str = '</mark>',
+              pipeline: Optional[Pipeline] = None) -> str:
+    """HTML-escape ``text`` and wrap the words matching ``query`` in tags.
+
+    Works on the original text so the highlight shows exactly what the
+    contributor wrote, whichever backend produced the match. ``pipeline``
+    is the text's language pipeline, the default one if omitted.
+    """
+    pipeline = pipeline or pipeline_for(None)
+    transform = (lambda value: fold_normalized(pipeline(value))) if fold else pipeline
+    tokens = tokenize(transform(query))
+    if not tokens:
+        return escape(text)
+
+    parts = []
+    position = 0
+    for match in TOKEN_RE.finditer(text):
+        word = transform(match.group())
+        if any(word.startswith(token) for token in tokens):
+            parts.append(escape(text[position:match.start()]))
+            parts.append(f'{open_tag}{escape(match.group())}{close_tag}')
+            position = match.end()
+    parts.append(escape(text[position:]))
+    return ''.join(parts)
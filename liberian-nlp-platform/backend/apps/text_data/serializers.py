@@ -1,10 +1,12 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Corpus, Sentence, Translation, SentenceMetadata
 from apps.languages.serializers import LanguageListSerializer
 from apps.accounts.serializers import UserSerializer
+from config.fieldsets import SparseFieldsetMixin
 
 
-class CorpusSerializer(serializers.ModelSerializer):
+class CorpusSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for text corpora."""
     
     language = LanguageListSerializer(read_only=True)
@@ -24,7 +26,7 @@ class CorpusSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class SentenceMetadataSerializer(serializers.ModelSerializer):
+class SentenceMetadataSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for sentence metadata."""
     
     class Meta:
@@ -35,7 +37,7 @@ class SentenceMetadataSerializer(serializers.ModelSerializer):
         ]
 
 
-class SentenceSerializer(serializers.ModelSerializer):
+class SentenceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for sentences."""
     
     language = LanguageListSerializer(read_only=True)
@@ -52,15 +54,15 @@ class SentenceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Sentence
         fields = [
-            'id', 'text', 'language', 'language_id', 'corpus', 'corpus_id',
+            'id', 'text', 'normalized_text', 'language', 'language_id', 'corpus', 'corpus_id',
             'status', 'difficulty_level', 'source_text', 'source_language',
             'source_language_id', 'word_count', 'character_count',
-            'confidence_score', 'contributed_by', 'metadata',
+            'confidence_score', 'near_duplicate_of', 'detected_language', 'split', 'contributed_by', 'metadata',
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'word_count', 'character_count', 'confidence_score',
-            'contributed_by', 'created_at', 'updated_at'
+            'id', 'normalized_text', 'word_count', 'character_count', 'confidence_score',
+            'near_duplicate_of', 'detected_language', 'split', 'contributed_by', 'created_at', 'updated_at'
         ]
     
     def create(self, validated_data):
@@ -68,7 +70,7 @@ class SentenceSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class SentenceListSerializer(serializers.ModelSerializer):
+class SentenceListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for sentence lists."""
     
     language_name = serializers.CharField(source='language.name', read_only=True)
@@ -84,7 +86,7 @@ class SentenceListSerializer(serializers.ModelSerializer):
         ]
 
 
-class TranslationSerializer(serializers.ModelSerializer):
+class TranslationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for translations."""
     
     source_sentence = SentenceListSerializer(read_only=True)
@@ -92,6 +94,7 @@ class TranslationSerializer(serializers.ModelSerializer):
     source_sentence_id = serializers.UUIDField(write_only=True)
     target_sentence_id = serializers.UUIDField(write_only=True)
     translated_by = UserSerializer(read_only=True)
+    quality_issues = serializers.ListField(child=serializers.CharField(), read_only=True)
     
     class Meta:
         model = Translation
@@ -99,10 +102,10 @@ class TranslationSerializer(serializers.ModelSerializer):
             'id', 'source_sentence', 'target_sentence',
             'source_sentence_id', 'target_sentence_id',
             'status', 'translation_type', 'confidence_score',
-            'length_ratio', 'translated_by', 'created_at', 'updated_at'
+            'length_ratio', 'quality_issues', 'split', 'translated_by', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'confidence_score', 'length_ratio',
+            'id', 'confidence_score', 'length_ratio', 'split',
             'translated_by', 'created_at', 'updated_at'
         ]
     
@@ -120,7 +123,100 @@ class TranslationPairSerializer(serializers.Serializer):
     target_language_id = serializers.IntegerField()
     corpus_id = serializers.IntegerField()
     translation_type = serializers.ChoiceField(
-        choices=Translation.TranslationStatus.choices,
+        choices=[
+            ('literal', 'Literal'),
+            ('free', 'Free'),
+            ('cultural', 'Cultural Adaptation'),
+        ],
+        default='free'
+    )
+    difficulty_level = serializers.ChoiceField(
+        choices=[
+            ('beginner', 'Beginner'),
+            ('intermediate', 'Intermediate'),
+            ('advanced', 'Advanced'),
+        ],
+        default='intermediate'
+    )
+
+
+class TranslationBatchSerializer(serializers.Serializer):
+    """Serializer for creating many translation pairs in one request.
+    
+    Each item in ``pairs`` needs ``source_text`` and ``target_text`` and may
+    override ``translation_type`` and ``difficulty_level``; items are checked
+    one by one so every bad pair is reported with its position.
+    """
+    
+    source_language_id = serializers.IntegerField()
+    target_language_id = serializers.IntegerField()
+    corpus_id = serializers.IntegerField()
+    translation_type = serializers.ChoiceField(
+        choices=[
+            ('literal', 'Literal'),
+            ('free', 'Free'),
+            ('cultural', 'Cultural Adaptation'),
+        ],
+        default='free'
+    )
+    difficulty_level = serializers.ChoiceField(
+        choices=[
+            ('beginner', 'Beginner'),
+            ('intermediate', 'Intermediate'),
+            ('advanced', 'Advanced'),
+        ],
+        default='intermediate'
+    )
+    pairs = serializers.ListField(
+        child=serializers.JSONField(),
+        min_length=1,
+        max_length=settings.MAX_TRANSLATION_BATCH_SIZE
+    )
+
+
+class SentenceImportSerializer(serializers.Serializer):
+    """Serializer for bulk sentence imports."""
+    
+    file = serializers.FileField()
+    format = serializers.ChoiceField(
+        choices=['csv', 'tsv', 'jsonl', 'txt'],
+        required=False
+    )
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+    status = serializers.ChoiceField(
+        choices=Sentence.SentenceStatus.choices,
+        default=Sentence.SentenceStatus.SUBMITTED
+    )
+    difficulty_level = serializers.ChoiceField(
+        choices=[
+            ('beginner', 'Beginner'),
+            ('intermediate', 'Intermediate'),
+            ('advanced', 'Advanced'),
+        ],
+        default='intermediate'
+    )
+
+
+class ParallelImportSerializer(serializers.Serializer):
+    """Serializer for bulk aligned-corpus imports."""
+    
+    file = serializers.FileField()
+    target_file = serializers.FileField(required=False)
+    format = serializers.ChoiceField(
+        choices=['tmx', 'moses', 'tsv'],
+        required=False
+    )
+    source_language_id = serializers.IntegerField()
+    target_language_id = serializers.IntegerField()
+    source_lang_code = serializers.CharField(max_length=20, required=False)
+    target_lang_code = serializers.CharField(max_length=20, required=False)
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+    translation_type = serializers.ChoiceField(
+        choices=[
+            ('literal', 'Literal'),
+            ('free', 'Free'),
+            ('cultural', 'Cultural Adaptation'),
+        ],
         default='free'
     )
     difficulty_level = serializers.ChoiceField(
@@ -131,6 +227,73 @@ class TranslationPairSerializer(serializers.Serializer):
         ],
         default='intermediate'
     )
+    
+    def validate(self, data):
+        if data.get('format') == 'moses' and 'target_file' not in data:
+            raise serializers.ValidationError('Moses imports need both file and target_file')
+        if 'target_file' in data and not data.get('format'):
+            data['format'] = 'moses'
+        return data
+
+
+class ParallelExportSerializer(serializers.Serializer):
+    """Query parameters for streaming translation pair exports."""
+    
+    source_language = serializers.IntegerField()
+    target_language = serializers.IntegerField()
+    # Not ``format``: DRF reserves that query parameter for renderer selection
+    export_format = serializers.ChoiceField(choices=['moses', 'jsonl', 'parquet'], default='jsonl')
+    compression = serializers.ChoiceField(choices=['none', 'gzip', 'zstd'], default='none')
+    status = serializers.ChoiceField(
+        choices=Translation.TranslationStatus.choices,
+        default=Translation.TranslationStatus.VALIDATED
+    )
+    corpus = serializers.IntegerField(required=False)
+    split = serializers.ChoiceField(choices=['train', 'dev', 'test'], required=False)
+    chunk_size = serializers.IntegerField(min_value=100, max_value=50000, default=5000)
+
+
+class AlignedExportSerializer(serializers.Serializer):
+    """Query parameters for N-way aligned exports, e.g. ``languages=3&languages=5&languages=1``."""
+    
+    languages = serializers.ListField(child=serializers.IntegerField(), min_length=2, max_length=10)
+    compression = serializers.ChoiceField(choices=['none', 'gzip', 'zstd'], default='none')
+    status = serializers.ChoiceField(choices=Sentence.SentenceStatus.choices, required=False)
+    chunk_size = serializers.IntegerField(min_value=100, max_value=50000, default=5000)
+    
+    def validate_languages(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError('Languages must be distinct')
+        return value
+
+
+class VocabularyQuerySerializer(serializers.Serializer):
+    """Query parameters for vocabulary statistics."""
+    
+    language = serializers.IntegerField()
+    corpus = serializers.IntegerField(required=False)
+    n = serializers.ChoiceField(choices=[1, 2], default=1)
+    validated = serializers.BooleanField(default=False)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=50)
+
+
+class VocabularyCoverageSerializer(serializers.Serializer):
+    """Text to check against a language or corpus vocabulary."""
+    
+    language = serializers.IntegerField()
+    corpus = serializers.IntegerField(required=False)
+    validated = serializers.BooleanField(default=False)
+    text = serializers.CharField(max_length=100000)
+
+
+class LanguageIdentificationSerializer(serializers.Serializer):
+    """Texts to run through the built-in language identifier."""
+    
+    texts = serializers.ListField(
+        child=serializers.CharField(max_length=1000),
+        min_length=1,
+        max_length=1000
+    )
 
 
 class CorpusStatsSerializer(serializers.Serializer):
@@ -0,0 +1,343 @@
+from datetime import datetime
+from django.conf import settings
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import os
+import tempfile
+import threading
+import uuid
+import zipfile
+
+
+NGRAM_RANGE = (2, 4)  # Character n-grams within word boundaries
+NUM_FEATURES = 2 ** 18
+
+# Input is ``Sentence.normalized_text``, already casefolded by its language's pipeline
+VECTORIZER = HashingVectorizer(
+    analyzer='char_wb',
+    ngram_range=NGRAM_RANGE,
+    n_features=NUM_FEATURES,
+    lowercase=False,
+    alternate_sign=False,
+    norm=None,
+    dtype=np.float32,
+)
+
+
+def term_frequencies(texts: Sequence[str]) -> sparse.csr_matrix:
+    """Sublinear (1 + log) n-gram counts, one row per text."""
+    counts = VECTORIZER.transform(texts)
+    counts.data = 1 + np.log(counts.data)
+    return counts
+
+
+def inverse_document_frequency(document_frequency: np.ndarray, documents: int) -> np.ndarray:
+    # Smoothed as in scikit-learn's TfidfTransformer
+    return (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def row_norms(frequencies: sparse.csr_matrix, idf: np.ndarray) -> np.ndarray:
+    weighted = frequencies.multiply(idf).tocsr()
+    return np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel()).astype(np.float32)
+
+
+def load_arrays(path: str) -> Dict[str, np.ndarray]:
+    """The arrays of an uncompressed ``.npz``, memory-mapped in place rather than read.
+
+    ``np.load`` ignores ``mmap_mode`` for archives, but members written by
+    ``np.savez`` are stored as plain ``.npy`` files, so each can be mapped at
+    its offset in the zip.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as handle:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[name] = np.load(archive.open(info))
+                continue
+            # Local file header: 30 fixed bytes, then the name and extra field
+            handle.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(handle.read(4), dtype='<u2')
+            handle.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+            if not shape or not np.prod(shape) or dtype.hasobject:
+                handle.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+                arrays[name] = np.lib.format.read_array(handle)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode='r', offset=handle.tell(), shape=shape,
+                order='F' if fortran_order else 'C',
+            )
+    return arrays
+
+
+class SimilarityIndex:
+    """Character n-gram TF-IDF cosine neighbours for one language's sentences.
+
+    Sentences indexed at the last compaction live in an inverted index (the
+    transposed term-frequency matrix) with per-sentence TF-IDF norms, loaded
+    memory-mapped. Sentences changed since then are read from the database
+    into a small in-memory delta on each lookup and scored with the same
+    IDF weights. Compaction folds the delta in, drops deleted sentences and
+    recomputes the weights.
+    """
+
+    def __init__(self, language_id: int, ids: Optional[np.ndarray] = None,
+                 postings: Optional[sparse.csr_matrix] = None, norms: Optional[np.ndarray] = None,
+                 built_until: Optional[datetime] = None):
+        self.language_id = language_id
+        # Sentence UUIDs as rows of 16 bytes (``S16`` would strip trailing zero bytes)
+        self.ids = ids if ids is not None else np.empty((0, 16), dtype=np.uint8)
+        self.postings = postings if postings is not None else sparse.csr_matrix(
+            (NUM_FEATURES, 0), dtype=np.float32
+        )
+        self.built_until = built_until
+        self.idf = inverse_document_frequency(np.diff(self.postings.indptr), len(self.ids))
+        self.norms = norms if norms is not None else np.empty(0, dtype=np.float32)
+
+        self.delta_ids: List[bytes] = []
+        self.delta_rows: Dict[bytes, int] = {}
+        self.delta = sparse.csr_matrix((0, NUM_FEATURES), dtype=np.float32)
+        self.delta_norms = np.empty(0, dtype=np.float32)
+        self.delta_alive = np.empty(0, dtype=bool)
+        self.delta_until = built_until
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids) + self.pending
+
+    @property
+    def pending(self) -> int:
+        """Sentences changed since the last compaction."""
+        return len(self.delta_rows)
+
+    def add(self, rows: Iterable[Tuple[uuid.UUID, str]]) -> None:
+        """Score ``(sentence_id, normalized_text)`` rows from now on, replacing earlier versions."""
+        # Keep only the last version of a sentence that appears more than once
+        rows = list({sentence_id: text for sentence_id, text in rows}.items())
+        if not rows:
+            return
+        frequencies = term_frequencies([text for _, text in rows])
+        for sentence_id, _ in rows:
+            key = sentence_id.bytes
+            previous = self.delta_rows.get(key)
+            if previous is not None:
+                self.delta_alive[previous] = False
+            self.delta_rows[key] = len(self.delta_ids)
+            self.delta_ids.append(key)
+        self.delta = sparse.vstack([self.delta, frequencies], format='csr')
+        self.delta_norms = np.concatenate([self.delta_norms, row_norms(frequencies, self.idf)])
+        self.delta_alive = np.concatenate([self.delta_alive, np.ones(len(rows), dtype=bool)])
+
+    def refresh(self, batch_size: int = 5000) -> int:
+        """Pull sentences of this language saved since the last look into the delta."""
+        from .models import Sentence
+
+        rows = Sentence.objects.filter(language_id=self.language_id)
+        if self.delta_until is not None:
+            # Inclusive, so rows saved in the same instant as the last one seen are not missed
+            rows = rows.filter(updated_at__gte=self.delta_until)
+        rows = rows.order_by('updated_at').values_list('id', 'normalized_text', 'updated_at')
+
+        added = 0
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                added += self._add_batch(batch)
+                batch = []
+        added += self._add_batch(batch)
+        return added
+
+    def _add_batch(self, batch) -> int:
+        # Rows at the boundary instant that are already in the delta come back each time
+        batch = [
+            row for row in batch
+            if not (row[2] == self.delta_until and row[0].bytes in self.delta_rows)
+        ]
+        if not batch:
+            return 0
+        self.add((sentence_id, text) for sentence_id, text, _ in batch)
+        self.delta_until = batch[-1][2]
+        return len(batch)
+
+    def query(self, text: str, limit: int = 10, min_score: float = 0.0,
+              exclude: Sequence[uuid.UUID] = ()) -> List[Tuple[uuid.UUID, float]]:
+        """Top ``limit`` ``(sentence_id, cosine)`` pairs for normalized ``text``, best first."""
+        vector = term_frequencies([text]).multiply(self.idf).tocsr()
+        length = np.sqrt(vector.multiply(vector).sum())
+        if not length:
+            return []
+        # Dotting against raw frequencies needs the IDF weight once more
+        vector = (vector.multiply(self.idf) / length).tocsr()
+
+        excluded = {sentence_id.bytes for sentence_id in exclude}
+        candidates = []
+        if len(self.ids):
+            scores = self._accumulate(vector)
+            np.divide(scores, self.norms, out=scores, where=self.norms > 0)
+            # Stale copies of sentences changed since compaction are shadowed by the delta
+            for index in self._top(scores, limit + self.pending + len(excluded), min_score):
+                key = self.ids[index].tobytes()
+                if key not in self.delta_rows:
+                    candidates.append((key, scores[index]))
+        if self.pending:
+            scores = np.asarray((self.delta @ vector.T).todense()).ravel()
+            np.divide(scores, self.delta_norms, out=scores, where=self.delta_norms > 0)
+            scores[~self.delta_alive] = 0
+            candidates += [
+                (self.delta_ids[index], scores[index])
+                for index in self._top(scores, limit + len(excluded), min_score)
+            ]
+
+        ranked = sorted(
+            ((key, score) for key, score in candidates if key not in excluded),
+            key=lambda candidate: -candidate[1],
+        )
+        return [(uuid.UUID(bytes=key), round(float(score), 4)) for key, score in ranked[:limit]]
+
+    def _accumulate(self, vector: sparse.csr_matrix) -> np.ndarray:
+        """Dot products of ``vector`` with every compacted sentence, walking only its n-grams' postings.
+
+        Several times faster than the sparse product, which builds a sparse
+        result row as large as the index.
+        """
+        starts = self.postings.indptr[vector.indices]
+        ends = self.postings.indptr[vector.indices + 1]
+        documents = np.concatenate([self.postings.indices[start:end] for start, end in zip(starts, ends)])
+        weights = np.concatenate([
+            self.postings.data[start:end] * weight for start, end, weight in zip(starts, ends, vector.data)
+        ])
+        return np.bincount(documents, weights, minlength=len(self.ids))
+
+    @staticmethod
+    def _top(scores: np.ndarray, count: int, min_score: float) -> np.ndarray:
+        """Positions of the ``count`` highest scores above ``min_score``, unordered."""
+        count = min(count, len(scores))
+        if not count:
+            return np.empty(0, dtype=np.intp)
+        best = np.argpartition(-scores, count - 1)[:count]
+        return best[scores[best] > min_score]
+
+    def compact(self, live_ids: Iterable[uuid.UUID]) -> 'SimilarityIndex':
+        """A new index holding every live sentence, with the delta merged and IDF recomputed."""
+        live = {sentence_id.bytes for sentence_id in live_ids}
+        keep = np.fromiter(
+            (key.tobytes() in live and key.tobytes() not in self.delta_rows for key in self.ids),
+            dtype=bool, count=len(self.ids),
+        )
+        alive = np.flatnonzero(self.delta_alive)
+        alive = alive[np.fromiter((self.delta_ids[row] in live for row in alive), dtype=bool, count=len(alive))]
+
+        frequencies = sparse.vstack([self.postings.T.tocsr()[keep], self.delta[alive]], format='csr')
+        ids = np.concatenate([
+            self.ids[keep],
+            np.frombuffer(b''.join(self.delta_ids[row] for row in alive), dtype=np.uint8).reshape(-1, 16),
+        ])
+        postings = frequencies.T.tocsr()
+        idf = inverse_document_frequency(np.diff(postings.indptr), len(ids))
+        return SimilarityIndex(
+            self.language_id, ids, postings, row_norms(frequencies, idf), self.delta_until
+        )
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # One index dtype for both arrays, or scipy copies them on every product
+        index_dtype = np.int32 if self.postings.nnz < 2 ** 31 else np.int64
+        # Uncompressed so readers can memory-map the arrays; write then rename,
+        # so running processes never load a half-written file
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as handle:
+            np.savez(
+                handle,
+                ids=np.ascontiguousarray(self.ids, dtype=np.uint8),
+                indptr=self.postings.indptr.astype(index_dtype),
+                indices=self.postings.indices.astype(index_dtype),
+                data=self.postings.data.astype(np.float32),
+                norms=self.norms.astype(np.float32),
+                built_until=np.array(self.built_until.isoformat() if self.built_until else ''),
+            )
+        os.replace(handle.name, path)
+
+    @classmethod
+    def load(cls, language_id: int, path: str) -> 'SimilarityIndex':
+        arrays = load_arrays(path)
+        ids = arrays['ids']
+        postings = sparse.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']), shape=(NUM_FEATURES, len(ids)), copy=False
+        )
+        built_until = str(arrays['built_until'])
+        return cls(
+            language_id, ids, postings, arrays['norms'],
+            datetime.fromisoformat(built_until) if built_until else None,
+        )
+
+
+def index_path(language_id: int) -> str:
+    return os.path.join(settings.SIMILARITY_INDEX_DIR, f'{language_id}.npz')
+
+
+_cache: Dict[int, Tuple[Optional[float], SimilarityIndex]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_index(language_id: int) -> SimilarityIndex:
+    """This process's index for a language, reloaded whenever a compaction replaces the file.
+
+    Before the first compaction every sentence of the language is in the delta.
+    """
+    path = index_path(language_id)
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        modified = None
+    with _cache_lock:
+        cached = _cache.get(language_id)
+        if not cached or cached[0] != modified:
+            index = SimilarityIndex.load(language_id, path) if modified is not None else SimilarityIndex(language_id)
+            cached = _cache[language_id] = (modified, index)
+        return cached[1]
+
+
+def similar(language_id: int, text: str, limit: int = 10, min_score: float = 0.0,
+            exclude: Sequence[uuid.UUID] = ()) -> List[Tuple[uuid.UUID, float]]:
+    """Cosine neighbours of normalized ``text`` among a language's sentences.
+
+    Queues a compaction once the delta outgrows ``SIMILARITY_COMPACT_AFTER``.
+    """
+    index = get_index(language_id)
+    with index.lock:
+        index.refresh()
+        results = index.query(text, limit=limit, min_score=min_score, exclude=exclude)
+        pending = index.pending
+
+    if pending >= settings.SIMILARITY_COMPACT_AFTER:
+        from django.core.cache import cache
+        from .tasks import compact_similarity_index
+
+        # One queued compaction per language at a time, across processes
+        if cache.add(f'similarity-compaction:{language_id}', True, timeout=settings.SIMILARITY_COMPACT_LOCK_SECONDS):
+            compact_similarity_index.delay(language_id)
+    return results
+
+
+def compact(language_id: int, full: bool = False) -> SimilarityIndex:
+    """Fold changes since the last compaction into the index file; ``full`` rebuilds it from scratch."""
+    from .models import Sentence
+
+    path = index_path(language_id)
+    if full or not os.path.exists(path):
+        index = SimilarityIndex(language_id)
+    else:
+        index = SimilarityIndex.load(language_id, path)
+    index.refresh()
+    live = Sentence.objects.filter(language_id=language_id).values_list('id', flat=True)
+    compacted = index.compact(live.iterator(chunk_size=5000))
+    compacted.save(path)
+    return compacted
@@ -0,0 +1,52 @@
+from django.conf import settings
+from hashlib import blake2b
+from typing import Callable, Dict, Sequence
+
+TRAIN = 'train'
+DEV = 'dev'
+TEST = 'test'
+SPLITS = [TRAIN, DEV, TEST]
+SPLIT_CHOICES = [(TRAIN, 'Train'), (DEV, 'Dev'), (TEST, 'Test')]
+
+
+def split_for(group) -> str:
+    """Split for a group key; every row sharing the key lands in the same split.
+
+    The key is hashed with ``DATA_SPLIT_SALT`` into [0, 1) and compared with
+    the configured fractions, so assignments never depend on row order or on
+    how many rows exist, and adding data does not move anything.
+    """
+    digest = blake2b(f'{settings.DATA_SPLIT_SALT}:{group}'.encode('utf-8'), digest_size=8).digest()
+    position = int.from_bytes(digest, 'big') / 2 ** 64
+    if position < settings.TEST_SPLIT_FRACTION:
+        return TEST
+    if position < settings.TEST_SPLIT_FRACTION + settings.DEV_SPLIT_FRACTION:
+        return DEV
+    return TRAIN
+
+
+def assign(queryset, fields: Sequence[str], group: Callable, batch_size: int = 5000) -> Dict[str, int]:
+    """Store the split of every row in ``queryset``; return rows per split.
+
+    ``fields`` are read with ``values_list('pk', *fields)`` and ``group`` maps
+    such a row to its group key. Rows are written with one ``UPDATE`` per
+    split per batch rather than one per row.
+    """
+    manager = queryset.model._default_manager
+    counts = dict.fromkeys(SPLITS, 0)
+    pending = {name: [] for name in SPLITS}
+
+    def flush():
+        for name, ids in pending.items():
+            if ids:
+                manager.filter(pk__in=ids).update(split=name)
+                counts[name] += len(ids)
+                ids.clear()
+
+    rows = queryset.values_list('pk', *fields).iterator(chunk_size=batch_size)
+    for index, row in enumerate(rows, 1):
+        pending[split_for(group(row))].append(row[0])
+        if index % batch_size == 0:
+            flush()
+    flush()
+    return counts
@@ -0,0 +1,26 @@
+from celery import shared_task
+from django.core.cache import cache
+from . import similarity
+from .models import Corpus, CorpusStatistic
+
+
+@shared_task
+def compact_similarity_index(language_id):
+    """Fold sentences changed since the last compaction into a language's similarity index."""
+    
+    try:
+        index = similarity.compact(language_id)
+        return f"Compacted similarity index for language {language_id}: {len(index)} sentences"
+    except Exception as e:
+        return f"Similarity compaction failed for language {language_id}: {str(e)}"
+    finally:
+        cache.delete(f'similarity-compaction:{language_id}')
+
+
+@shared_task
+def reconcile_corpus_stats():
+    """Recount corpus totals and the stats counters from the source tables."""
+    
+    corpora = Corpus.reconcile_counts()
+    counters = CorpusStatistic.reconcile()
+    return f"Reconciled corpus statistics; {corpora} corpora and {counters} counters had drifted"
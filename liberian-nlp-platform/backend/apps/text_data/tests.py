@@ -0,0 +1,115 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from apps.accounts.models import User
+from apps.languages.models import Language
+from . import quality
+from .models import Corpus, Sentence, Translation
+
+
+class ParallelImportTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', email='importer@example.org', password='x')
+        self.english = Language.objects.create(name='English', iso_code='en')
+        self.kpelle = Language.objects.create(name='Kpelle', iso_code='kpe')
+        self.corpus = Corpus.objects.create(
+            name='Psalms', language=self.kpelle, created_by=self.user, corpus_type='religious'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_source_line_reuses_the_sentence(self):
+        upload = SimpleUploadedFile('psalms.tsv', 'Amen.\tAmɛn.\nAmen.\tNyɛ́i.\n'.encode('utf-8'))
+        response = self.client.post(f'/api/v1/text/corpora/{self.corpus.pk}/import-parallel/', {
+            'file': upload,
+            'source_language_id': self.english.pk,
+            'target_language_id': self.kpelle.pk,
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(Sentence.objects.filter(language=self.english).count(), 1)
+        self.assertEqual(Translation.objects.filter(source_sentence__text='Amen.').count(), 2)
+
+
+class TranslationBatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='translator', email='translator@example.org', password='x')
+        self.english = Language.objects.create(name='English', iso_code='en')
+        self.bassa = Language.objects.create(name='Bassa', iso_code='bsq')
+        self.corpus = Corpus.objects.create(
+            name='Greetings', language=self.bassa, created_by=self.user, corpus_type='conversational'
+        )
+        self.client.force_authenticate(self.user)
+
+    def post_pairs(self, pairs):
+        return self.client.post('/api/v1/text/translation-pairs/batch/', {
+            'source_language_id': self.english.pk,
+            'target_language_id': self.bassa.pk,
+            'corpus_id': self.corpus.pk,
+            'pairs': pairs,
+        }, format='json')
+
+    def test_repeated_sentences_in_payload_are_deduplicated(self):
+        response = self.post_pairs([
+            {'source_text': 'Good morning.', 'target_text': 'Ɓɛ́ɛ nyɔ̃.'},
+            {'source_text': 'Good morning.', 'target_text': 'Ɓɛ́ɛ nyɔ̃ ɖɛ.'},
+            {'source_text': 'Good morning.', 'target_text': 'Ɓɛ́ɛ nyɔ̃.'},
+        ])
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['duplicates'], 1)
+        self.assertEqual(response.data['existing'][0]['line'], 3)
+        self.assertEqual(Sentence.objects.filter(language=self.english).count(), 1)
+        self.assertEqual(Sentence.objects.filter(language=self.bassa).count(), 2)
+
+    def test_invalid_pair_fails_the_batch(self):
+        response = self.post_pairs([
+            {'source_text': 'Good night.', 'target_text': 'Ɓɛ́ɛ kpɔ.'},
+            {'source_text': 'Good night.'},
+            'Thank you.',
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 3])
+        self.assertFalse(Sentence.objects.exists())
+        self.assertFalse(Translation.objects.exists())
+
+
+class SearchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.org', password='x')
+        self.kpelle = Language.objects.create(name='Kpelle', iso_code='kpelle')
+        corpus = Corpus.objects.create(
+            name='Proverbs', language=self.kpelle, created_by=self.user, corpus_type='literature'
+        )
+        self.sentence = Sentence.objects.create(
+            text='Kálòŋ è pâi.', language=self.kpelle, corpus=corpus, contributed_by=self.user
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_spacing_tone_marks_match_a_tonal_language(self):
+        response = self.client.get('/api/v1/text/sentences/search/', {'q': 'ka´lo`ŋ', 'language': self.kpelle.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['id'] for result in response.data['results']], [str(self.sentence.pk)])
+        self.assertEqual(response.data['results'][0]['highlighted'], '<mark>Kálòŋ</mark> è pâi.')
+
+
+class QualityTests(TestCase):
+
+    def test_identical_pair_is_flagged_with_the_language_pipeline(self):
+        user = User.objects.create_user(username='reviewer', email='reviewer@example.org', password='x')
+        bassa = Language.objects.create(name='Bassa', iso_code='bassa')
+        kpelle = Language.objects.create(name='Kpelle', iso_code='kpelle')
+        corpus = Corpus.objects.create(name='Names', language=bassa, created_by=user, corpus_type='general')
+        source = Sentence.objects.create(text='Gbɛ́ kɔ̀.', language=bassa, corpus=corpus, contributed_by=user)
+        target = Sentence(text='Gbɛ´ kɔ`.', language_id=kpelle.pk, word_count=2, character_count=9)
+
+        translation = Translation(source_sentence=source, target_sentence=target)
+        quality.assess([translation])
+
+        self.assertIn('identical', translation.quality_issues)
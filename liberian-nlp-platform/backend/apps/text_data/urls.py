@@ -4,11 +4,22 @@ from . import views
 urlpatterns = [
     path('corpora/', views.CorpusListView.as_view(), name='corpus-list'),
     path('corpora/<int:pk>/', views.CorpusDetailView.as_view(), name='corpus-detail'),
+    path('corpora/<int:pk>/import/', views.import_sentences, name='corpus-import'),
+    path('corpora/<int:pk>/import-parallel/', views.import_parallel_corpus, name='corpus-import-parallel'),
     path('sentences/', views.SentenceListView.as_view(), name='sentence-list'),
+    path('sentences/search/', views.search_sentences, name='sentence-search'),
+    path('sentences/similar/', views.similar_sentences, name='sentence-similar'),
     path('sentences/<uuid:pk>/', views.SentenceDetailView.as_view(), name='sentence-detail'),
+    path('sentences/<uuid:pk>/equivalents/', views.sentence_equivalents, name='sentence-equivalents'),
     path('sentences/<uuid:sentence_id>/metadata/', views.SentenceMetadataView.as_view(), name='sentence-metadata'),
     path('translations/', views.TranslationListView.as_view(), name='translation-list'),
+    path('translations/export/', views.export_translations, name='translation-export'),
+    path('translations/aligned/', views.export_aligned_translations, name='translation-aligned-export'),
     path('translation-pairs/', views.create_translation_pair, name='create-translation-pair'),
+    path('translation-pairs/batch/', views.create_translation_pairs, name='create-translation-pairs'),
     path('stats/', views.corpus_stats, name='corpus-stats'),
+    path('vocabulary/', views.vocabulary_stats, name='vocabulary-stats'),
+    path('vocabulary/coverage/', views.vocabulary_coverage, name='vocabulary-coverage'),
+    path('language-id/', views.identify_language, name='language-id'),
     path('random-sentence/', views.random_sentence, name='random-sentence'),
 ]
\ No newline at end of file
@@ -1,17 +1,39 @@
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
 from django.db import transaction
-from .models import Corpus, Sentence, Translation, SentenceMetadata
+from django.http import StreamingHttpResponse
+import io
+from config.fieldsets import SparseFieldsetViewMixin
+from config.pagination import KeysetPagination
+from apps.audio_data.models import AudioRecording
+from apps.languages.models import Language
+from . import langid, search, similarity, vocabulary
+from .models import (
+    Corpus, CorpusStatistic, Sentence, Translation, TranslationCluster, SentenceMetadata, VocabularyEntry
+)
 from .serializers import (
     CorpusSerializer, SentenceSerializer, SentenceListSerializer,
-    TranslationSerializer, TranslationPairSerializer, CorpusStatsSerializer,
-    SentenceMetadataSerializer
+    TranslationSerializer, TranslationPairSerializer, TranslationBatchSerializer, CorpusStatsSerializer,
+    SentenceMetadataSerializer, SentenceImportSerializer, ParallelImportSerializer,
+    ParallelExportSerializer, AlignedExportSerializer, VocabularyQuerySerializer, VocabularyCoverageSerializer,
+    LanguageIdentificationSerializer
+)
+from .importers import (
+    SentenceImporter, TranslationPairImporter, ImportRowError,
+    detect_format, detect_parallel_format, read_rows, read_tmx, read_moses, read_parallel_tsv
 )
+from .exporters import AlignedExporter, ExportError, ParallelExporter
+from .normalization import pipeline_for, tokenize
+import xml.etree.ElementTree as ET
 
 
-class CorpusListView(generics.ListCreateAPIView):
+class CorpusListView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List and create corpora."""
     
     serializer_class = CorpusSerializer
@@ -38,7 +60,7 @@ class CorpusListView(generics.ListCreateAPIView):
         return queryset.order_by('-created_at')
 
 
-class CorpusDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CorpusDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a corpus."""
     
     queryset = Corpus.objects.all()
@@ -46,10 +68,11 @@ class CorpusDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class SentenceListView(generics.ListCreateAPIView):
+class SentenceListView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List and create sentences."""
     
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -79,10 +102,144 @@ class SentenceListView(generics.ListCreateAPIView):
         if contributor:
             queryset = queryset.filter(contributed_by_id=contributor)
         
+        # Filter by train/dev/test split
+        split = self.request.query_params.get('split')
+        if split:
+            queryset = queryset.filter(split=split)
+        
+        # Sentences the language identifier thinks are mislabelled
+        if self.request.query_params.get('language_mismatch', '').lower() in ('1', 'true', 'yes'):
+            queryset = queryset.exclude(detected_language=None).exclude(detected_language=F('language'))
+        
         return queryset.order_by('-created_at')
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        # Return the existing sentence rather than storing a second copy
+        existing = Sentence.find_duplicate(
+            serializer.validated_data['language_id'], serializer.validated_data['text']
+        )
+        if existing:
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+        
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def search_sentences(request):
+    """Ranked full-text search over sentences with highlighted matches.
+    
+    Pass ``fold=true`` to ignore tone marks and match ɛ/ɔ/ŋ as e/o/n.
+    """
+    
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fold = request.query_params.get('fold', '').lower() in ('1', 'true', 'yes')
+    try:
+        limit = min(int(request.query_params.get('limit', 20)), 100)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    filters = {
+        'language_id': request.query_params.get('language'),
+        'corpus_id': request.query_params.get('corpus'),
+        'status': request.query_params.get('status'),
+    }
+    ranked = search.search(query, fold=fold, filters=filters, limit=limit)
+    
+    sentences = Sentence.objects.select_related('language', 'corpus', 'contributed_by').in_bulk(
+        [sentence_id for sentence_id, _ in ranked]
+    )
+    results = []
+    for sentence_id, rank in ranked:
+        sentence = sentences.get(Sentence._meta.pk.to_python(sentence_id))
+        if sentence is None:
+            continue
+        data = SentenceListSerializer(sentence).data
+        data['rank'] = rank
+        data['highlighted'] = search.highlight(
+            sentence.text, query, fold=fold, pipeline=pipeline_for(sentence.language.iso_code)
+        )
+        results.append(data)
+    
+    return Response({
+        'query': query,
+        'fold': fold,
+        'count': len(results),
+        'results': results,
+    })
 
 
-class SentenceDetailView(generics.RetrieveUpdateDestroyAPIView):
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def similar_sentences(request):
+    """Sentences of one language most like a text, by character n-gram TF-IDF cosine.
+    
+    Pass ``q`` and ``language``, or ``sentence`` to look up neighbours of an
+    existing sentence. Each result says whether it already has a translation.
+    """
+    
+    sentence_id = request.query_params.get('sentence')
+    exclude = []
+    if sentence_id:
+        try:
+            sentence = Sentence.objects.select_related('language').get(pk=sentence_id)
+        except (Sentence.DoesNotExist, ValidationError):
+            return Response({'error': 'Sentence not found'}, status=status.HTTP_404_NOT_FOUND)
+        language = sentence.language
+        query = sentence.text
+        normalized = sentence.normalized_text
+        exclude = [sentence.pk]
+    else:
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q or sentence is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            language = Language.objects.get(pk=request.query_params.get('language'))
+        except (Language.DoesNotExist, ValueError, TypeError):
+            return Response({'error': 'language is required'}, status=status.HTTP_400_BAD_REQUEST)
+        normalized = pipeline_for(language.iso_code)(query)
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        min_score = float(request.query_params.get('min_score', settings.SIMILARITY_MIN_SCORE))
+    except ValueError:
+        return Response({'error': 'limit and min_score must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    ranked = similarity.similar(language.pk, normalized, limit=limit, min_score=min_score, exclude=exclude)
+    
+    # Deleted sentences and ones moved to another language stay in the index until compaction
+    sentences = Sentence.objects.filter(language=language).select_related(
+        'language', 'corpus', 'contributed_by'
+    ).annotate(
+        translated=Exists(Translation.objects.filter(source_sentence=OuterRef('pk')))
+        | Exists(Translation.objects.filter(target_sentence=OuterRef('pk')))
+    ).in_bulk([sentence_id for sentence_id, _ in ranked])
+    results = []
+    for sentence_id, score in ranked:
+        sentence = sentences.get(sentence_id)
+        if sentence is None:
+            continue
+        data = SentenceListSerializer(sentence).data
+        data['score'] = score
+        data['translated'] = sentence.translated
+        results.append(data)
+    
+    return Response({
+        'query': query,
+        'language_id': language.pk,
+        'count': len(results),
+        'results': results,
+    })
+
+
+class SentenceDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a sentence."""
     
     queryset = Sentence.objects.all()
@@ -90,7 +247,40 @@ class SentenceDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class TranslationListView(generics.ListCreateAPIView):
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def sentence_equivalents(request, pk):
+    """Sentences linked to this one by any chain of translations, e.g. through an English pivot."""
+    
+    try:
+        sentence = Sentence.objects.select_related('language').get(pk=pk)
+    except Sentence.DoesNotExist:
+        return Response({'error': 'Sentence not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 100)), 1), 1000)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    equivalents = TranslationCluster.equivalents(sentence.pk).exclude(pk=sentence.pk)
+    languages = dict(equivalents.values_list('language_id', 'language__name').distinct())
+    languages[sentence.language_id] = sentence.language.name
+    
+    language = request.query_params.get('language')
+    if language:
+        equivalents = equivalents.filter(language_id=language)
+    equivalents = equivalents.select_related('language', 'corpus', 'contributed_by').order_by(
+        'language_id', 'created_at'
+    )[:limit]
+    
+    return Response({
+        'sentence_id': str(sentence.pk),
+        'languages': [{'id': language_id, 'name': name} for language_id, name in sorted(languages.items())],
+        'results': SentenceListSerializer(equivalents, many=True).data,
+    })
+
+
+class TranslationListView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List and create translations."""
     
     queryset = Translation.objects.select_related(
@@ -98,6 +288,7 @@ class TranslationListView(generics.ListCreateAPIView):
     )
     serializer_class = TranslationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -117,6 +308,18 @@ class TranslationListView(generics.ListCreateAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
+        # Filter by train/dev/test split
+        split = self.request.query_params.get('split')
+        if split:
+            queryset = queryset.filter(split=split)
+        
+        # Filter by quality check outcome
+        flagged = self.request.query_params.get('flagged', '').lower()
+        if flagged in ('1', 'true', 'yes'):
+            queryset = queryset.filter(quality_flags__gt=0)
+        elif flagged in ('0', 'false', 'no'):
+            queryset = queryset.filter(quality_flags=0)
+        
         return queryset.order_by('-created_at')
 
 
@@ -132,27 +335,39 @@ def create_translation_pair(request):
     
     try:
         with transaction.atomic():
-            # Create source sentence
-            source_sentence = Sentence.objects.create(
-                text=data['source_text'],
-                language_id=data['source_language_id'],
-                corpus_id=data['corpus_id'],
-                difficulty_level=data['difficulty_level'],
-                contributed_by=request.user,
-                status=Sentence.SentenceStatus.SUBMITTED
-            )
+            # Reuse sentences whose normalized text already exists in the language
+            source_sentence = Sentence.find_duplicate(data['source_language_id'], data['source_text'])
+            if source_sentence is None:
+                source_sentence = Sentence.objects.create(
+                    text=data['source_text'],
+                    language_id=data['source_language_id'],
+                    corpus_id=data['corpus_id'],
+                    difficulty_level=data['difficulty_level'],
+                    contributed_by=request.user,
+                    status=Sentence.SentenceStatus.SUBMITTED
+                )
             
-            # Create target sentence
-            target_sentence = Sentence.objects.create(
-                text=data['target_text'],
-                language_id=data['target_language_id'],
-                corpus_id=data['corpus_id'],
-                difficulty_level=data['difficulty_level'],
-                source_text=data['source_text'],
-                source_language_id=data['source_language_id'],
-                contributed_by=request.user,
-                status=Sentence.SentenceStatus.SUBMITTED
-            )
+            target_sentence = Sentence.find_duplicate(data['target_language_id'], data['target_text'])
+            if target_sentence is None:
+                target_sentence = Sentence.objects.create(
+                    text=data['target_text'],
+                    language_id=data['target_language_id'],
+                    corpus_id=data['corpus_id'],
+                    difficulty_level=data['difficulty_level'],
+                    source_text=data['source_text'],
+                    source_language_id=data['source_language_id'],
+                    contributed_by=request.user,
+                    status=Sentence.SentenceStatus.SUBMITTED
+                )
+            
+            translation = Translation.objects.filter(
+                source_sentence=source_sentence, target_sentence=target_sentence
+            ).first()
+            if translation:
+                return Response({
+                    'translation': TranslationSerializer(translation).data,
+                    'message': 'Translation pair already exists'
+                }, status=status.HTTP_200_OK)
             
             # Create translation
             translation = Translation.objects.create(
@@ -174,46 +389,346 @@ def create_translation_pair(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['GET'])
+@api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def corpus_stats(request):
-    """Get corpus and sentence statistics."""
-    
-    total_corpora = Corpus.objects.count()
-    total_sentences = Sentence.objects.count()
-    total_translations = Translation.objects.count()
-    validated_sentences = Sentence.objects.filter(status='validated').count()
-    
-    # Statistics by language
-    by_language = dict(
-        Sentence.objects.values('language__name')
-        .annotate(count=Count('id'))
-        .values_list('language__name', 'count')
+def create_translation_pairs(request):
+    """Create up to ``MAX_TRANSLATION_BATCH_SIZE`` translation pairs in one transaction.
+    
+    Sentences and translations are bulk-created as in a parallel import, so
+    the response carries ids rather than serialized pairs; ``line`` is the
+    1-based position of each pair in ``pairs``. Repeated sentences are
+    reused and repeated pairs reported as duplicates, but any invalid pair
+    fails the whole request with a 400 listing the errors per line.
+    """
+    
+    serializer = TranslationBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    try:
+        corpus = Corpus.objects.get(pk=data['corpus_id'])
+    except Corpus.DoesNotExist:
+        return Response({'error': 'Corpus not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    language_ids = {data['source_language_id'], data['target_language_id']}
+    if Language.objects.filter(pk__in=language_ids).count() != len(language_ids):
+        return Response({'error': 'Language not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    pairs = data['pairs']
+    importer = TranslationPairImporter(
+        corpus,
+        data['source_language_id'],
+        data['target_language_id'],
+        request.user,
+        batch_size=len(pairs),
+        translation_type=data['translation_type'],
+        difficulty_level=data['difficulty_level'],
+        report_ids=True,
+    )
+    not_an_object = ImportRowError('Expected an object with source_text and target_text')
+    rows = (
+        (line_number, pair if isinstance(pair, dict) else not_an_object)
+        for line_number, pair in enumerate(pairs, start=1)
+    )
+    # batch_size is the whole request, so every pair is written in one flush
+    with transaction.atomic():
+        report = importer.run(rows)
+        if report['rejected']:
+            transaction.set_rollback(True)
+            return Response({
+                'error': 'Invalid pairs; nothing was created',
+                'rejected': report['rejected'],
+                'errors': report['errors'],
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def import_sentences(request, pk):
+    """Bulk import sentences into a corpus from CSV, TSV, JSONL or plain text."""
+    
+    try:
+        corpus = Corpus.objects.get(pk=pk)
+    except Corpus.DoesNotExist:
+        return Response({'error': 'Corpus not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    serializer = SentenceImportSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    upload = data['file']
+    file_format = data.get('format') or detect_format(upload.name)
+    if not file_format:
+        return Response({
+            'error': 'Cannot detect file format; pass format=csv|tsv|jsonl|txt'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    importer = SentenceImporter(
+        corpus,
+        request.user,
+        batch_size=data['batch_size'],
+        status=data['status'],
+        difficulty_level=data['difficulty_level'],
+    )
+    
+    # Decode the upload line by line instead of reading it into memory
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        report = importer.run(read_rows(stream, file_format))
+    except (ImportRowError, UnicodeDecodeError) as e:
+        report = importer.report()
+        report['error'] = str(e)
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    finally:
+        stream.detach()
+    
+    return Response(report, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def import_parallel_corpus(request, pk):
+    """Bulk import aligned translation pairs from TMX, Moses or TSV files."""
+    
+    try:
+        corpus = Corpus.objects.get(pk=pk)
+    except Corpus.DoesNotExist:
+        return Response({'error': 'Corpus not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    serializer = ParallelImportSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    language_ids = {data['source_language_id'], data['target_language_id']}
+    if Language.objects.filter(pk__in=language_ids).count() != len(language_ids):
+        return Response({'error': 'Unknown source_language_id or target_language_id'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    upload = data['file']
+    file_format = data.get('format') or detect_parallel_format(upload.name)
+    if not file_format:
+        return Response({
+            'error': 'Cannot detect file format; pass format=tmx|moses|tsv'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    importer = TranslationPairImporter(
+        corpus,
+        data['source_language_id'],
+        data['target_language_id'],
+        request.user,
+        batch_size=data['batch_size'],
+        translation_type=data['translation_type'],
+        difficulty_level=data['difficulty_level'],
     )
     
-    # Statistics by status
-    by_status = dict(
-        Sentence.objects.values('status')
-        .annotate(count=Count('id'))
-        .values_list('status', 'count')
+    # TMX is parsed from bytes; the text formats are decoded line by line
+    streams = []
+    if file_format == 'tmx':
+        rows = read_tmx(upload.file, data.get('source_lang_code'), data.get('target_lang_code'))
+    else:
+        streams.append(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+        if file_format == 'moses':
+            streams.append(io.TextIOWrapper(data['target_file'].file, encoding='utf-8-sig', newline=''))
+            rows = read_moses(*streams)
+        else:
+            rows = read_parallel_tsv(streams[0])
+    
+    try:
+        report = importer.run(rows)
+    except (ET.ParseError, UnicodeDecodeError) as e:
+        report = importer.report()
+        report['error'] = str(e)
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    finally:
+        for stream in streams:
+            stream.detach()
+    
+    return Response(report, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_translations(request):
+    """Stream translation pairs for a language pair as Moses, JSONL or Parquet."""
+    
+    serializer = ParallelExportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    languages = Language.objects.in_bulk([data['source_language'], data['target_language']])
+    if data['source_language'] not in languages or data['target_language'] not in languages:
+        return Response({'error': 'Language not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        exporter = ParallelExporter(
+            languages[data['source_language']],
+            languages[data['target_language']],
+            export_format=data['export_format'],
+            compression=data['compression'],
+            chunk_size=data['chunk_size'],
+            status=data['status'],
+            corpus_id=data.get('corpus'),
+            split=data.get('split'),
+        )
+    except ExportError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(exporter.stream(), content_type=exporter.content_type)
+    response['Content-Disposition'] = f'attachment; filename="{exporter.filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_aligned_translations(request):
+    """Stream N-way aligned sentence tuples, pivoting through any translated language."""
+    
+    serializer = AlignedExportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    languages = Language.objects.in_bulk(data['languages'])
+    if len(languages) != len(data['languages']):
+        return Response({'error': 'Language not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        exporter = AlignedExporter(
+            [languages[language_id] for language_id in data['languages']],
+            compression=data['compression'],
+            chunk_size=data['chunk_size'],
+            status=data.get('status'),
+        )
+    except ExportError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(exporter.stream(), content_type=exporter.content_type)
+    response['Content-Disposition'] = f'attachment; filename="{exporter.filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def vocabulary_stats(request):
+    """Type/token counts and the most frequent n-grams of a language or one of its corpora."""
+    
+    serializer = VocabularyQuerySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    if not Language.objects.filter(pk=data['language']).exists():
+        return Response({'error': 'Language not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    count_field = 'validated_count' if data['validated'] else 'count'
+    entries = VocabularyEntry.objects.filter(
+        language_id=data['language'],
+        scope=data.get('corpus') or vocabulary.LANGUAGE_SCOPE,
+        n=data['n'],
+        **{f'{count_field}__gt': 0}
     )
+    totals = entries.aggregate(types=Count('id'), tokens=Sum(count_field))
+    types, tokens = totals['types'], totals['tokens'] or 0
+    top = entries.order_by(f'-{count_field}').values_list('ngram', count_field)[:data['limit']]
+    
+    return Response({
+        'language': data['language'],
+        'corpus': data.get('corpus'),
+        'n': data['n'],
+        'validated': data['validated'],
+        'types': types,
+        'tokens': tokens,
+        'type_token_ratio': round(types / tokens, 4) if tokens else 0.0,
+        'top': [
+            {'ngram': ngram, 'count': count, 'frequency': round(count / tokens, 6)}
+            for ngram, count in top
+        ],
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def vocabulary_coverage(request):
+    """Out-of-vocabulary rate of a text against a language or corpus vocabulary."""
+    
+    serializer = VocabularyCoverageSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
     
-    # Statistics by corpus type
-    by_corpus_type = dict(
-        Corpus.objects.values('corpus_type')
-        .annotate(count=Count('id'))
-        .values_list('corpus_type', 'count')
+    language = Language.objects.filter(pk=data['language']).first()
+    if language is None:
+        return Response({'error': 'Language not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    tokens = tokenize(pipeline_for(language.iso_code)(data['text']))
+    count_field = 'validated_count' if data['validated'] else 'count'
+    counts = dict(
+        VocabularyEntry.objects.filter(
+            language_id=data['language'],
+            scope=data.get('corpus') or vocabulary.LANGUAGE_SCOPE,
+            n=1,
+            ngram__in=set(tokens),
+            **{f'{count_field}__gt': 0}
+        ).values_list('ngram', count_field)
     )
+    oov = [token for token in tokens if token not in counts]
     
-    stats = {
-        'total_corpora': total_corpora,
-        'total_sentences': total_sentences,
-        'total_translations': total_translations,
-        'validated_sentences': validated_sentences,
-        'by_language': by_language,
-        'by_status': by_status,
-        'by_corpus_type': by_corpus_type,
-    }
+    return Response({
+        'tokens': len(tokens),
+        'types': len(set(tokens)),
+        'oov_tokens': len(oov),
+        'oov_rate': round(len(oov) / len(tokens), 4) if tokens else 0.0,
+        'oov_types': sorted(set(oov)),
+        'counts': {token: counts.get(token, 0) for token in dict.fromkeys(tokens)},
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def identify_language(request):
+    """Identify the language of up to 1000 texts in one batch."""
+    
+    serializer = LanguageIdentificationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    texts = serializer.validated_data['texts']
+    
+    identifier = langid.get_identifier()
+    if identifier is None:
+        return Response({'error': 'Language identifier has not been trained'},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    predictions = identifier.predict(texts)
+    names = dict(Language.objects.filter(
+        pk__in={language_id for language_id, _ in predictions}
+    ).values_list('id', 'name'))
+    
+    return Response({
+        'results': [
+            {
+                'language_id': language_id,
+                'language': names.get(language_id),
+                'confidence': round(probability, 4),
+                'confident': langid.is_confident(text, probability),
+            }
+            for text, (language_id, probability) in zip(texts, predictions)
+        ]
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def corpus_stats(request):
+    """Get corpus and sentence statistics.
+    
+    Served from the ``CorpusStatistic`` counters, cached for
+    ``CORPUS_STATS_CACHE_SECONDS``; no query touches the sentence table.
+    """
+    
+    stats = cache.get(CorpusStatistic.CACHE_KEY)
+    if stats is None:
+        stats = CorpusStatistic.snapshot()
+        cache.set(CorpusStatistic.CACHE_KEY, stats, settings.CORPUS_STATS_CACHE_SECONDS)
     
     serializer = CorpusStatsSerializer(stats)
     return Response(serializer.data)
@@ -222,10 +737,16 @@ def corpus_stats(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def random_sentence(request):
-    """Get a random sentence for translation."""
+    """Get a random sentence for translation.
+    
+    Pass ``exclude_handled=true`` to skip sentences the user has already
+    translated or recorded.
+    """
     
     language_id = request.query_params.get('language')
     corpus_id = request.query_params.get('corpus')
+    difficulty = request.query_params.get('difficulty')
+    exclude_handled = request.query_params.get('exclude_handled', '').lower() in ('1', 'true', 'yes')
     
     queryset = Sentence.objects.filter(status='validated')
     
@@ -233,9 +754,17 @@ def random_sentence(request):
         queryset = queryset.filter(language_id=language_id)
     if corpus_id:
         queryset = queryset.filter(corpus_id=corpus_id)
+    if difficulty:
+        queryset = queryset.filter(difficulty_level=difficulty)
+    if exclude_handled:
+        queryset = queryset.exclude(
+            Exists(Translation.objects.filter(source_sentence=OuterRef('pk'), translated_by=request.user))
+        ).exclude(
+            Exists(AudioRecording.objects.filter(sentence=OuterRef('pk'), recorded_by=request.user))
+        )
     
-    # Get random sentence
-    sentence = queryset.order_by('?').first()
+    # Seek on the indexed random key instead of sorting with ORDER BY RANDOM()
+    sentence = Sentence.random_from(queryset)
     
     if sentence:
         serializer = SentenceSerializer(sentence)
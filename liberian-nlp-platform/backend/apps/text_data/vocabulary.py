@@ -0,0 +1,41 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+from .normalization import tokenize
+
+
+MAX_ORDER = 2  # Unigrams and bigrams
+MAX_NGRAM_LENGTH = 255
+
+# Scope of the rows that sum every corpus of a language; corpus ids start at 1
+LANGUAGE_SCOPE = 0
+
+
+def ngrams(normalized: str) -> Counter:
+    """``(n, ngram)`` counts over the words of normalized text."""
+    tokens = tokenize(normalized)
+    counts = Counter()
+    for n in range(1, MAX_ORDER + 1):
+        for start in range(len(tokens) - n + 1):
+            gram = ' '.join(tokens[start:start + n])
+            if len(gram) <= MAX_NGRAM_LENGTH:
+                counts[(n, gram)] += 1
+    return counts
+
+
+def deltas(changes: Iterable[Tuple]) -> Dict[Tuple, List[int]]:
+    """Fold sentence changes into count deltas per vocabulary row.
+
+    Each change is ``(language_id, corpus_id, validated, normalized_text, sign)`` with
+    sign +1 for a sentence entering the index and -1 for one leaving it.
+    Keys are ``(language_id, scope, n, ngram)`` and values ``[count,
+    validated_count]``; rows whose changes cancel out are dropped.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for language_id, corpus_id, validated, normalized, sign in changes:
+        for (n, gram), count in ngrams(normalized).items():
+            for scope in (corpus_id, LANGUAGE_SCOPE):
+                row = totals[(language_id, scope, n, gram)]
+                row[0] += sign * count
+                if validated:
+                    row[1] += sign * count
+    return {key: row for key, row in totals.items() if row[0] or row[1]}
@@ -0,0 +1,202 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse(values):
+    """``id,text,corpus.name`` (and repeated parameters) as a tree: ``{'id': {}, 'text': {}, 'corpus': {'name': {}}}``."""
+    tree = {}
+    for value in values:
+        for path in value.split(','):
+            path = path.strip()
+            if not path:
+                continue
+            node = tree
+            for name in path.split('.'):
+                node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """Lets clients pick the fields of a model serializer with ``?fields=`` and ``?expand=``.
+
+    Without either parameter the serializer renders exactly as declared.
+    With one, it renders only the fields named in ``fields`` (all of them if
+    it is omitted), and nested objects collapse to their primary keys unless
+    named in ``expand``. Dotted names reach into nested serializers, so
+    ``fields=id,text,corpus.name`` renders the corpus with just its name.
+    Reverse one-to-one relations have no key of their own and are left out
+    unless named. Nested serializers get their share of the spec as the
+    ``fields`` and ``expand`` arguments; only the outermost one reads the
+    request.
+    """
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self._fieldset = (fields, expand)
+        super().__init__(*args, **kwargs)
+
+    def get_fieldset(self):
+        only, expand = self._fieldset
+        if only is not None or expand is not None:
+            return only, expand
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        request = self.context.get('request')
+        if parent is not None or request is None:
+            return None, None
+        params = request.query_params
+        if self.fields_query_param in params:
+            only = parse(params.getlist(self.fields_query_param))
+        if self.expand_query_param in params:
+            expand = parse(params.getlist(self.expand_query_param))
+        return only, expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self.get_fieldset()
+        if only is None and expand is None:
+            return fields
+        only = only or {}
+        expand = expand or {}
+
+        unknown = (set(only) | set(expand)) - set(fields)
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        flat = [name for name in expand if not isinstance(fields[name], serializers.BaseSerializer)]
+        if flat:
+            raise ParseError(f"Cannot expand: {', '.join(sorted(flat))}")
+
+        selected = {}
+        for name, field in fields.items():
+            if field.write_only:
+                selected[name] = field
+                continue
+            if only and name not in only:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                if name in expand or only.get(name):
+                    field = self.expanded(field, only.get(name), expand.get(name, {}))
+                elif self.flattens(name, field):
+                    field = self.flattened(field)
+                elif name in only:
+                    field = self.expanded(field, None, {})
+                else:
+                    continue
+            selected[name] = field
+        return selected
+
+    def flattens(self, name, field):
+        """Whether a nested object can be written as its primary key without another query."""
+        if isinstance(field, serializers.ListSerializer):
+            return True
+        try:
+            relation = self.Meta.model._meta.get_field(field._kwargs.get('source', name))
+        except FieldDoesNotExist:
+            return False
+        return relation.is_relation and relation.concrete
+
+    def flattened(self, field):
+        kwargs = {'read_only': True}
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        if 'source' in field._kwargs:
+            kwargs['source'] = field._kwargs['source']
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+    def expanded(self, field, only, expand):
+        many = isinstance(field, serializers.ListSerializer)
+        declared = field.child if many else field
+        if not isinstance(declared, SparseFieldsetMixin):
+            return field
+        kwargs = dict(declared._kwargs, fields=only or None, expand=expand)
+        if many:
+            kwargs['many'] = True
+        return declared.__class__(*declared._args, **kwargs)
+
+
+def _relation(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _plan(serializer, model, prefix, only, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        relation = _relation(model, field.source_attrs[0]) if len(field.source_attrs) == 1 else None
+        path = prefix + field.source
+
+        if isinstance(field, serializers.ListSerializer) and relation is not None and relation.is_relation:
+            required = [relation.field.name] if relation.one_to_many else []
+            prefetch.append(Prefetch(path, queryset=optimize(
+                relation.related_model._default_manager.all(), field.child, required
+            )))
+        elif isinstance(field, serializers.ManyRelatedField) and relation is not None:
+            prefetch.append(Prefetch(path, queryset=relation.related_model._default_manager.only('pk')))
+        elif isinstance(field, serializers.BaseSerializer) and relation is not None and relation.is_relation:
+            select.add(path)
+            _plan(field, relation.related_model, path + '__', only, select, prefetch)
+        else:
+            # Plain and dotted sources, e.g. ``language.name`` through a foreign key
+            current = model
+            path = prefix
+            for attr in field.source_attrs[:-1]:
+                relation = _relation(current, attr)
+                if relation is None or not (relation.many_to_one or relation.one_to_one):
+                    break
+                select.add(path + attr)
+                current = relation.related_model
+                path += attr + '__'
+            else:
+                relation = _relation(current, field.source_attrs[-1]) if field.source_attrs else None
+                if relation is not None and relation.concrete:
+                    only.add(path + relation.name)
+                    continue
+            # A property, method or ``source='*'``: load the whole row it may read from
+            only.update(path + column.name for column in current._meta.concrete_fields)
+
+
+def optimize(queryset, serializer, required=()):
+    """The queryset narrowed to what ``serializer`` renders.
+
+    Columns go into ``only()``, nested objects along foreign keys into
+    ``select_related`` and nested lists into ``prefetch_related``, each
+    narrowed the same way, so a sparse request reads just the columns it
+    returns. ``required`` names fields the caller reads itself, such as
+    pagination keys.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    only, select, prefetch = set(required), set(), []
+    _plan(serializer, queryset.model, '', only, select, prefetch)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset.only(*only)
+
+
+class SparseFieldsetViewMixin:
+    """Reads through ``optimize`` for the view's serializer, so ``?fields=`` also narrows the query.
+
+    Writes keep full rows, since the model save hooks compare against
+    what was loaded.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        required = []
+        if self.paginator is not None:
+            ordering = getattr(self, 'keyset_ordering', getattr(self.paginator, 'ordering', ()))
+            required = [field.lstrip('-') for field in ordering if field.lstrip('-') != 'pk']
+        return optimize(queryset, self.get_serializer(), required)
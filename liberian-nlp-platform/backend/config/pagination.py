@@ -0,0 +1,129 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+import json
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks on a unique composite key.
+
+    Each page is a ``WHERE (created_at, id) < (last_created_at, last_id)``
+    style range over an index on the ordering fields, so page one and page
+    ten thousand cost the same. Views pick the key with ``keyset_ordering``;
+    the last field must be unique. ``count=false`` skips the ``COUNT(*)``.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    page_size = 20
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, 'true').lower() not in ('0', 'false', 'no'):
+            self.count = queryset.count()
+
+        values, reverse = self.decode_cursor(request)
+        ordering = self.ordering if not reverse else tuple(self._flip(field) for field in self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+
+        # One extra row tells us whether another page exists in this direction
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_values = self._key(rows[-1]) if rows and (has_more or reverse) else None
+        self.previous_values = self._key(rows[0]) if rows and (values is not None) and (has_more or not reverse) else None
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.encode_cursor(self.next_values, reverse=False),
+            'previous': self.encode_cursor(self.previous_values, reverse=True),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, values, reverse: bool):
+        if values is None:
+            return None
+        token = urlsafe_b64encode(json.dumps({'v': values, 'r': reverse}).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(token.encode()))
+            values = [
+                self._field(name).to_python(value)
+                for name, value in zip(self._names(), cursor['v'])
+            ]
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return values, bool(cursor.get('r'))
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _field(self, name):
+        return self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+
+    def _key(self, instance):
+        key = []
+        for name in self._names():
+            value = getattr(instance, 'pk' if name == 'pk' else self._field(name).attname)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            elif not isinstance(value, (int, float)):
+                value = str(value)
+            key.append(value)
+        return key
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _after(ordering, values):
+        # (a, b) after (x, y) == a beyond x OR (a = x AND b beyond y)
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        # Redundant bound on the leading column so the planner uses a range scan
+        first = ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return condition & Q(**{f'{first.lstrip("-")}__{bound}': values[0]})
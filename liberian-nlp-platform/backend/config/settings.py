@@ -80,6 +80,18 @@ DATABASES = {
     }
 }
 
+# PostgreSQL when DB_NAME is set (docker-compose); full-text search uses
+# tsvector and pg_trgm there and FTS5 on SQLite
+if config('DB_NAME', default=''):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+    }
+
 # MongoDB Configuration (conditional import) - DISABLED
 # try:
 #     import mongoengine
@@ -95,6 +107,16 @@ DATABASES = {
 #     MONGODB_AVAILABLE = False
 MONGODB_AVAILABLE = False
 
+# Cache (shared across workers when Redis is configured)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -156,6 +178,20 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TASK_ALWAYS_EAGER = True  # Execute tasks synchronously for development
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-corpus-stats': {
+        'task': 'apps.text_data.tasks.reconcile_corpus_stats',
+        'schedule': config('CORPUS_STATS_RECONCILE_SECONDS', default=3600, cast=int),
+    },
+    'archive-cold-recordings': {
+        'task': 'apps.audio_data.tasks.archive_cold_recordings',
+        'schedule': config('AUDIO_COLD_ARCHIVE_SECONDS', default=86400, cast=int),
+    },
+    'evict-audio-cache': {
+        'task': 'apps.audio_data.tasks.evict_audio_cache',
+        'schedule': config('AUDIO_CACHE_EVICT_SECONDS', default=900, cast=int),
+    },
+}
 
 # File Storage
 USE_S3 = config('USE_S3', default=False, cast=bool)
@@ -180,9 +216,55 @@ AUDIO_SAMPLE_RATE = 16000
 AUDIO_CHANNELS = 1
 MAX_AUDIO_DURATION = 30  # seconds
 MIN_AUDIO_DURATION = 1   # seconds
+AUDIO_PITCH_TRACKER = config('AUDIO_PITCH_TRACKER', default='piptrack')  # piptrack or yin
+
+# Audio storage tiers
+AUDIO_ARCHIVE_FORMAT = config('AUDIO_ARCHIVE_FORMAT', default='flac')  # flac or opus
+AUDIO_COLD_ARCHIVE_FORMAT = config('AUDIO_COLD_ARCHIVE_FORMAT', default='opus')
+AUDIO_COLD_AFTER_DAYS = config('AUDIO_COLD_AFTER_DAYS', default=180, cast=int)
+AUDIO_OPUS_BITRATE = config('AUDIO_OPUS_BITRATE', default='96k')
+AUDIO_CACHE_DIR = config('AUDIO_CACHE_DIR', default=os.path.join(MEDIA_ROOT, 'audio_cache'))
+AUDIO_CACHE_MAX_BYTES = config('AUDIO_CACHE_MAX_BYTES', default=2 * 1024 ** 3, cast=int)
+
+# Recording prompt selection (audio/prompts/)
+PROMPT_COVERAGE_TARGET = config('PROMPT_COVERAGE_TARGET', default=5, cast=int)  # Recordings per feature before it stops counting
+PROMPT_FEATURE_WEIGHTS = {'char': 4.0, 'syl': 2.0, 'word': 1.0}  # Characters, syllable bigrams, words
+PROMPT_CANDIDATE_POOL = config('PROMPT_CANDIDATE_POOL', default=2000, cast=int)  # Random candidates scored per request
+PROMPT_MAX_WORDS = 25  # Longer sentences do not fit in MAX_AUDIO_DURATION
+MAX_PROMPT_BATCH_SIZE = 100
 
 # Quality control thresholds
-MIN_TRANSLATION_LENGTH_RATIO = 0.3
+MIN_TRANSLATION_LENGTH_RATIO = 0.3  # Target/source, in words and in characters
 MAX_TRANSLATION_LENGTH_RATIO = 3.0
+LANGUAGE_SCRIPTS = {'vai': ['latin', 'vai']}  # By Language.iso_code; others are Latin-only
+# Normalization pipeline by Language.iso_code (see text_data.normalization.PIPELINES); others use
+# 'orthography'. Changing this needs a normalize_sentences run
+LANGUAGE_NORMALIZATION = {
+    'bassa': 'tonal',
+    'kpelle': 'tonal',
+    'krahn': 'tonal',
+    'gio': 'tonal',
+    'en': 'latin',
+    'english': 'latin',
+}
+MAX_TRANSLATION_BATCH_SIZE = 1000  # Pairs per translation-pairs/batch/ request
+CORPUS_STATS_CACHE_SECONDS = config('CORPUS_STATS_CACHE_SECONDS', default=30, cast=int)
+NEAR_DUPLICATE_THRESHOLD = config('NEAR_DUPLICATE_THRESHOLD', default=0.6, cast=float)  # Estimated Jaccard over character shingles
 MIN_REVIEWER_REPUTATION = 0.7
-REQUIRED_REVIEWS_PER_ITEM = 3
\ No newline at end of file
+REQUIRED_REVIEWS_PER_ITEM = 3
+
+# Train/dev/test splits; changing the salt or fractions reshuffles every row (run assign_splits)
+DATA_SPLIT_SALT = config('DATA_SPLIT_SALT', default='liberian-nlp')
+DEV_SPLIT_FRACTION = config('DEV_SPLIT_FRACTION', default=0.05, cast=float)
+TEST_SPLIT_FRACTION = config('TEST_SPLIT_FRACTION', default=0.05, cast=float)
+
+# Built-in language identification (train_language_id)
+LID_MODEL_PATH = config('LID_MODEL_PATH', default=os.path.join(MEDIA_ROOT, 'models', 'langid.npz'))
+LID_MIN_CONFIDENCE = config('LID_MIN_CONFIDENCE', default=0.9, cast=float)
+LID_MIN_CHARACTERS = config('LID_MIN_CHARACTERS', default=20, cast=int)
+
+# Similar-sentence lookup (build_similarity_index); the files are memory-mapped by every worker
+SIMILARITY_INDEX_DIR = config('SIMILARITY_INDEX_DIR', default=os.path.join(MEDIA_ROOT, 'models', 'similarity'))
+SIMILARITY_COMPACT_AFTER = config('SIMILARITY_COMPACT_AFTER', default=2000, cast=int)  # Changed sentences before a compaction is queued
+SIMILARITY_COMPACT_LOCK_SECONDS = 600
+SIMILARITY_MIN_SCORE = config('SIMILARITY_MIN_SCORE', default=0.2, cast=float)  # Cosine below which results are dropped
@@ -9,6 +9,8 @@ urlpatterns = [
     path('api/v1/', include('apps.languages.urls')),
     path('api/v1/system/', include('apps.system.urls')),
     path('api/v1/roles/', include('apps.roles.urls')),
+    path('api/v1/text/', include('apps.text_data.urls')),
+    path('api/v1/audio/', include('apps.audio_data.urls')),
 ]
 
 if settings.DEBUG: